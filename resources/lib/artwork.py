@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Artwork of the listed items, resized for the screen and cached locally.
+
+The akamaividz image URLs carry their size as a path segment
+(`.../list/270x152/...`, `.../cover/270x405/...`) and the CDN scales the
+image to it. `resize` rewrites that segment to a width matched to the
+screen, keeping the aspect ratio.
+
+`Artwork` hands out the local copy of an image once it is in the store,
+and the remote URL otherwise, so building a folder never waits for the
+network. Kodi downloads and caches the remote images of the folder shown
+itself; only the images of the pages prefetched for later are downloaded
+into the store, on a small worker pool of their own once the folder has
+been handed over to Kodi. An image is thereby downloaded once, and keeps
+the URL Kodi first got for it.
+"""
+import logging
+import os
+import re
+import time
+
+import xbmc
+
+from . import kodiutils
+from .transport import create_session
+from .workers import WorkerPool, wait_all
+
+logger = logging.getLogger(__name__)
+
+SIZE_SEGMENT = re.compile(r'/(list|cover)/(\d+)x(\d+)/')
+
+# Widths (in pixels) of the images on a 1920 pixels wide screen; other screens
+# get them scaled, rounded to SIZE_STEP so the CDN caches few variants.
+WIDTHS = {'list': 480, 'cover': 320}
+REFERENCE_SCREEN_WIDTH = 1920
+SIZE_STEP = 40
+
+_screen_width = []
+
+
+def get_screen_width():
+    if not _screen_width:
+        width = xbmc.getInfoLabel('System.ScreenWidth')
+        _screen_width.append(int(width) if width.isdigit() else REFERENCE_SCREEN_WIDTH)
+    return _screen_width[0]
+
+
+def resize(url, screen_width=None):
+    """
+    Returns the URL of the image scaled for the screen; URLs without a size
+    segment come back unchanged.
+    """
+    match = SIZE_SEGMENT.search(url) if url else None
+    if not match:
+        return url
+
+    kind, width, height = match.group(1), int(match.group(2)), int(match.group(3))
+    if not width:
+        return url
+    scale = float(screen_width or get_screen_width()) / REFERENCE_SCREEN_WIDTH
+    new_width = max(int(round(WIDTHS[kind] * scale / SIZE_STEP)), 1) * SIZE_STEP
+    new_height = int(round(new_width * float(height) / width))
+    return '{}/{}/{}x{}/{}'.format(url[:match.start()], kind, new_width, new_height, url[match.end():])
+
+
+class Artwork(object):
+
+    def __init__(self, store, max_workers=4, timeout=10):
+        self.store = store
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        # The resized URLs of the images to download, in order.
+        self._missing = []
+        self._seen = set()
+
+    def set_art(self, list_item, list_image, cover_image):
+        """
+        Sets the thumb, icon and fanart of the list item, from the store where
+        possible.
+        """
+        thumb, fanart = self._get_urls(list_image, cover_image)
+        if thumb:
+            thumb, fanart = self._get_local(thumb), self._get_local(fanart)
+        list_item.setArt({'thumb': thumb, 'icon': thumb, 'fanart': fanart})
+
+    def prefetch(self, list_image, cover_image):
+        """
+        Queues the images of an item listed later for download, unless they
+        are stored already.
+        """
+        for url in self._get_urls(list_image, cover_image):
+            if url and url not in self._seen and self._get_local(url) == url:
+                self._seen.add(url)
+                self._missing.append(url)
+
+    @staticmethod
+    def _get_urls(list_image, cover_image):
+        """
+        Returns the resized URLs of the thumb and the fanart.
+        """
+        return resize(list_image or cover_image), resize(cover_image or list_image)
+
+    def _get_local(self, url):
+        """
+        Returns the path of the stored copy of the image, or its URL while it
+        is not stored.
+        """
+        path = self.store.get(url, self._get_suffix(url))
+        return url if path is None else path
+
+    @staticmethod
+    def _get_suffix(url):
+        return os.path.splitext(url.partition('?')[0])[1][:5]
+
+    def finish(self, should_continue):
+        """
+        Downloads the missing images while `should_continue()` is true, then
+        keeps the store within its budget.
+        """
+        if not self._missing:
+            return
+
+        urls, self._missing = self._missing, []
+        self._seen.clear()
+
+        # A session of its own: cancelling it leaves the API requests alone,
+        # and the CDN is kept out of the circuit breaker.
+        session = create_session()
+        self.store.ensure_directory()
+        workers = WorkerPool(self.max_workers)
+        tasks = [
+            workers.submit(
+                kodiutils.download_url_content,
+                url,
+                self.store.path(url, self._get_suffix(url)),
+                session=session,
+                timeout=self.timeout,
+            )
+            for url in urls
+        ]
+
+        deadline = time.time() + self.timeout
+        while not all(task.done for task in tasks):
+            if time.time() >= deadline or not should_continue():
+                logger.debug('Artwork prefetch cancelled')
+                session.close()
+                break
+            wait_all(tasks, min(time.time() + 0.25, deadline))
+
+        failed = [task for task in tasks if task.done and task.failed]
+        if failed:
+            logger.info('Failed to fetch %s of %s images', len(failed), len(tasks))
+
+        workers.shutdown(timeout=max(deadline - time.time(), 0))
+        session.close()
+        self.store.evict()
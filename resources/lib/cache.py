@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent response cache stored in a single SQLite file.
+
+Entries are JSON documents keyed by an arbitrary string. Each entry carries
+its own expiry; expired entries are still handed out (flagged as stale) for
+``max_stale`` seconds so that callers can render immediately and revalidate
+afterwards. The total payload size is capped and the least recently used
+entries are evicted first.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from urllib import urlencode
+from urlparse import parse_qsl, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# 20 MB of JSON payload.
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+def normalize_url(url, list_params=('languages',)):
+    """
+    Returns the URL with a lower-cased host, sorted query parameters and the
+    comma separated values of `list_params` sorted and de-duplicated, so that
+    equivalent requests map onto the same cache key.
+    """
+    scheme, netloc, path, query, _ = urlsplit(url)
+    params = []
+    for key, value in parse_qsl(query, keep_blank_values=True):
+        if key in list_params:
+            value = ','.join(sorted(set(filter(None, value.split(',')))))
+        params.append((key, value))
+
+    return urlunsplit((scheme.lower(), netloc.lower(), path, urlencode(sorted(params)), ''))
+
+
+class Entry(object):
+    __slots__ = ('value', 'stored_at', 'expires_at')
+
+    def __init__(self, value, stored_at, expires_at):
+        self.value = value
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    @property
+    def is_stale(self):
+        return time.time() >= self.expires_at
+
+
+class ResponseCache(object):
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+
+        # Counters, reported once per invocation.
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        self._lock = threading.RLock()
+        self._touched = {}
+        self._conn = None
+        try:
+            directory = os.path.dirname(path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            self._conn.execute(SCHEMA)
+            self._conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.warn('Response cache disabled, failed to open %s -- %s', path, e)
+            self._conn = None
+
+    def get(self, key, max_stale=0):
+        """
+        Returns the `Entry` stored for the key, or None.
+
+        Expired entries are returned (with `is_stale` set) as long as they
+        expired less than `max_stale` seconds ago.
+        """
+        if self._conn is None:
+            self.misses += 1
+            return None
+
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    'SELECT value, stored_at, expires_at FROM entries WHERE key = ?', (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warn('Response cache lookup failed for %s -- %s', key, e)
+                row = None
+
+            now = time.time()
+            if not row or row[2] + max_stale <= now:
+                self.misses += 1
+                return None
+
+            entry = Entry(json.loads(row[0]), row[1], row[2])
+            if entry.is_stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+
+            self._touched[key] = now
+            return entry
+
+    def set(self, key, value, ttl):
+        if self._conn is None:
+            return
+
+        payload = json.dumps(value, separators=(',', ':'))
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, size, stored_at, expires_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, payload, len(payload), now, now + ttl, now)
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warn('Response cache store failed for %s -- %s', key, e)
+
+            self._touched.pop(key, None)
+
+    def set_many(self, values, ttl):
+        """
+        Stores the {key: value} entries in a single transaction.
+        """
+        if self._conn is None or not values:
+            return
+
+        now = time.time()
+        rows = []
+        for key, value in values.items():
+            payload = json.dumps(value, separators=(',', ':'))
+            rows.append((key, payload, len(payload), now, now + ttl, now))
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO entries (key, value, size, stored_at, expires_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)', rows
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warn('Response cache store failed for %s entries -- %s', len(rows), e)
+
+            for key in values:
+                self._touched.pop(key, None)
+
+    def delete(self, key):
+        if self._conn is None:
+            return
+
+        with self._lock:
+            try:
+                self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warn('Response cache delete failed for %s -- %s', key, e)
+
+            self._touched.pop(key, None)
+
+    def evict(self):
+        """
+        Drops the least recently used entries until the total size fits in `max_bytes`.
+        Returns the number of evicted entries.
+        """
+        if self._conn is None:
+            return 0
+
+        with self._lock:
+            try:
+                total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+                if total <= self.max_bytes:
+                    return 0
+
+                evicted = []
+                for key, size in self._conn.execute('SELECT key, size FROM entries ORDER BY accessed_at'):
+                    if total <= self.max_bytes:
+                        break
+                    evicted.append((key,))
+                    total -= size
+
+                self._conn.executemany('DELETE FROM entries WHERE key = ?', evicted)
+                self._conn.commit()
+                return len(evicted)
+            except sqlite3.Error as e:
+                logger.warn('Response cache eviction failed -- %s', e)
+                return 0
+
+    def close(self):
+        """
+        Persists the access times collected during this invocation, enforces the
+        size cap and closes the database.
+        """
+        if self._conn is None:
+            return
+
+        with self._lock:
+            try:
+                if self._touched:
+                    self._conn.executemany(
+                        'UPDATE entries SET accessed_at = ? WHERE key = ?',
+                        [(accessed_at, key) for key, accessed_at in self._touched.iteritems()]
+                    )
+                    self._conn.commit()
+                    self._touched.clear()
+            except sqlite3.Error as e:
+                logger.warn('Response cache update failed -- %s', e)
+
+            self.evict()
+            self._conn.close()
+            self._conn = None
+
+    def stats(self):
+        return 'hits={} stale={} misses={}'.format(self.hits, self.stale_hits, self.misses)
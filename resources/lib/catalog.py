@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+Local, searchable index of every item the add-on has listed.
+
+Items are stored in their compact JSON form (`models.Item`) next to a full-text index of
+their title, original title and tags, kept in a single SQLite file. Both the
+indexed text and the queries are folded the same way: accents are stripped
+and the spelling variants common in romanised Indian titles (aa/a, ee/i,
+sh/s, w/v, doubled letters, ...) are collapsed, so "Khushi", "Kushi" and
+"khushee" all match. Every query word matches as a prefix.
+
+FTS4 is used where SQLite has it; otherwise the index falls back to LIKE
+queries over the same folded text.
+"""
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from .models import Item
+
+logger = logging.getLogger(__name__)
+
+# Items kept; the ones indexed longest ago go first.
+DEFAULT_MAX_ITEMS = 20000
+
+# Items indexed less than this many seconds ago are not updated again.
+REINDEX_AFTER = 6 * 60 * 60
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS items (
+        rowid INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        action TEXT NOT NULL,
+        title TEXT NOT NULL,
+        terms TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        indexed_at REAL NOT NULL
+    )
+    """,
+    'CREATE INDEX IF NOT EXISTS items_indexed_at ON items (indexed_at)',
+)
+FTS_SCHEMA = 'CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts4(terms)'
+
+# Words, with the vowel signs of the Indic scripts (Devanagari to Sinhala)
+# kept in them: they are marks, not \w characters. The dandas end sentences.
+WORD = re.compile(u'[\\w\u0900-\u0963\u0966-\u0dff]+', re.UNICODE)
+
+# Applied in order to every latin word.
+FOLDINGS = (
+    (re.compile(r'aa'), 'a'),
+    (re.compile(r'ee|ii|ey$'), 'i'),
+    (re.compile(r'oo|uu|ou'), 'u'),
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'w'), 'v'),
+    (re.compile(r'z'), 'j'),
+    (re.compile(r'ck|q'), 'k'),
+    # Aspirated consonants: kh, gh, ch, jh, th, dh, bh, sh, ...
+    (re.compile(r'([bcdgjklmnprstv])h'), r'\1'),
+    (re.compile(r'(.)\1+'), r'\1'),
+    (re.compile(r'y$'), 'i'),
+)
+
+
+def fold_word(word):
+    if not word.isalpha() or ord(max(word)) > 127:
+        return word
+    for pattern, replacement in FOLDINGS:
+        word = pattern.sub(replacement, word)
+    return word
+
+
+def fold(text):
+    """
+    Returns the list of folded words of the text.
+    """
+    if not text:
+        return []
+    if not isinstance(text, unicode):
+        text = text.decode('utf-8', 'ignore')
+    text = u''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return [fold_word(word) for word in WORD.findall(text.lower())]
+
+
+def get_terms(item, keywords=()):
+    words = fold(item.title)
+    for keyword in keywords:
+        words.extend(fold(keyword))
+
+    # Unique words, in order.
+    seen = set()
+    return u' '.join(word for word in words if not (word in seen or seen.add(word)))
+
+
+class Catalog(object):
+
+    def __init__(self, path, max_items=DEFAULT_MAX_ITEMS):
+        self.path = path
+        self.max_items = max_items
+
+        self._lock = threading.RLock()
+        self._conn = None
+        self._fts = False
+        try:
+            directory = os.path.dirname(path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+            try:
+                self._conn.execute(FTS_SCHEMA)
+                self._fts = True
+            except sqlite3.OperationalError as e:
+                logger.info('Full-text search unavailable, using LIKE queries -- %s', e)
+            self._conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.warn('Catalog disabled, failed to open %s -- %s', path, e)
+            self._conn = None
+
+    def index(self, entries, keywords=None):
+        """
+        Adds or updates the items of the (action, `models.Item`) pairs; returns
+        how many were written.
+
+        `keywords` holds the `models.get_keywords` of the items by id; items
+        without any keep the terms they were indexed with.
+        """
+        if self._conn is None:
+            return 0
+
+        entries = [(action, item) for action, item in entries if item.id and item.title]
+        now = time.time()
+        count = 0
+        with self._lock:
+            try:
+                existing = self._get_rows([item.id for _, item in entries])
+                for action, item in entries:
+                    row = existing.get(item.id)
+                    if row and row[1] > now - REINDEX_AFTER:
+                        continue
+
+                    item_keywords = keywords.get(item.id) if keywords else None
+                    terms = get_terms(item, item_keywords or ())
+                    values = (action, u' '.join(fold(item.title)), terms,
+                              json.dumps(item.to_json(), separators=(',', ':')), now, item.id)
+
+                    if row and item_keywords is None:
+                        self._conn.execute(
+                            'UPDATE items SET action = ?, title = ?, payload = ?, indexed_at = ? WHERE id = ?',
+                            values[:2] + values[3:]
+                        )
+                    elif row:
+                        self._conn.execute(
+                            'UPDATE items SET action = ?, title = ?, terms = ?, payload = ?, indexed_at = ? '
+                            'WHERE id = ?', values
+                        )
+                        if self._fts:
+                            self._conn.execute('UPDATE items_fts SET terms = ? WHERE docid = ?', (terms, row[0]))
+                    else:
+                        cursor = self._conn.execute(
+                            'INSERT INTO items (action, title, terms, payload, indexed_at, id) '
+                            'VALUES (?, ?, ?, ?, ?, ?)', values
+                        )
+                        if self._fts:
+                            self._conn.execute('INSERT INTO items_fts (docid, terms) VALUES (?, ?)',
+                                               (cursor.lastrowid, terms))
+                    # Listings may repeat an item.
+                    existing[item.id] = (row[0] if row else cursor.lastrowid, now)
+                    count += 1
+                if count:
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warn('Catalog update failed -- %s', e)
+                self._conn.rollback()
+        return count
+
+    def _get_rows(self, ids):
+        """
+        Returns {id: (rowid, indexed_at)} of the stored items among the ids.
+        """
+        rows = {}
+        # Stays below SQLite's limit of 999 query parameters.
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for item_id, rowid, indexed_at in self._conn.execute(
+                'SELECT id, rowid, indexed_at FROM items WHERE id IN ({})'.format(','.join('?' * len(chunk))), chunk
+            ):
+                rows[item_id] = (rowid, indexed_at)
+        return rows
+
+    def search(self, query, limit):
+        """
+        Returns up to `limit` (action, item) pairs matching all words of the
+        query, items whose title starts with the query first.
+        """
+        words = fold(query)
+        if self._conn is None or not words:
+            return []
+
+        title_prefix = u' '.join(words) + u'%'
+        if self._fts:
+            sql = (
+                'SELECT action, payload FROM items JOIN items_fts ON items_fts.docid = items.rowid '
+                'WHERE items_fts MATCH ? ORDER BY items.title LIKE ? DESC, indexed_at DESC LIMIT ?'
+            )
+            args = (u' '.join(word + u'*' for word in words), title_prefix, limit)
+        else:
+            sql = 'SELECT action, payload FROM items WHERE {} ORDER BY title LIKE ? DESC, indexed_at DESC LIMIT ?'.format(
+                ' AND '.join(["(' ' || terms) LIKE ?"] * len(words))
+            )
+            args = tuple(u'% ' + word + u'%' for word in words) + (title_prefix, limit)
+
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, args).fetchall()
+            except sqlite3.Error as e:
+                logger.warn('Catalog search failed for %s -- %s', query, e)
+                return []
+
+        return [(action, Item.from_json(json.loads(payload))) for action, payload in rows]
+
+    def count(self):
+        if self._conn is None:
+            return 0
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+
+    def close(self):
+        """
+        Drops the items over the cap and closes the database.
+        """
+        if self._conn is None:
+            return
+
+        with self._lock:
+            try:
+                excess = self.count() - self.max_items
+                if excess > 0:
+                    oldest = 'SELECT rowid FROM items ORDER BY indexed_at LIMIT ?'
+                    if self._fts:
+                        self._conn.execute('DELETE FROM items_fts WHERE docid IN ({})'.format(oldest), (excess,))
+                    self._conn.execute('DELETE FROM items WHERE rowid IN ({})'.format(oldest), (excess,))
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warn('Catalog cleanup failed -- %s', e)
+
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Programme guide of the live channels, indexed by time.
+
+The guide is fetched and cached one UTC day (a window) at a time. Each
+channel's programmes are kept as three parallel lists (start times, end
+times, titles) sorted by start time, so the programme airing at a given time
+is a single bisect away. A `Guide` stitches the cached windows together,
+dropping the programmes that span midnight and so come with both days.
+"""
+import bisect
+import calendar
+
+DAY = 24 * 60 * 60
+
+
+def parse_time(value):
+    """
+    Returns the unix timestamp of a `YYYY-MM-DDTHH:MM:SS[Z|+HH:MM]` time,
+    or None if it is malformed. Times without an offset are UTC.
+    """
+    if not value or len(value) < 19 or value[10] != 'T':
+        return None
+
+    try:
+        timestamp = calendar.timegm((
+            int(value[0:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13]), int(value[14:16]), int(value[17:19]), 0, 0, 0,
+        ))
+    except ValueError:
+        return None
+
+    offset = value[19:].lstrip('.0123456789')
+    if offset[:1] in ('+', '-') and len(offset) >= 6:
+        seconds = int(offset[1:3]) * 3600 + int(offset[4:6]) * 60
+        timestamp -= seconds if offset[0] == '+' else -seconds
+    return timestamp
+
+
+def get_window(when):
+    """
+    Returns the first second of the UTC day holding the timestamp.
+    """
+    return int(when) // DAY * DAY
+
+
+def get_windows(now, lookahead):
+    """
+    Returns the windows needed to tell what is on now and `lookahead` seconds
+    from now.
+    """
+    return range(get_window(now), get_window(now + lookahead) + 1, DAY)
+
+
+class Schedule(object):
+    __slots__ = ('starts', 'ends', 'titles')
+
+    def __init__(self, starts=None, ends=None, titles=None):
+        self.starts = starts or []
+        self.ends = ends or []
+        self.titles = titles or []
+
+    @classmethod
+    def parse(cls, programmes):
+        """
+        Returns the schedule of the gwapi programmes, skipping the ones
+        without valid times.
+        """
+        entries = []
+        for programme in programmes:
+            start, end = parse_time(programme.get('start_time')), parse_time(programme.get('end_time'))
+            if start is not None and end is not None and end > start:
+                entries.append((start, end, programme.get('title') or ''))
+        entries.sort()
+
+        schedule = cls()
+        for start, end, title in entries:
+            schedule.append(start, end, title)
+        return schedule
+
+    def append(self, start, end, title):
+        """
+        Adds a programme starting after the last one; overlapping ones are dropped.
+        """
+        if self.ends and start < self.ends[-1]:
+            return
+        self.starts.append(start)
+        self.ends.append(end)
+        self.titles.append(title)
+
+    def extend(self, other):
+        for entry in zip(other.starts, other.ends, other.titles):
+            self.append(*entry)
+
+    def find(self, when):
+        """
+        Returns the index of the programme airing at the time, or of the next
+        one when nothing airs; None after the last programme.
+        """
+        index = bisect.bisect_right(self.starts, when) - 1
+        if index < 0 or self.ends[index] <= when:
+            index += 1
+        return index if index < len(self.starts) else None
+
+    def get(self, index):
+        """
+        Returns the (start, end, title) of the programme.
+        """
+        return self.starts[index], self.ends[index], self.titles[index]
+
+    def now_next(self, when):
+        """
+        Returns the programme airing at the time and the one after it, as
+        (start, end, title) tuples or None.
+        """
+        index = self.find(when)
+        if index is None:
+            return None, None
+        if self.starts[index] > when:
+            return None, self.get(index)
+        return self.get(index), self.get(index + 1) if index + 1 < len(self.starts) else None
+
+    def to_json(self):
+        return [self.starts, self.ends, self.titles]
+
+    @classmethod
+    def from_json(cls, value):
+        return cls(*value)
+
+
+def parse_window(data):
+    """
+    Returns the {channel id: Schedule} of an EPG response.
+    """
+    return dict(
+        (channel['id'], Schedule.parse(channel.get('items') or []))
+        for channel in data.get('items') or []
+        if channel.get('id')
+    )
+
+
+class Guide(object):
+    """
+    The schedules of the channels over consecutive windows.
+    """
+
+    def __init__(self, windows):
+        # The {channel id: Schedule} of each window, in order, and the
+        # schedules stitched from them so far.
+        self._windows = []
+        self._schedules = {}
+        for window in windows:
+            self.add_window(window)
+
+    def add_window(self, window):
+        """
+        Adds the {channel id: Schedule} of the window following the ones
+        already added.
+        """
+        self._windows.append(window)
+        self._schedules.clear()
+
+    def get_schedule(self, channel_id):
+        schedule = self._schedules.get(channel_id)
+        if schedule is None:
+            parts = [window[channel_id] for window in self._windows if channel_id in window]
+            if len(parts) == 1:
+                schedule = parts[0]
+            else:
+                schedule = Schedule()
+                for part in parts:
+                    schedule.extend(part)
+            self._schedules[channel_id] = schedule
+        return schedule
+
+    def now_next(self, channel_id, when):
+        return self.get_schedule(channel_id).now_next(when)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed file store with a byte budget.
+
+Files are named after a hash of their key, so a lookup is a single `stat`.
+Eviction is a single directory pass that drops the least recently used
+files first, going by the access times the file system records when the
+files are read. All file access goes through `xbmcvfs`, like the downloads
+filling the store.
+"""
+import hashlib
+import logging
+import os
+import time
+
+import xbmcvfs
+
+logger = logging.getLogger(__name__)
+
+# Suffix of files that are still being written.
+PARTIAL_SUFFIX = '.part'
+
+
+class FileStore(object):
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, key, suffix=''):
+        """
+        Returns the path the file for the key lives at, whether it exists or not.
+        """
+        if isinstance(key, unicode):
+            key = key.encode('utf-8')
+        return os.path.join(self.directory, hashlib.sha1(key).hexdigest()[:20] + suffix)
+
+    def get(self, key, suffix=''):
+        """
+        Returns the path of the stored file for the key, or None.
+        """
+        path = self.path(key, suffix)
+        return path if xbmcvfs.exists(path) else None
+
+    def ensure_directory(self):
+        # Directories need the trailing separator for xbmcvfs.exists.
+        if not xbmcvfs.exists(os.path.join(self.directory, '')):
+            xbmcvfs.mkdirs(self.directory)
+
+    def evict(self, grace=60 * 60):
+        """
+        Removes the least recently used files until the store fits in its budget,
+        along with partial files older than `grace` seconds.
+        Returns the number of removed files.
+        """
+        if not xbmcvfs.exists(os.path.join(self.directory, '')):
+            return 0
+        _, names = xbmcvfs.listdir(self.directory)
+
+        now = time.time()
+        files = []
+        total = 0
+        removed = 0
+        for name in names:
+            path = os.path.join(self.directory, name)
+            stat = xbmcvfs.Stat(path)
+            if name.endswith(PARTIAL_SUFFIX):
+                if stat.st_mtime() < now - grace and xbmcvfs.delete(path):
+                    removed += 1
+                continue
+
+            files.append((max(stat.st_atime(), stat.st_mtime()), stat.st_size(), path))
+            total += stat.st_size()
+
+        if total > self.max_bytes:
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                if not xbmcvfs.delete(path):
+                    logger.warn('Failed to evict %s', path)
+                    continue
+                total -= size
+                removed += 1
+
+        return removed
@@ -6,6 +6,22 @@ from . import settings
 import logging
 import xbmc
 
+LEVELS = {
+    logging.CRITICAL: xbmc.LOGFATAL,
+    logging.ERROR: xbmc.LOGERROR,
+    logging.WARNING: xbmc.LOGWARNING,
+    logging.INFO: xbmc.LOGNOTICE,
+    logging.DEBUG: xbmc.LOGDEBUG,
+    logging.NOTSET: xbmc.LOGNONE,
+}
+
+# Level of loggers while debug logs are off, above any record's, so calls
+# return before a record is even created.
+DISABLED = logging.CRITICAL + 1
+
+# Records kept by the buffered handler before it writes them out early.
+BUFFER_CAPACITY = 500
+
 
 class KodiLogHandler(logging.StreamHandler):
 
@@ -15,24 +31,65 @@ class KodiLogHandler(logging.StreamHandler):
         self.setFormatter(formatter)
 
     def emit(self, record):
-        levels = {
-            logging.CRITICAL: xbmc.LOGFATAL,
-            logging.ERROR: xbmc.LOGERROR,
-            logging.WARNING: xbmc.LOGWARNING,
-            logging.INFO: xbmc.LOGNOTICE,
-            logging.DEBUG: xbmc.LOGDEBUG,
-            logging.NOTSET: xbmc.LOGNONE,
-        }
-        if settings.is_debug():
-            try:
-                xbmc.log(self.format(record), levels[record.levelno])
-            except UnicodeEncodeError:
-                xbmc.log(self.format(record).encode('utf-8', 'ignore'), levels[record.levelno])
+        try:
+            xbmc.log(self.format(record), LEVELS[record.levelno])
+        except UnicodeEncodeError:
+            xbmc.log(self.format(record).encode('utf-8', 'ignore'), LEVELS[record.levelno])
 
     def flush(self):
         pass
 
 
-def config(logger):
-    logger.addHandler(KodiLogHandler())
-    logger.setLevel(logging.DEBUG)
+class BufferedKodiLogHandler(logging.Handler):
+    """
+    Formats records as they come and writes them to the Kodi log in one go on
+    flush, or early once BUFFER_CAPACITY records are waiting or an error is logged.
+    """
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.target = KodiLogHandler()
+        self.setFormatter(self.target.formatter)
+        self.buffer = []
+
+    def emit(self, record):
+        # Formatted now, the arguments may change before the flush.
+        record.msg = record.getMessage()
+        record.args = None
+        self.buffer.append(record)
+        if len(self.buffer) >= BUFFER_CAPACITY or record.levelno >= logging.ERROR:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            buffer, self.buffer = self.buffer, []
+            for record in buffer:
+                self.target.emit(record)
+        finally:
+            self.release()
+
+
+def config(*loggers):
+    """
+    Sets up the loggers for this invocation, reading the debug settings once.
+    Calling it again replaces the handlers it added before.
+    """
+    debug = settings.is_debug()
+    buffered = debug and settings.is_log_buffered()
+    for logger in loggers:
+        for handler in logger.handlers[:]:
+            if isinstance(handler, (KodiLogHandler, BufferedKodiLogHandler)):
+                handler.flush()
+                logger.removeHandler(handler)
+
+        logger.addHandler(BufferedKodiLogHandler() if buffered else KodiLogHandler())
+        logger.setLevel(logging.DEBUG if debug else DISABLED)
+        # Records of module loggers are handled once, by their configured parent.
+        logger.propagate = False
+
+
+def flush(*loggers):
+    for logger in loggers:
+        for handler in logger.handlers:
+            handler.flush()
@@ -5,15 +5,30 @@ import xbmcaddon
 import xbmcgui
 import xbmcvfs
 import logging
+import binascii
 import json as json
 import os
-import uuid
-from urllib2 import urlopen
+import time
 
-# read settings
+from .filestore import PARTIAL_SUFFIX
+
+# The one Addon instance of the add-on, shared by all modules.
 ADD_ON = xbmcaddon.Addon()
 PROFILE = unicode(xbmc.translatePath(ADD_ON.getAddonInfo('profile')), 'utf-8')
 TEMP = unicode(xbmc.translatePath(os.path.join(PROFILE, 'temp', '')), 'utf-8')
+CACHE_FILE = os.path.join(PROFILE, 'cache.db')
+CATALOG_FILE = os.path.join(PROFILE, 'catalog.db')
+SUBTITLES_DIR = os.path.join(PROFILE, 'subtitles')
+ARTWORK_DIR = os.path.join(PROFILE, 'artwork')
+FOREGROUND_FILE = os.path.join(PROFILE, 'foreground')
+CIRCUITS_FILE = os.path.join(PROFILE, 'circuits.json')
+TIMINGS_FILE = os.path.join(PROFILE, 'timings.json')
+PROFILES_DIR = os.path.join(PROFILE, 'profiles')
+
+# cProfile dumps kept in PROFILES_DIR.
+MAX_PROFILES = 20
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +46,10 @@ def get_setting(setting):
 
 
 def set_setting(setting, value):
+    from . import settings
+
     ADD_ON.setSetting(setting, str(value))
+    settings.invalidate()
 
 
 def get_setting_as_bool(setting):
@@ -70,11 +88,49 @@ def kodi_json_request(params):
             return response['result']
         return None
     except KeyError:
-        logger.warn("[%s] %s" %
-                    (params['method'], response['error']['message']))
+        logger.warn("[%s] %s", params['method'], response['error']['message'])
         return None
 
 
+def claim_foreground():
+    """
+    Marks the current invocation as the one the user is looking at and returns its id.
+    """
+    # Not uuid, which loads ctypes on import.
+    invocation_id = binascii.hexlify(os.urandom(16))
+    try:
+        with open(FOREGROUND_FILE, 'w') as f:
+            f.write(invocation_id)
+    except IOError as e:
+        logger.warn("Failed to write %s -- %s", FOREGROUND_FILE, e)
+    return invocation_id
+
+
+def is_foreground(invocation_id):
+    """
+    Returns whether no other invocation started since the given one claimed the foreground.
+    """
+    try:
+        with open(FOREGROUND_FILE) as f:
+            return f.read() == invocation_id
+    except IOError:
+        return True
+
+
+def save_profile(profiler, name):
+    """
+    Dumps the cProfile stats into the profiles folder, removing the oldest dumps.
+    """
+    xbmcvfs.mkdirs(PROFILES_DIR)
+    path = os.path.join(PROFILES_DIR, '{}-{}.prof'.format(time.strftime('%Y%m%d-%H%M%S'), name))
+    profiler.dump_stats(path)
+    logger.info("Saved profile %s", path)
+
+    dumps = sorted(name for name in os.listdir(PROFILES_DIR) if name.endswith('.prof'))
+    for old_dump in dumps[:-MAX_PROFILES]:
+        xbmcvfs.delete(os.path.join(PROFILES_DIR, old_dump))
+
+
 def rmtree(path):
     if isinstance(path, unicode):
         path = path.encode('utf-8')
@@ -88,23 +144,82 @@ def rmtree(path):
 
 
 def cleanup_temp_dir():
+    """
+    Removes the temp folder older versions used for subtitles.
+    """
+    if not xbmcvfs.exists(TEMP):
+        return
+
     try:
         rmtree(TEMP)
     except:
         pass
 
-    xbmcvfs.mkdirs(TEMP)
 
-
-def download_url_content_to_temp(url, filename):
+def download_url_content(url, path, session=None, timeout=None, converter=None):
     """
-    Write the URL contents to a temp file.
+    Write the URL contents to the given file.
+
+    The body is streamed to disk in chunks, through a `converter` (such as
+    `vtt.VttToSrtConverter`) when one is given. When a `session` (a requests
+    session or a `transport.Transport`) is given the download reuses its
+    pooled connections. The file only appears under its final name once the
+    download is complete.
     """
-    temp_file = os.path.join(TEMP, filename)
-    logger.info("Downloading URL {} to {}".format(url, temp_file))
+    logger.info("Downloading URL %s to %s", url, path)
+
+    if session is None:
+        from urllib2 import urlopen
+        response = urlopen(url, timeout=timeout)
+        chunks = iter(lambda: response.read(DOWNLOAD_CHUNK_SIZE), b'')
+    else:
+        response = session.get(url, stream=True, timeout=timeout)
+        response.raise_for_status()
+        chunks = response.iter_content(DOWNLOAD_CHUNK_SIZE)
+
+    partial_file = path + PARTIAL_SUFFIX
+    local_file_handle = xbmcvfs.File(partial_file, "wb")
+    try:
+        writer = converter(local_file_handle.write) if converter else None
+        for chunk in chunks:
+            if writer:
+                writer.feed(chunk)
+            else:
+                local_file_handle.write(chunk)
+        if writer:
+            writer.close()
+    finally:
+        local_file_handle.close()
+        response.close()
+
+    if not xbmcvfs.rename(partial_file, path):
+        raise IOError('Failed to move {} to {}'.format(partial_file, path))
 
-    local_file_handle = xbmcvfs.File(temp_file, "wb")
-    local_file_handle.write(urlopen(url).read())
-    local_file_handle.close()
+    return path
 
-    return temp_file
+
+def add_subtitles_to_player(subtitle_files, start_timeout=30):
+    """
+    Adds subtitle files to the video that is about to start playing, keeping
+    the subtitle stream the user currently has selected.
+    """
+    player = xbmc.Player()
+    monitor = xbmc.Monitor()
+
+    waited = 0
+    while not player.isPlayingVideo():
+        if waited >= start_timeout or monitor.waitForAbort(0.5):
+            logger.info("Playback did not start, dropping subtitles %s", subtitle_files)
+            return
+        waited += 0.5
+
+    visible = xbmc.getCondVisibility('VideoPlayer.SubtitlesEnabled')
+    current = player.getSubtitles()
+    for subtitle_file in subtitle_files:
+        # setSubtitles also switches to the added stream.
+        player.setSubtitles(subtitle_file)
+
+    streams = player.getAvailableSubtitleStreams()
+    if current in streams:
+        player.setSubtitleStream(streams.index(current))
+    player.showSubtitles(visible)
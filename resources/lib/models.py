@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Compact model of the items of the Zee5 listings.
+
+gwapi items carry many fields the add-on never shows (countries, seo_title,
+nested image maps, ...). `Item` keeps just what rendering needs, parsed once
+from the JSON of a response, and turns into a short list for storing it in
+the caches. The original title and tags, only searched by the catalog, are
+collected on the side by `parse_items` for indexing the listed items.
+"""
+
+# Parsed release dates; the episodes of a daily show share a few of them.
+MAX_CACHED_DATES = 1024
+_dates = {}
+
+DAYS_IN_MONTH = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def parse_date(value):
+    """
+    Returns the year and the `dd.mm.yyyy` form of a `YYYY-MM-DD[THH:MM:SS]`
+    date, or (None, None) if it is malformed.
+    """
+    try:
+        return _dates[value]
+    except KeyError:
+        pass
+
+    parsed = None, None
+    if len(value) >= 10 and value[4] == '-' and value[7] == '-' and value[10:11] in ('', 'T', ' '):
+        year, month, day = value[:4], value[5:7], value[8:10]
+        if year.isdigit() and month.isdigit() and day.isdigit():
+            year_number, month_number, day_number = int(year), int(month), int(day)
+            if 1 <= month_number <= 12 and 1 <= day_number <= DAYS_IN_MONTH[month_number - 1]:
+                leap = year_number % 4 == 0 and (year_number % 100 != 0 or year_number % 400 == 0)
+                if month_number != 2 or day_number < 29 or leap:
+                    parsed = year_number, day + '.' + month + '.' + year
+
+    if len(_dates) >= MAX_CACHED_DATES:
+        _dates.clear()
+    _dates[value] = parsed
+    return parsed
+
+
+def get_genre(data):
+    """
+    Returns a string of genre -- comma separated if multiple genres.
+    Returns ALL as default.
+    """
+    if not data:
+        return 'ALL'
+
+    genres = set()
+    for field in ('genre', 'genres'):
+        for genre in data.get(field) or []:
+            genres.add(genre['value'])
+
+    return ','.join(genres) if genres else 'ALL'
+
+
+def get_images(data):
+    """
+    Returns a tuple of list_image & cover_image.
+    """
+    images = data.get('image_url')
+    if not images:
+        return None, None
+
+    if type(images) is dict:
+        return images.get('list'), images.get('cover')
+    else:
+        return images, images
+
+
+class Item(object):
+    __slots__ = (
+        'id', 'title', 'subtype', 'description', 'genre', 'list_image', 'cover_image',
+        'duration', 'episode', 'release_date',
+    )
+
+    def __init__(self, id, title, subtype=None, description=None, genre='ALL',
+                 list_image=None, cover_image=None, duration=None, episode=None, release_date=None):
+        self.id = id
+        self.title = title
+        self.subtype = subtype
+        self.description = description
+        self.genre = genre
+        self.list_image = list_image
+        self.cover_image = cover_image
+        self.duration = duration
+        self.episode = episode
+        self.release_date = release_date
+
+    @classmethod
+    def parse(cls, data):
+        """
+        Returns the item of a gwapi JSON object.
+        """
+        list_image, cover_image = get_images(data)
+        return cls(
+            data['id'],
+            data['title'],
+            data.get('asset_subtype'),
+            data.get('description'),
+            get_genre(data),
+            list_image,
+            cover_image,
+            data.get('duration'),
+            data.get('episode_number'),
+            data.get('release_date'),
+        )
+
+    def to_json(self):
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def from_json(cls, value):
+        """
+        Returns the item stored with `to_json`.
+        """
+        return cls(*value)
+
+    def __repr__(self):
+        return 'Item({!r}, {!r})'.format(self.id, self.title)
+
+
+def get_keywords(data):
+    """
+    Returns the words, besides the title, the catalog finds the gwapi JSON
+    object by: its original title and tags.
+    """
+    keywords = [tag for tag in data.get('tags') or () if tag]
+    original_title = data.get('original_title')
+    if original_title and original_title != data.get('title'):
+        keywords.insert(0, original_title)
+    return keywords
+
+
+def parse_items(values, keywords=None):
+    """
+    Returns the items of the gwapi JSON objects. With a `keywords` dict, the
+    `get_keywords` of each item are added to it by item id.
+    """
+    items = [Item.parse(value) for value in values]
+    if keywords is not None:
+        for item, value in zip(items, values):
+            keywords[item.id] = get_keywords(value)
+    return items
+
+
+def parse_details(data):
+    """
+    Returns what playing a video needs of its `content/details` JSON object:
+    title, stream paths, subtitle languages and images.
+    """
+    video_details = data.get('video_details') or {}
+    list_image, cover_image = get_images(data)
+    return {
+        'title': data.get('title'),
+        'hls_url': video_details.get('hls_url'),
+        'manifest_url': video_details.get('url'),
+        'subtitles': [lang for lang in video_details.get('subtitles') or [] if lang],
+        'list_image': list_image,
+        'cover_image': cover_image,
+    }
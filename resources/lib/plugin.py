@@ -1,39 +1,247 @@
 # -*- coding: utf-8 -*-
 import logging
-import xbmcaddon
 from . import kodilogging
 from . import kodiutils
 from . import settings
-
+from . import tokens
+from .cache import ResponseCache, normalize_url
+from .models import Item, get_images, parse_date, parse_details, parse_items
+from .filestore import FileStore
+from .timings import Timings, append_record, timed
+from .transport import ApiError, Transport
+from .workers import TaskTimeout, WorkerPool, wait_all
+
+import heapq
 import sys
+import threading
+
+from itertools import islice
 
 from urllib import urlencode
 from urllib import quote
 from urlparse import parse_qsl
 
-from datetime import datetime
-
 import xbmcgui
 import xbmcplugin
 import xbmc
 
-import requests
-import itertools
-import operator
-
 import time
 
-ADD_ON = xbmcaddon.Addon()
+ADD_ON = kodiutils.ADD_ON
 logger = logging.getLogger(ADD_ON.getAddonInfo('id'))
-kodilogging.config(logger)
+# The add-on logger and the parent of the helper module loggers.
+LOGGERS = (logger, logging.getLogger(__name__.rpartition('.')[0]))
 
 USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_14_2) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/71.0.3578.80 Safari/537.36'
 
+# Cache lifetime (in seconds) of the listing endpoints, matched by URL prefix.
+# Responses of endpoints not listed here are never cached.
+CACHE_TTLS = (
+    ('https://b2bapi.zee5.com/front/countrylist.php', 24 * 60 * 60),
+    ('https://gwapi.zee5.com/content/collection/', 30 * 60),
+    ('https://gwapi.zee5.com/content/tvshow/', 60 * 60),
+    ('https://gwapi.zee5.com/content/season/', 30 * 60),
+    ('https://catalogapi.zee5.com/v1/channel/', 24 * 60 * 60),
+)
+
+# How long an expired listing may still be rendered while it gets refreshed
+# in the background.
+CACHE_MAX_STALE = 7 * 24 * 60 * 60
+
+# Cache keys and fallback lifetimes (in seconds) of the access tokens.
+PLATFORM_TOKEN_KEY = 'token:platform'
+PLATFORM_TOKEN_TTL = 60 * 60
+VIDEO_TOKEN_KEY = 'token:video'
+VIDEO_TOKEN_TTL = 30 * 60
+
+# Tokens are refreshed in the background once they get this close to their
+# expiry, and are never handed out during the last TOKEN_EXPIRY_GRACE seconds.
+TOKEN_REFRESH_MARGIN = 5 * 60
+TOKEN_EXPIRY_GRACE = 30
+
+# Playback records by content id: the details of the video, kept for
+# DETAILS_TTL seconds, and its resolved stream URL, kept while the video token
+# in it stays valid for at least TOKEN_REFRESH_MARGIN seconds.
+DETAILS_URL = 'https://gwapi.zee5.com/content/details/{}?translation=en'
+DETAILS_KEY = 'details:{}'
+DETAILS_TTL = 6 * 60 * 60
+STREAM_KEY = 'stream:{}'
+
+# Subtitle tracks download in parallel; each one gets SUBTITLE_TIMEOUT seconds.
+SUBTITLE_WORKERS = 4
+SUBTITLE_TIMEOUT = 10
+
+# Downloaded subtitles are kept for rewatching, up to this many bytes.
+SUBTITLES_MAX_BYTES = 50 * 1024 * 1024
+
+# Artwork of the prefetched pages downloads on ARTWORK_WORKERS threads once the
+# folder is rendered, for at most ARTWORK_TIMEOUT seconds. The local copies
+# take up to ARTWORK_MAX_BYTES.
+ARTWORK_WORKERS = 4
+ARTWORK_TIMEOUT = 10
+ARTWORK_MAX_BYTES = 100 * 1024 * 1024
+
+SEARCH_URL = (
+    'https://gwapi.zee5.com/content/getContent/autoSuggest?country=US&q={query}&limit={limit}'
+    '&translation=en&languages={lang}&version=1'
+)
+
+# With local hits to show, remote search results are waited for this many
+# seconds; later ones are kept for the next time the query is run.
+SEARCH_REMOTE_WAIT = 0.75
+SEARCH_REMOTE_TIMEOUT = 15
+
+# Search results are kept with the other responses, under 'search:' keys, and
+# the history of queries holds the SEARCH_HISTORY_SIZE most recently used ones.
+SEARCH_RESULTS_KEY = u'search:{}|{}'
+SEARCH_TTL = 60 * 60
+SEARCH_HISTORY_KEY = 'search:history'
+SEARCH_HISTORY_SIZE = 20
+SEARCH_HISTORY_TTL = 365 * 24 * 60 * 60
+
+# The root folder shows a preview of each collection, from their first pages,
+# fetched ROOT_WORKERS at a time. It renders with the ones done within
+# ROOT_DEADLINE seconds; the others are still fetched into the cache
+# afterwards, so the collections open from the cache either way.
+ROOT_WORKERS = 4
+ROOT_DEADLINE = 1.5
+# Rails named in the description of a collection.
+ROOT_PREVIEW_TITLES = 3
+
+# Live channels, grouped by genre.
+CHANNELS_URL = (
+    'https://catalogapi.zee5.com/v1/channel/bygenre?sort_by_field=channel_number&country=US'
+    '&translation=en&languages={lang}'
+)
+
+# The programme guide is fetched for one UTC day (a window) at a time, for
+# EPG_BATCH channels per request and EPG_WORKERS requests at a time. Each
+# window is cached under an EPG_KEY and refreshed after EPG_TTL seconds, the
+# stale copy being shown meanwhile. The live folder needs the windows of now
+# and of EPG_LOOKAHEAD seconds from now.
+EPG_URL = (
+    'https://gwapi.zee5.com/v1/epg?channels={channels}&start={start}&end={start}&time_offset=%2B00:00'
+    '&page=1&limit={limit}&translation=en&country=US'
+)
+EPG_KEY = u'epg:{}|{}'
+EPG_TTL = 6 * 60 * 60
+EPG_MAX_STALE = 2 * 24 * 60 * 60
+EPG_BATCH = 20
+EPG_WORKERS = 4
+EPG_LOOKAHEAD = 4 * 60 * 60
+
+# Plugin URLs carry only the action, content id and page, so they stay the
+# same between invocations. The breadcrumb of each listed folder is kept
+# under a ROUTE_KEY instead, for ROUTE_TTL seconds.
+ROUTE_KEY = u'route:{}:{}'
+ROUTE_TTL = 90 * 24 * 60 * 60
+
+# Asset sub-types rendered as playable videos, and as shows.
+VIDEO_SUBTYPES = (
+    'trailer', 'movie', 'video',
+    'episode', 'teaser', 'music',
+    'webisode', 'clip', 'preview',
+    'news'
+)
+SHOW_SUBTYPES = ('original', 'tvshow')
+
+COUNTRYLIST_URL = 'https://b2bapi.zee5.com/front/countrylist.php?lang=en&ccode=US'
+
+# Paginated listings by route action.
+LISTING_URLS = {
+    'season': 'https://gwapi.zee5.com/content/season/{id}?country=US&page={page}&limit={limit}',
+    'show': 'https://gwapi.zee5.com/content/tvshow/{id}?country=US&page={page}&limit={limit}',
+    'manual': 'https://gwapi.zee5.com/content/collection/{id}?country=US&page={page}&limit={limit}'
+              '&languages={lang}&translation=en&version=3',
+    'collection': 'https://gwapi.zee5.com/content/collection/{id}?country=US&page={page}&limit={limit}'
+                  '&item_limit=1&languages={lang}&version=3',
+}
+
+# Listings fetched one language (shard) at a time, the languages= parameter
+# holding a single language, so that each shard is cached on its own and
+# toggling a language leaves the others cached. Their pages are cut from the
+# shards merged by `orderid`, the first pages of the shards being fetched
+# SHARD_WORKERS at a time and the following ones as the merge reaches them.
+# Each merged page is cached as well, under the key of the combined URL, so
+# that reading it back takes a single lookup.
+SHARDED_ACTIONS = ('manual', 'collection')
+SHARD_WORKERS = 4
+
+# Listings whose next page is fetched in the background, and how long
+# (in seconds) that may take before it is given up.
+PREFETCHED_ACTIONS = ('manual', 'season', 'show')
+PREFETCH_TIMEOUT = 10
+PREFETCH_POLL_INTERVAL = 0.25
+
+# In "load all" mode the remaining pages of these listings are fetched
+# concurrently, LOAD_ALL_WORKERS at a time, and merged into the first page.
+LOAD_ALL_ACTIONS = ('manual', 'season', 'show')
+LOAD_ALL_WORKERS = 4
+
+
+def get_item_action(item):
+    """
+    Returns the route action opening the item, or None for unsupported items.
+    """
+    subtype = item.subtype
+    if subtype == 'Manual':
+        return 'manual'
+    if subtype in VIDEO_SUBTYPES:
+        return 'play'
+    if subtype in SHOW_SUBTYPES:
+        return 'show'
+    return None
+
+
+def get_search_query_key(query):
+    if not isinstance(query, unicode):
+        query = query.decode('utf-8', 'ignore')
+    return u' '.join(query.lower().split())
+
+
+def merge_search_results(results, data, keywords=None):
+    """
+    Returns the (action, item) pairs with the autoSuggest results in `data`
+    not among them added, collecting their keywords as `parse_items` does.
+    """
+    seen = set(item.id for _, item in results)
+    results = list(results)
+    for item in parse_items(data.get('docs') or [], keywords):
+        if item.id not in seen:
+            seen.add(item.id)
+            results.append((get_item_action(item) or 'play', item))
+    return results
+
+
+def merge_shards(shards):
+    """
+    Yields the JSON objects of the language shards, each an iterable in the
+    API's order, merged by their `orderid` (the rank of an item in the listing
+    of all languages), or their position in the shard when they have none.
+    Objects whose id was already yielded are skipped.
+    """
+    def decorate(index, shard):
+        for position, value in enumerate(shard):
+            orderid = value.get('orderid')
+            yield (orderid if isinstance(orderid, (int, long)) else position), index, position, value
+
+    seen = set()
+    for _, _, _, value in heapq.merge(*[decorate(index, shard) for index, shard in enumerate(shards)]):
+        if value['id'] not in seen:
+            seen.add(value['id'])
+            yield value
+
+
+def get_cache_ttl(url):
+    for prefix, ttl in CACHE_TTLS:
+        if url.startswith(prefix):
+            return ttl
+    return None
+
 
 class Zee5Plugin(object):
-    ITEMS_LIMIT = 25
 
-    def __init__(self, plugin_args):
+    def __init__(self, plugin_args, foreground=True):
         # Get the plugin url in plugin:// notation.
         self.plugin_url = plugin_args[0]
         # Get the plugin handle as an integer number.
@@ -42,15 +250,69 @@ class Zee5Plugin(object):
         # {<parameter>: <value>} elements
         self.params = dict(parse_qsl(plugin_args[2][1:]))
 
+        # Opt-in per-phase timings of this invocation.
+        self.timings = Timings(settings.is_timing_enabled(), label=self.params.get('action', 'root'))
+        self.timings.install_network_probes()
+
         # Static data
         self.platform = 'web_app'
         self.languages = settings.get_languages()
-        self.session = requests.Session()
-
-        # Initialise the token.
-        self.token = self.params['token'] if 'token' in self.params else self._get_token()
-
-    def _get_headers(self):
+        self.items_limit = settings.get_page_size()
+        self._token = None
+        self._token_lock = threading.Lock()
+        self.cache = ResponseCache(kodiutils.CACHE_FILE)
+        self.transport = Transport(kodiutils.CIRCUITS_FILE)
+        self._catalog = None
+        self.subtitles = FileStore(kodiutils.SUBTITLES_DIR, SUBTITLES_MAX_BYTES)
+        self._artwork = None
+
+        # Items of the virtual folder, handed over to Kodi in a single call.
+        self.directory_items = []
+        self.content = None
+        # The (action, item) pairs listed, added to the catalog afterwards
+        # with the keywords of the items by id.
+        self.catalog_entries = []
+        self.keywords = {}
+        # Breadcrumbs of the listed folders by ROUTE_KEY, stored afterwards.
+        self.route_states = {}
+
+        # Tasks to run once the directory has been handed over to Kodi.
+        self.deferred = []
+        # Set when the deferred tasks are given up on; their worker threads
+        # are left behind and stop at their next request.
+        self.cancelled = threading.Event()
+
+        # Background work of earlier invocations stops once this one starts.
+        self.invocation_id = kodiutils.claim_foreground() if foreground else None
+
+    @property
+    def catalog(self):
+        if self._catalog is None:
+            from .catalog import Catalog
+            self._catalog = Catalog(kodiutils.CATALOG_FILE)
+        return self._catalog
+
+    @property
+    def artwork(self):
+        # Playback and search history routes show no artwork.
+        if self._artwork is None:
+            from .artwork import Artwork
+            self._artwork = Artwork(
+                FileStore(kodiutils.ARTWORK_DIR, ARTWORK_MAX_BYTES), ARTWORK_WORKERS, ARTWORK_TIMEOUT
+            )
+        return self._artwork
+
+    @property
+    def token(self):
+        # Resolved on the first request, so cached routes skip it altogether.
+        if self._token is None:
+            with self._token_lock:
+                if self._token is None:
+                    with self.timings.phase('token'):
+                        self._token = self._get_token()
+        return self._token
+
+    def _get_headers(self, authenticated=True):
         headers = {
             "Origin": "https://www.zee5.com",
             "User-Agent": USER_AGENT,
@@ -61,32 +323,277 @@ class Zee5Plugin(object):
             "Accept": "application/json, text/plain, */*",
             "Accept-Language": "en-US,en;q=0.9",
         }
-        if hasattr(self, 'token'):
+        if authenticated:
             headers["X-ACCESS-TOKEN"] = self.token
 
         return headers
 
     def _get_video_token(self):
-        data = self.make_request('https://useraction.zee5.com/tokennd/')
+        return self._get_cached_token(VIDEO_TOKEN_KEY, VIDEO_TOKEN_TTL, self._fetch_video_token)
+
+    def _fetch_video_token(self):
+        data = self._fetch('https://useraction.zee5.com/tokennd/', retry_auth=False)
         return data['video_token']
 
     def _get_token(self):
-        data = self.make_request(
-            'https://useraction.zee5.com/token/platform_tokens.php?platform_name={}'.format(self.platform)
+        return self._get_cached_token(PLATFORM_TOKEN_KEY, PLATFORM_TOKEN_TTL, self._fetch_token)
+
+    def _fetch_token(self):
+        # Older plugin URLs carry a token, use it once before asking for a new one.
+        if 'token' in self.params:
+            return self.params.pop('token')
+
+        data = self._fetch(
+            'https://useraction.zee5.com/token/platform_tokens.php?platform_name={}'.format(self.platform),
+            retry_auth=False,
+            authenticated=False,
         )
         return data['token']
 
+    def _get_cached_token(self, key, default_ttl, fetch):
+        """
+        Returns the token stored under the key, fetching a new one when there
+        is none or it is about to expire.
+        """
+        entry = self.cache.get(key, max_stale=TOKEN_REFRESH_MARGIN - TOKEN_EXPIRY_GRACE)
+        if entry:
+            if entry.is_stale:
+                # Still usable, but renew it once the directory is rendered.
+                self.deferred.append(lambda: self._store_token(key, default_ttl, fetch))
+            return entry.value
+
+        return self._store_token(key, default_ttl, fetch)
+
+    def _store_token(self, key, default_ttl, fetch):
+        token = fetch()
+        ttl = tokens.get_expiry(token, default_ttl) - time.time() - TOKEN_REFRESH_MARGIN
+        self.cache.set(key, token, max(ttl, 0))
+        return token
+
+    def get_listing_url(self, action, content_id, page_number, lang=None):
+        return LISTING_URLS[action].format(
+            id=content_id,
+            page=page_number,
+            limit=self.items_limit,
+            lang=lang or self.languages,
+        )
+
+    def is_sharded(self, action):
+        return action in SHARDED_ACTIONS and ',' in self.languages
+
+    def get_page(self, action, content_id, page_number):
+        """
+        Returns the listing page; pages of SHARDED_ACTIONS are merged from the
+        language shards.
+        """
+        data = self._get_cached_page(action, content_id, page_number)
+        if data is not None:
+            return data
+        if self.is_sharded(action):
+            return self._merge_page(action, content_id, int(page_number))
+        return self._revalidate(self.get_listing_url(action, content_id, page_number))
+
+    def _get_cached_page(self, action, content_id, page_number):
+        """
+        Returns the listing page when it is in the cache, or None. Merged pages
+        are only returned while fresh, stale ones are merged again from their
+        shards.
+        """
+        url = self.get_listing_url(action, content_id, page_number)
+        if not self.is_sharded(action):
+            entry = self.get_cached_response(url)
+            return entry.value if entry else None
+
+        with self.timings.phase('cache'):
+            entry = self.cache.get(self._get_cache_key(url))
+        return entry.value if entry else None
+
+    def _merge_page(self, action, content_id, page_number, count=None, refresh=False):
+        """
+        Returns the listing page of `items_limit` items (or the first `count`
+        items of the listing) cut from the language shards merged, with the
+        sum of the shard totals as its total.
+
+        The first pages of the shards are read from the cache (or fetched
+        again, with `refresh`) and the missing ones fetched concurrently;
+        shards that fail are left out, unless all of them do. The following
+        pages of a shard are only fetched once the merge reaches them. The
+        merged page is cached when it was made of complete, fresh shards.
+        """
+        languages = self.languages.split(',')
+        urls = [self.get_listing_url(action, content_id, 1, lang) for lang in languages]
+
+        workers = WorkerPool(SHARD_WORKERS)
+        if refresh:
+            responses, tasks, stale = {}, [(url, workers.submit(self._revalidate, url)) for url in urls], False
+        else:
+            responses, tasks, stale = self._start_requests(urls, workers)
+        error = None
+        for url, task in tasks:
+            try:
+                responses[url] = task.result()
+            except ApiError as e:
+                logger.warn('Failed to load %s -- %s', url, e)
+                error = e
+        workers.shutdown()
+
+        shards = [(lang, responses[url]) for lang, url in zip(languages, urls) if url in responses]
+        if not shards:
+            raise error
+
+        limit = self.items_limit
+        start = (page_number - 1) * limit
+        count = count or limit
+        status = {'complete': error is None, 'stale': stale}
+        pages = self._load_shard_pages(action, content_id, shards, start + count) if count > limit else {}
+        items = list(islice(merge_shards([
+            self._iter_shard(action, content_id, lang, data, pages, status) for lang, data in shards
+        ]), start, start + count))
+
+        total = sum(data.get('total') or 0 for _, data in shards)
+        if len(items) < count:
+            # The shards ran out early, their totals counted the same items.
+            total = start + len(items)
+
+        # A page of more than `limit` items ends on the last page it holds.
+        data = dict(shards[0][1], page=page_number + max(len(items) - 1, 0) // limit, limit=limit, total=total)
+        if action == 'collection':
+            data['buckets'] = items
+        else:
+            bucket = next((shard['buckets'][0] for _, shard in shards if shard.get('buckets')), None)
+            data['buckets'] = [dict(bucket, items=items, total=total)] if bucket else []
+
+        if count == limit and status['complete'] and not status['stale']:
+            url = self.get_listing_url(action, content_id, page_number)
+            self.cache.set(self._get_cache_key(url), data, get_cache_ttl(url))
+        return data
+
+    def _iter_shard(self, action, content_id, lang, data, pages, status):
+        """
+        Yields the items of a language shard from its first page, `data`, on.
+        The following pages are taken from `pages` ({url: response}), the
+        cache or the API, as they are reached.
+        """
+        page_number = 1
+        while True:
+            items = self.get_listing_items(action, data)
+            for value in items:
+                yield value
+            if not items or page_number * (data.get('limit') or self.items_limit) >= (data.get('total') or 0):
+                return
+
+            page_number += 1
+            url = self.get_listing_url(action, content_id, page_number, lang)
+            if url in pages:
+                data = pages[url]
+                continue
+
+            try:
+                entry = self.get_cached_response(url)
+                data = entry.value if entry else self._revalidate(url)
+            except ApiError as e:
+                logger.warn('Failed to load %s -- %s', url, e)
+                status['complete'] = False
+                return
+            status['stale'] = status['stale'] or bool(entry and entry.is_stale)
+
+    def _load_shard_pages(self, action, content_id, shards, count):
+        """
+        Returns the {url: response} of the shard pages after the first ones
+        that the merge may reach before `count` items, fetched LOAD_ALL_WORKERS
+        at a time. Pages that fail are left out.
+        """
+        urls = []
+        for lang, data in shards:
+            limit = data.get('limit') or self.items_limit
+            last = (min(data.get('total') or 0, count) + limit - 1) // limit
+            urls.extend(self.get_listing_url(action, content_id, page, lang) for page in range(2, last + 1))
+
+        workers = WorkerPool(LOAD_ALL_WORKERS)
+        responses, tasks, _ = self._start_requests(urls, workers)
+        for url, task in tasks:
+            try:
+                responses[url] = task.result()
+            except ApiError as e:
+                logger.warn('Failed to load %s -- %s', url, e)
+        workers.shutdown()
+        return responses
+
+    def _start_requests(self, urls, workers):
+        """
+        Returns the {url: response} of the URLs in the cache, the (url, task)
+        pairs of the others, submitted to the workers, and whether any of the
+        cached responses is stale.
+        """
+        responses = {}
+        tasks = []
+        stale = False
+        for url in urls:
+            entry = self.get_cached_response(url)
+            if entry:
+                responses[url] = entry.value
+                stale = stale or entry.is_stale
+            else:
+                tasks.append((url, workers.submit(self.make_request, url)))
+        return responses, tasks, stale
+
+    @staticmethod
+    def get_listing_items(action, data):
+        """
+        Returns the list holding the items of a listing page.
+        """
+        if action == 'season':
+            return data.get('episode') or []
+        if action == 'show':
+            return data.get('seasons') or []
+        if action == 'collection':
+            return data.get('buckets') or []
+        return data['buckets'][0]['items'] if data.get('buckets') else []
+
+    def get_listing(self, action, content_id, page_number):
+        """
+        Returns the listing page. In "load all" mode the first page comes back
+        with the items of the following pages (up to the configured maximum)
+        merged in, and its `page` pointing at the last merged page.
+        """
+        data = self.get_page(action, content_id, page_number)
+        if action not in LOAD_ALL_ACTIONS or int(page_number) != 1 or not settings.is_load_all():
+            return data
+
+        limit = data.get('limit') or self.items_limit
+        total = min(data.get('total', 0), settings.get_load_all_max_items())
+        page_count = (total + limit - 1) // limit
+        if page_count < 2:
+            return data
+        if self.is_sharded(action):
+            return self._merge_page(action, content_id, 1, count=total)
+
+        workers = WorkerPool(LOAD_ALL_WORKERS)
+        tasks = [
+            workers.submit(self.get_page, action, content_id, page)
+            for page in range(2, page_count + 1)
+        ]
+
+        items = self.get_listing_items(action, data)
+        for page, task in enumerate(tasks, 2):
+            try:
+                items.extend(self.get_listing_items(action, task.result()))
+            except Exception as e:
+                # Keep the listing contiguous, the rest stays behind the Next Page item.
+                logger.warn('Failed to load page %s of %s -- %s', page, content_id, e)
+                break
+            data['page'] = page
+
+        workers.shutdown()
+        return data
+
     def list_season(self, season_id, page_number, season_name):
         # Set plugin category. It is displayed in some skins as the name
         # of the current section.
         xbmcplugin.setPluginCategory(self.handle, season_name)
 
-        data = self.make_request("https://gwapi.zee5.com/content/season/{id}?country=US&page={page}&limit={limit}".format(
-            id=season_id,
-            page=page_number,
-            limit=Zee5Plugin.ITEMS_LIMIT,
-        ))
-        for episode in data['episode']:
+        data = self.get_listing('season', season_id, page_number)
+        for episode in parse_items(data['episode'], self.keywords):
             self.add_video_item(episode)
 
         self.add_next_page_and_search_item(
@@ -96,23 +603,19 @@ class Zee5Plugin(object):
         # Add a sort method for the virtual folder items (alphabetically, ignore articles)
         xbmcplugin.addSortMethod(self.handle, xbmcplugin.SORT_METHOD_NONE)
         # Finish creating a virtual folder.
-        xbmcplugin.endOfDirectory(self.handle)
+        self.end_directory()
 
     def list_show(self, show_id, page_number, show_name):
         # Set plugin category. It is displayed in some skins as the name
         # of the current section.
         xbmcplugin.setPluginCategory(self.handle, show_name)
 
-        data = self.make_request("https://gwapi.zee5.com/content/tvshow/{id}?country=US&page={page}&limit={limit}".format(
-            id=show_id,
-            page=page_number,
-            limit=Zee5Plugin.ITEMS_LIMIT,
-        ))
-        for season in data['seasons']:
+        data = self.get_listing('show', show_id, page_number)
+        for season in parse_items(data['seasons'], self.keywords):
             self.add_directory_item(
-                content_id=season['id'],
-                title=season['title'],
-                description=season.get('description'),
+                content_id=season.id,
+                title=season.title,
+                description=season.description,
                 action='season',
                 parent_title=show_name,
                 item=season
@@ -124,28 +627,21 @@ class Zee5Plugin(object):
         xbmcplugin.addSortMethod(self.handle, xbmcplugin.SORT_METHOD_NONE)
 
         # Finish creating a virtual folder.
-        xbmcplugin.endOfDirectory(self.handle)
+        self.end_directory()
 
     def list_manual(self, manual_id, page_number, manual_name):
         # Set plugin category. It is displayed in some skins as the name
         # of the current section.
         xbmcplugin.setPluginCategory(self.handle, manual_name)
 
-        data = self.make_request(
-            'https://gwapi.zee5.com/content/collection/{id}?country=US&page={page}&limit={limit}&languages={lang}&translation=en&version=3'.format(
-                id=manual_id,
-                page=page_number,
-                limit=Zee5Plugin.ITEMS_LIMIT,
-                lang=self.languages
-            )
-        )
+        data = self.get_listing('manual', manual_id, page_number)
 
         if not data['buckets']:
-            logger.warn('Buckets data is empty for manual! -- {}'.format(data))
+            logger.warn('Buckets data is empty for manual! -- %s', data)
             kodiutils.notification('No items found', 'Check logs for api content!')
             return
 
-        for item in data['buckets'][0]['items']:
+        for item in parse_items(data['buckets'][0]['items'], self.keywords):
             # {
             #      "id": "0-0-16460",
             #      "rating": 5,
@@ -182,37 +678,32 @@ class Zee5Plugin(object):
             #          "cover": "https://akamaividz1.zee5.com/resources/0-0-16460/cover/270x405/cabarettrailer1920x770.jpg"
             #      },
             # },
-            subtype = item.get('asset_subtype')
+            subtype = item.subtype
             if subtype == 'Manual':
                 self.add_directory_item(
-                    content_id=item['id'],
-                    title=item['title'],
-                    description=item.get('description'),
+                    content_id=item.id,
+                    title=item.title,
+                    description=item.description,
                     action='manual',
                     parent_title=manual_name,
                     item=item
                 )
 
-            elif subtype in [
-                'trailer', 'movie', 'video',
-                'episode', 'teaser', 'music',
-                'webisode', 'clip', 'preview',
-                'news'
-            ]:
+            elif subtype in VIDEO_SUBTYPES:
                 self.add_video_item(item)
 
-            elif subtype in ['original', 'tvshow']:
+            elif subtype in SHOW_SUBTYPES:
                 self.add_directory_item(
-                    content_id=item['id'],
-                    title=item['title'],
-                    description=item.get('description'),
+                    content_id=item.id,
+                    title=item.title,
+                    description=item.description,
                     action='show',
                     parent_title=manual_name,
                     item=item
                 )
 
             elif subtype not in ['external_link']:
-                logger.warn(u'Skipping rendering sub-type from item - {}: {}'.format(subtype, item))
+                logger.warn(u'Skipping rendering sub-type from item - %s: %s', subtype, item)
                 if settings.is_debug():
                     kodiutils.notification(
                         'Unhandled asset type!',
@@ -228,21 +719,14 @@ class Zee5Plugin(object):
         xbmcplugin.addSortMethod(self.handle, xbmcplugin.SORT_METHOD_NONE)
 
         # Finish creating a virtual folder.
-        xbmcplugin.endOfDirectory(self.handle)
+        self.end_directory()
 
     def list_collection(self, collection_id, page_number, collection_name):
         # Set plugin category. It is displayed in some skins as the name
         # of the current section.
         xbmcplugin.setPluginCategory(self.handle, collection_name)
 
-        data = self.make_request(
-            'https://gwapi.zee5.com/content/collection/{id}?country=US&page={page}&limit={limit}&item_limit=1&languages={lang}&version=3'.format(
-                id=collection_id,
-                page=page_number,
-                limit=Zee5Plugin.ITEMS_LIMIT,
-                lang=self.languages,
-            )
-        )
+        data = self.get_page('collection', collection_id, page_number)
         for bucket in data['buckets'] or []:
             # {
             #      "id": "0-8-manualcol_1053401488",
@@ -282,10 +766,11 @@ class Zee5Plugin(object):
             if not bucket.get('items'):
                 continue
 
+            bucket = parse_items([bucket], self.keywords)[0]
             self.add_directory_item(
-                content_id=bucket['id'],
-                title=bucket['title'],
-                description=bucket.get('description'),
+                content_id=bucket.id,
+                title=bucket.title,
+                description=bucket.description,
                 action='manual',
                 parent_title=collection_name,
                 item=bucket,
@@ -299,42 +784,211 @@ class Zee5Plugin(object):
         xbmcplugin.addSortMethod(self.handle, xbmcplugin.SORT_METHOD_NONE)
 
         # Finish creating a virtual folder.
-        xbmcplugin.endOfDirectory(self.handle)
+        self.end_directory()
 
     def list_collections(self):
         # Set plugin category. It is displayed in some skins as the name
         # of the current section.
         xbmcplugin.setPluginCategory(self.handle, 'Collections')
 
-        data = self.make_request('https://b2bapi.zee5.com/front/countrylist.php?lang=en&ccode=US')
-        for name, collection_id in data[0]['collections'][self.platform].iteritems():
-            # "web_app": {
-            #     "home": "0-8-homepage",
-            #     "tvshows": "0-8-tvshows",
-            #     "videos": "0-8-videos",
-            #     "movies": "0-8-movies",
-            #     "originals": "0-8-zeeoriginals",
-            #     "premium": "0-8-premiumcontents",
-            #     "news": "0-8-626"
-            # },
+        data = self.make_request(COUNTRYLIST_URL)
+        # "web_app": {
+        #     "home": "0-8-homepage",
+        #     "tvshows": "0-8-tvshows",
+        #     "videos": "0-8-videos",
+        #     "movies": "0-8-movies",
+        #     "originals": "0-8-zeeoriginals",
+        #     "premium": "0-8-premiumcontents",
+        #     "news": "0-8-626"
+        # },
+        collections = data[0]['collections'][self.platform].items()
+
+        # Cached pages are read right away, the others fetched concurrently.
+        workers = WorkerPool(ROOT_WORKERS)
+        pages = {}
+        tasks = []
+        for _, collection_id in collections:
+            data = self._get_cached_page('collection', collection_id, 1)
+            if data is not None:
+                pages[collection_id] = data
+            else:
+                tasks.append((collection_id, workers.submit(self.get_page, 'collection', collection_id, 1)))
+        wait_all([task for _, task in tasks], time.time() + ROOT_DEADLINE)
+        pages.update((collection_id, task.result()) for collection_id, task in tasks if task.done and not task.failed)
+
+        for name, collection_id in collections:
+            preview = None
+            if collection_id in pages:
+                preview = self.get_collection_preview(collection_id, name.title(), pages[collection_id])
             self.add_directory_item(
                 title=name.title(),
                 content_id=collection_id,
-                description=name.title(),
+                description=preview.description if preview else name.title(),
                 action='collection',
+                item=preview,
             )
 
+        self.add_directory_item(title='| Live TV', content_id='live', description='Live TV', action='live')
         self.add_search_item()
 
         # Add a sort method for the virtual folder items (alphabetically, ignore articles)
         xbmcplugin.addSortMethod(self.handle, xbmcplugin.SORT_METHOD_LABEL)
 
         # Finish creating a virtual folder.
-        xbmcplugin.endOfDirectory(self.handle)
+        self.end_directory()
+
+        # The late collections still land in the cache, for when they are opened.
+        if tasks:
+            self.deferred.append(lambda: self._finish_tasks([task for _, task in tasks], workers))
+
+    def list_live(self):
+        xbmcplugin.setPluginCategory(self.handle, 'Live TV')
+
+        channels = [Item.parse(channel) for channel in self.get_channels()]
+        now = time.time()
+        guide = self.get_guide([channel.id for channel in channels], now)
+        for channel in channels:
+            self.add_channel_item(channel, *guide.now_next(channel.id, now))
+
+        xbmcplugin.addSortMethod(self.handle, xbmcplugin.SORT_METHOD_NONE)
+        self.end_directory()
+
+    def get_channels(self):
+        """
+        Returns the live channels, as gwapi JSON objects.
+        """
+        data = self.make_request(CHANNELS_URL.format(lang=self.languages))
+        return [channel for genre in data.get('items') or [] for channel in genre.get('items') or []]
+
+    def get_guide(self, channel_ids, now):
+        """
+        Returns the `epg.Guide` of the channels covering now and the next
+        EPG_LOOKAHEAD seconds, fetching only the windows not in the cache.
+        """
+        from . import epg
+
+        windows = {}
+        missing = []
+        for start in epg.get_windows(now, EPG_LOOKAHEAD):
+            with self.timings.phase('cache'):
+                entry = self.cache.get(self._get_epg_key(start), max_stale=EPG_MAX_STALE)
+            if not entry:
+                missing.append(start)
+                continue
+
+            if entry.is_stale:
+                self.deferred.append(lambda start=start: self._fetch_epg_windows([start], channel_ids))
+            windows[start] = dict(
+                (channel_id, epg.Schedule.from_json(value)) for channel_id, value in entry.value.iteritems()
+            )
+
+        if missing:
+            windows.update(self._fetch_epg_windows(missing, channel_ids))
+        return epg.Guide(windows[start] for start in sorted(windows))
+
+    def _fetch_epg_windows(self, starts, channel_ids):
+        """
+        Fetches the guide of the channels for the windows starting at the
+        given times, and caches the ones that arrived complete. Returns
+        {window start: {channel id: Schedule}}.
+        """
+        from . import epg
+
+        today = epg.get_window(time.time())
+        workers = WorkerPool(EPG_WORKERS)
+        tasks = []
+        for start in starts:
+            for index in range(0, len(channel_ids), EPG_BATCH):
+                batch = channel_ids[index:index + EPG_BATCH]
+                url = EPG_URL.format(
+                    channels=','.join(batch), start=(start - today) // epg.DAY, limit=len(batch)
+                )
+                tasks.append((start, workers.submit(self._fetch, url)))
+
+        windows = dict((start, {}) for start in starts)
+        failed = set()
+        for start, task in tasks:
+            try:
+                windows[start].update(epg.parse_window(task.result()))
+            except ApiError as e:
+                logger.warn('Failed to load the guide -- %s', e)
+                failed.add(start)
+        workers.shutdown()
+
+        for start, window in windows.iteritems():
+            if start not in failed:
+                self.cache.set(self._get_epg_key(start), dict(
+                    (channel_id, schedule.to_json()) for channel_id, schedule in window.iteritems()
+                ), EPG_TTL)
+        return windows
+
+    def _get_epg_key(self, start):
+        return EPG_KEY.format(
+            time.strftime('%Y-%m-%d', time.gmtime(start)), ','.join(sorted(self.languages.split(',')))
+        )
+
+    @staticmethod
+    def get_collection_preview(collection_id, title, data):
+        """
+        Returns an item standing for the collection in the root folder, with
+        the artwork of its first rail and the number of rails.
+        """
+        buckets = [bucket for bucket in data.get('buckets') or [] if bucket.get('items')]
+        if not buckets:
+            return None
+
+        first = Item.parse(buckets[0])
+        if not (first.list_image or first.cover_image):
+            first = Item.parse(buckets[0]['items'][0])
+
+        description = u'{} rails: {}'.format(
+            data.get('total') or len(buckets),
+            u', '.join(bucket['title'] for bucket in buckets[:ROOT_PREVIEW_TITLES]),
+        )
+        return Item(
+            collection_id,
+            title,
+            description=description,
+            genre=first.genre,
+            list_image=first.list_image,
+            cover_image=first.cover_image,
+        )
+
+    def _finish_tasks(self, tasks, workers):
+        """
+        Lets the tasks complete within PREFETCH_TIMEOUT, unless the user moves
+        on to another folder.
+        """
+        if not self._wait_background(tasks, workers):
+            logger.debug('Cancelled %s requests', len([task for task in tasks if not task.done]))
+
+        for task in tasks:
+            if task.done and task.failed:
+                try:
+                    task.result()
+                except Exception as e:
+                    logger.warn('Request failed -- %s', e)
+
+    def _wait_background(self, tasks, workers):
+        """
+        Waits up to PREFETCH_TIMEOUT for the tasks, returning False when it
+        gave up on them because the time ran out or the user moved on.
+        """
+        deadline = time.time() + PREFETCH_TIMEOUT
+        while not all(task.done for task in tasks):
+            if time.time() >= deadline or not kodiutils.is_foreground(self.invocation_id):
+                # A request in flight cannot be interrupted; leave it to the
+                # daemon threads, which make no further ones.
+                self.cancelled.set()
+                workers.shutdown(timeout=0)
+                return False
+            wait_all(tasks, min(time.time() + PREFETCH_POLL_INTERVAL, deadline))
+        workers.shutdown()
+        return True
 
     @staticmethod
-    def get_user_input():
-        kb = xbmc.Keyboard('', 'Search for Movies/TV Shows/Trailers/Videos in all languages')
+    def get_user_input(default=''):
+        kb = xbmc.Keyboard(default, 'Search for Movies/TV Shows/Trailers/Videos in all languages')
         kb.doModal()  # Onscreen keyboard appears
         if not kb.isConfirmed():
             return
@@ -342,106 +996,342 @@ class Zee5Plugin(object):
         # User input
         return kb.getText()
 
-    def list_search(self):
-        query = Zee5Plugin.get_user_input()
+    def list_search(self, query=None, new=False):
+        """
+        Lists the results of the query. Without a query, lists the previous
+        queries, or asks for one when there are none or a new search is wanted.
+        """
+        history = self.get_search_history()
         if not query:
-            return []
+            if history and not new:
+                self.list_search_history(history)
+                return
+
+            query = Zee5Plugin.get_user_input(history[0] if history else '')
+            if not query:
+                return []
+
+        self.add_to_search_history(history, query)
 
         # Set plugin category. It is displayed in some skins as the name
         # of the current section.
         xbmcplugin.setPluginCategory(self.handle, 'Search/{}'.format(query))
 
-        url = 'https://gwapi.zee5.com/content/getContent/autoSuggest?country=US&q={}&limit={}&translation=en&languages=hi,ta,en&country=CA&version=1'.format(
-            quote(query),
-            Zee5Plugin.ITEMS_LIMIT
-        )
-        data = self.make_request(url)
-        if not data.get('numFound'):
+        results = self.search(query)
+        if not results:
             kodiutils.notification('No Search Results', 'No item found for {}'.format(query))
+            xbmcplugin.endOfDirectory(self.handle, succeeded=False)
             return
 
-        for item in data['docs']:
-            self.add_video_item(item)
+        for action, item in results:
+            if action == 'play':
+                self.add_video_item(item)
+            else:
+                self.add_directory_item(
+                    content_id=item.id,
+                    title=item.title,
+                    description=item.description,
+                    action=action,
+                    item=item,
+                )
 
         # Add a sort method for the virtual folder items (alphabetically, ignore articles)
         xbmcplugin.addSortMethod(self.handle, xbmcplugin.SORT_METHOD_NONE)
-        xbmcplugin.endOfDirectory(self.handle)
+        self.end_directory()
 
-    def make_request(self, url):
-        logger.info("Making request: {}".format(url))
-        response = self.session.get(url, headers=self._get_headers(), cookies=self.session.cookies)
-        assert response.status_code == 200
-        return response.json()
+    def list_search_history(self, history):
+        xbmcplugin.setPluginCategory(self.handle, 'Search')
 
-    @staticmethod
-    def get_genre(item):
+        items = [('| New Search', self.get_url(action='search', new=1))]
+        items.extend((query, self.get_url(action='search', query=query.encode('utf-8'))) for query in history)
+        for title, url in items:
+            list_item = xbmcgui.ListItem(label=title)
+            list_item.setInfo('video', {'title': title, 'mediatype': 'video'})
+            self.directory_items.append((url, list_item, True))
+
+        xbmcplugin.addSortMethod(self.handle, xbmcplugin.SORT_METHOD_NONE)
+        self.end_directory()
+
+    def get_search_history(self):
         """
-        Returns a string of genre -- comma separated if multiple genres.
-        Returns ALL as default.
+        Returns the previous queries, the most recent first.
         """
-        if not item:
-            return 'ALL'
+        entry = self.cache.get(SEARCH_HISTORY_KEY)
+        return entry.value if entry else []
 
-        genres = set()
-        for genreField in ['genre', 'genres']:
-            data = item.get(genreField)
-            if not data:
-                continue
-            genres.update(itertools.imap(operator.itemgetter('value'), data))
+    def add_to_search_history(self, history, query):
+        """
+        Moves the query to the front of the history, dropping the least recently
+        used queries, and their results, beyond SEARCH_HISTORY_SIZE.
+        """
+        key = get_search_query_key(query)
+        history = [query] + [previous for previous in history if get_search_query_key(previous) != key]
+        for dropped in history[SEARCH_HISTORY_SIZE:]:
+            self.cache.delete(self._get_search_cache_key(dropped))
+        self.cache.set(SEARCH_HISTORY_KEY, history[:SEARCH_HISTORY_SIZE], SEARCH_HISTORY_TTL)
 
-        return ",".join(list(genres)) if genres else 'ALL'
+    def _get_search_cache_key(self, query):
+        return SEARCH_RESULTS_KEY.format(get_search_query_key(query), ','.join(sorted(self.languages.split(','))))
 
-    @staticmethod
-    def get_images(item):
+    def search(self, query):
+        """
+        Returns the (action, item) pairs found for the query: cached results when
+        there are any, otherwise the catalog hits merged with the remote ones.
+        Only the catalog hits are returned when the remote search fails or
+        takes longer than SEARCH_REMOTE_TIMEOUT.
+        """
+        key = self._get_search_cache_key(query)
+        entry = self.cache.get(key, max_stale=CACHE_MAX_STALE)
+        if entry:
+            if entry.is_stale:
+                self.deferred.append(lambda: self._refresh_search(key, query))
+            return [(action, Item.from_json(item)) for action, item in entry.value]
+
+        url = SEARCH_URL.format(query=quote(query), limit=self.items_limit, lang=self.languages)
+        workers = WorkerPool(1)
+        remote = workers.submit(self.make_request, url)
+
+        # Local hits show right away, remote ones only if they come in time.
+        results = self.catalog.search(query, self.items_limit)
+        if not results or remote.wait(SEARCH_REMOTE_WAIT):
+            try:
+                data = remote.result(SEARCH_REMOTE_TIMEOUT)
+            except (ApiError, TaskTimeout) as e:
+                logger.warn('Remote search failed for %s -- %s', query, e)
+                workers.shutdown(timeout=0)
+                return results
+
+            results = merge_search_results(results, data, self.keywords)
+            workers.shutdown()
+            self._store_search_results(key, results)
+        else:
+            self.deferred.append(lambda: self._complete_search(key, results, remote, workers))
+
+        return results
+
+    def _complete_search(self, key, results, task, workers):
         """
-        Returns a tuple of list_image & cover_image.
+        Stores the results with the remote ones that came in too late to be
+        shown, and adds those to the catalog.
         """
-        images = item.get('image_url')
-        if not images:
-            return None, None
+        try:
+            data = task.result(SEARCH_REMOTE_TIMEOUT)
+        finally:
+            workers.shutdown(timeout=0)
+
+        keywords = {}
+        results = merge_search_results(results, data, keywords)
+        self._store_search_results(key, results)
+        self.catalog.index(results, keywords)
+
+    def _refresh_search(self, key, query):
+        url = SEARCH_URL.format(query=quote(query), limit=self.items_limit, lang=self.languages)
+        data = self.make_request(url)
+        self._store_search_results(key, merge_search_results(self.catalog.search(query, self.items_limit), data))
+
+    def _store_search_results(self, key, results):
+        self.cache.set(key, [(action, item.to_json()) for action, item in results], SEARCH_TTL)
+
+    def make_request(self, url):
+        ttl = get_cache_ttl(url)
+        if not ttl:
+            return self._fetch(url)
 
-        if type(images) is dict:
-            return images.get('list'), images.get('cover')
+        entry = self.get_cached_response(url)
+        if entry:
+            return entry.value
+
+        return self._revalidate(url)
+
+    def get_cached_response(self, url):
+        """
+        Returns the cache entry of the response to the URL, or None.
+        """
+        with self.timings.phase('cache'):
+            entry = self.cache.get(self._get_cache_key(url), max_stale=CACHE_MAX_STALE)
+        if entry and entry.is_stale:
+            # Serve the stale copy right away, refresh it after rendering.
+            self.deferred.append(lambda: self._revalidate(url))
+        return entry
+
+    def _fetch(self, url, retry_auth=True, timeout=None, authenticated=True):
+        if self.cancelled.is_set():
+            raise ApiError('Request cancelled', url)
+        logger.info("Making request: %s", url)
+        headers = self._get_headers(authenticated)
+        try:
+            with self.timings.request(url) as record:
+                response = self.transport.get(url, headers=headers, timeout=timeout)
+                if record is not None:
+                    # elapsed runs until the headers are parsed, connection setup included.
+                    record['ttfb'] = max(response.elapsed.total_seconds() - record['dns'] - record['connect'], 0)
+                    record['status'] = response.status_code
+                    record['bytes'] = len(response.content)
+        except ApiError as e:
+            if e.status not in (401, 403) or not retry_auth:
+                raise
+            # The platform token got revoked or expired early, get a new one and retry once.
+            logger.warn('Request rejected with %s, refreshing the token -- %s', e.status, url)
+            self.cache.delete(PLATFORM_TOKEN_KEY)
+            self._token = None
+            return self._fetch(url, retry_auth=False, timeout=timeout)
+
+        with self.timings.phase('json'):
+            return response.json()
+
+    def _get_cache_key(self, url):
+        # Language shards have their language in the URL already.
+        if 'languages=' in url:
+            return normalize_url(url)
+        return u'{}|{}'.format(normalize_url(url), ','.join(sorted(self.languages.split(','))))
+
+    def _prefetch(self, action, content_id, page_number):
+        """
+        Warms the cache with the given listing page, giving up when it takes
+        longer than PREFETCH_TIMEOUT or the user moves on to another folder.
+        The artwork of the page is queued for download.
+        """
+        url = self.get_listing_url(action, content_id, page_number)
+        entry = self.cache.get(self._get_cache_key(url))
+        if entry:
+            data = entry.value
         else:
-            return images, images
+            workers = WorkerPool(1)
+            if self.is_sharded(action):
+                task = workers.submit(self._merge_page, action, content_id, int(page_number))
+            else:
+                task = workers.submit(self._revalidate, url, timeout=PREFETCH_TIMEOUT)
+            if not self._wait_background([task], workers):
+                logger.debug('Prefetch cancelled -- %s', url)
+                return
+            if task.failed:
+                logger.debug('Prefetch failed -- %s', url)
+                return
+            data = task.result()
+
+        for value in self.get_listing_items(action, data):
+            self.artwork.prefetch(*get_images(value))
+
+    def _revalidate(self, url, timeout=None):
+        """
+        Fetches the response to the URL into the cache, and returns it.
+        """
+        data = self._fetch(url, timeout=timeout)
+        self.cache.set(self._get_cache_key(url), data, get_cache_ttl(url))
+        return data
+
+    def _refresh_page(self, action, content_id, page_number):
+        """
+        Fetches the listing page into the cache again; merged pages are made
+        of the first pages of their shards fetched again.
+        """
+        if self.is_sharded(action):
+            return self._merge_page(action, content_id, page_number, refresh=True)
+        return self._revalidate(self.get_listing_url(action, content_id, page_number))
+
+    def _index_catalog(self):
+        entries, self.catalog_entries = self.catalog_entries, []
+        keywords, self.keywords = self.keywords, {}
+        with self.timings.phase('catalog'):
+            self.catalog.index(entries, keywords)
 
+    def _store_route_states(self):
+        states, self.route_states = self.route_states, {}
+        self.cache.set_many(states, ROUTE_TTL)
+
+    def get_breadcrumb(self, action, content_id):
+        """
+        Returns the breadcrumb stored for the folder when it was listed, or None.
+        """
+        entry = self.cache.get(ROUTE_KEY.format(action, content_id))
+        return entry.value if entry else None
+
+    def warm(self, horizon):
+        """
+        Refreshes the platform token, the country list and the first page of
+        every collection of the root folder, unless they stay fresh for the
+        next `horizon` seconds. Returns the number of refreshed entries.
+        """
+        deadline = time.time() + horizon
+        refreshed = 0
+
+        entry = self.cache.get(PLATFORM_TOKEN_KEY)
+        if not entry or entry.expires_at < deadline:
+            self._token = self._store_token(PLATFORM_TOKEN_KEY, PLATFORM_TOKEN_TTL, self._fetch_token)
+            refreshed += 1
+
+        entry = self.cache.get(self._get_cache_key(COUNTRYLIST_URL))
+        if not entry or entry.expires_at < deadline:
+            data = self._revalidate(COUNTRYLIST_URL)
+            refreshed += 1
+        else:
+            data = entry.value
+
+        # The merged first pages, their shards fetched again all at once.
+        workers = WorkerPool(ROOT_WORKERS)
+        tasks = []
+        for collection_id in data[0]['collections'][self.platform].itervalues():
+            url = self.get_listing_url('collection', collection_id, 1)
+            entry = self.cache.get(self._get_cache_key(url))
+            if not entry or entry.expires_at < deadline:
+                tasks.append(workers.submit(self._refresh_page, 'collection', collection_id, 1))
+        try:
+            for task in tasks:
+                task.result()
+                refreshed += 1
+        finally:
+            workers.shutdown()
+        return refreshed
+
+    def finish(self):
+        """
+        Runs the deferred tasks and releases the resources of this invocation.
+        """
+        with self.timings.phase('deferred'):
+            while self.deferred:
+                try:
+                    self.deferred.pop(0)()
+                except Exception as e:
+                    logger.warn('Deferred task failed -- %s', e)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Response cache: %s', self.cache.stats())
+        self.cache.close()
+        if self._catalog is not None:
+            self._catalog.close()
+
+        if self.timings.enabled:
+            # Logged regardless of the debug setting, timings are opt-in already.
+            xbmc.log('{}: timings {}'.format(ADD_ON.getAddonInfo('id'), self.timings.summary()), xbmc.LOGNOTICE)
+            append_record(kodiutils.TIMINGS_FILE, self.timings.to_dict())
+
+    @timed('items')
     def add_video_item(self, video):
         # Create a list item with a text label and a thumbnail image.
-        episode_no = video.get('episode_number')
-        title = video['title']
+        title = video.title
         list_item = xbmcgui.ListItem(label=title)
 
         # Set additional info for the list item.
-        episode_date = video.get('release_date')
-        if episode_date:
-            try:
-                episode_date = datetime(
-                    *(time.strptime(episode_date.split('T')[0], "%Y-%m-%d")[0:6])
-                )
-            except Exception as e:
-                logger.warn('Failed to parse the episode date - {} -- {}'.format(episode_date, str(e)))
-                episode_date = None
-                pass
+        year = date = None
+        if video.release_date:
+            year, date = parse_date(video.release_date)
+            if not year:
+                logger.warn('Failed to parse the episode date - %s', video.release_date)
 
         list_item.setInfo('video', {
             'title': title,
-            'genre': Zee5Plugin.get_genre(video),
-            'episode': episode_no,
-            'plot': video.get('description'),
-            'duration': video.get('duration'),
-            'year': episode_date.year if episode_date else None,
-            'date': episode_date.strftime('%d.%m.%Y') if episode_date else None,
+            'genre': video.genre,
+            'episode': video.episode,
+            'plot': video.description,
+            'duration': video.duration,
+            'year': year,
+            'date': date,
             'mediatype': 'video',
         })
 
         # Set graphics (thumbnail, fanart, banner, poster, landscape etc.) for the list item.
         # Here we use the same image for all items for simplicity's sake.
-        list_image, cover_image = Zee5Plugin.get_images(video)
-        list_item.setArt({
-            'thumb': list_image or cover_image,
-            'icon': list_image or cover_image,
-            'fanart': cover_image or list_image,
-        })
+        self.artwork.set_art(list_item, video.list_image, video.cover_image)
 
         # Set 'IsPlayable' property to 'true'.
         # This is mandatory for playable items!
@@ -450,16 +1340,18 @@ class Zee5Plugin(object):
         # Create a URL for a plugin recursive call.
         # Example: plugin://plugin.video.example/?action=play&video=http:
         # //www.vidsplay.com/wp-content/uploads/2017/04/crab.mp4
-        url = self.get_url(action='play', content_id=video['id'])
+        url = self.get_url(action='play', content_id=video.id)
 
         # Add the list item to a virtual Kodi folder.
         # is_folder = False means that this item won't open any sub-list.
         is_folder = False
 
         # Add our item to the Kodi virtual folder listing.
-        xbmcplugin.addDirectoryItem(self.handle, url, list_item, is_folder)
-        xbmcplugin.setContent(self.handle, 'video')
+        self.directory_items.append((url, list_item, is_folder))
+        self.content = 'video'
+        self.catalog_entries.append(('play', video))
 
+    @timed('items')
     def add_directory_item(
         self,
         title,
@@ -475,13 +1367,8 @@ class Zee5Plugin(object):
         # Set graphics (thumbnail, fanart, banner, poster, landscape etc.) for the list item.
         # Here we use the same image for all items for simplicity's sake.
         # In a real-life plugin you need to set each image accordingly.
-        if item and item.get('image_url'):
-            list_image, cover_image = Zee5Plugin.get_images(item)
-            list_item.setArt({
-                'thumb': list_image or cover_image,
-                'icon': list_image or cover_image,
-                'fanart': cover_image or list_image
-            })
+        if item and (item.list_image or item.cover_image):
+            self.artwork.set_art(list_item, item.list_image, item.cover_image)
 
         # Set additional info for the list item.
         # Here we use a category name for both properties for for simplicity's sake.
@@ -492,24 +1379,52 @@ class Zee5Plugin(object):
         list_item.setInfo('video', {
             'count': content_id,
             'title': title,
-            'genre': self.get_genre(item),
+            'genre': item.genre if item else 'ALL',
             'plot': description,
             'mediatype': 'video'
         })
 
         # Create a URL for a plugin recursive call.
         # Example: plugin://plugin.video.example/?action=listing&category=Animals
-        url = self.get_url(
-            action=action,
-            content_id=content_id,
-            title=u'{}/{}'.format(parent_title, title) if parent_title else title,
-        )
+        url = self.get_url(action=action, content_id=content_id)
+        if action in LISTING_URLS:
+            self.route_states[ROUTE_KEY.format(action, content_id)] = (
+                u'{}/{}'.format(parent_title, title) if parent_title else title
+            )
 
         # is_folder = True means that this item opens a sub-list of lower level items.
         is_folder = True
 
         # Add our item to the Kodi virtual folder listing.
-        xbmcplugin.addDirectoryItem(self.handle, url, list_item, is_folder)
+        self.directory_items.append((url, list_item, is_folder))
+        if item:
+            self.catalog_entries.append((action, item))
+
+    @timed('end_of_directory')
+    def end_directory(self):
+        """
+        Adds the collected items to the virtual folder and finishes it.
+        """
+        if self.directory_items:
+            xbmcplugin.addDirectoryItems(self.handle, self.directory_items, len(self.directory_items))
+            self.directory_items = []
+        if self.content:
+            xbmcplugin.setContent(self.handle, self.content)
+
+        xbmcplugin.endOfDirectory(self.handle)
+
+        # Ahead of the tasks queued while listing (prefetches may take a
+        # while), the breadcrumbs are needed as soon as a folder is opened.
+        if self.route_states:
+            self.deferred.insert(0, self._store_route_states)
+        if self.catalog_entries:
+            self.deferred.append(self._index_catalog)
+        self.deferred.append(self._finish_artwork)
+
+    def _finish_artwork(self):
+        # After the prefetches, which queue the artwork of their pages.
+        if self._artwork is not None:
+            self._artwork.finish(lambda: kodiutils.is_foreground(self.invocation_id))
 
     def add_next_page_and_search_item(self, item, original_title, action):
         if item.get('page', 0) * item.get('limit', 0) < item.get('total', 0):
@@ -521,22 +1436,49 @@ class Zee5Plugin(object):
 
             # Create a URL for a plugin recursive call.
             # Example: plugin://plugin.video.example/?action=listing&category=Animals
-            url = self.get_url(
-                action=action,
-                content_id=item['id'],
-                page_number=item['page'] + 1,
-                title=original_title
-            )
+            url = self.get_url(action=action, content_id=item['id'], page_number=item['page'] + 1)
 
             # is_folder = True means that this item opens a sub-list of lower level items.
             is_folder = True
 
             # Add our item to the Kodi virtual folder listing.
-            xbmcplugin.addDirectoryItem(self.handle, url, list_item, is_folder)
+            self.directory_items.append((url, list_item, is_folder))
+
+            if action in PREFETCHED_ACTIONS:
+                self.deferred.append(lambda: self._prefetch(action, item['id'], item['page'] + 1))
 
         # Add Search item.
         self.add_search_item()
 
+    @timed('items')
+    def add_channel_item(self, channel, current, upcoming):
+        """
+        Adds a playable live channel, labelled with what is on now and next.
+        """
+        def format_time(timestamp):
+            return time.strftime('%H:%M', time.localtime(timestamp))
+
+        label = channel.title
+        plot = []
+        if current:
+            label = u'{} - {}'.format(channel.title, current[2])
+            plot.append(u'Now: {} {}-{}'.format(current[2], format_time(current[0]), format_time(current[1])))
+        if upcoming:
+            plot.append(u'Next: {} {}'.format(upcoming[2], format_time(upcoming[0])))
+
+        list_item = xbmcgui.ListItem(label=label)
+        list_item.setInfo('video', {
+            'title': label,
+            'genre': channel.genre,
+            'plot': u'\n'.join(plot) or channel.description,
+            'mediatype': 'video',
+        })
+        self.artwork.set_art(list_item, channel.list_image, channel.cover_image)
+        list_item.setProperty('IsPlayable', 'true')
+
+        self.directory_items.append((self.get_url(action='play_live', content_id=channel.id), list_item, False))
+        self.content = 'video'
+
     def add_search_item(self):
         self.add_directory_item(
             title='| Search', content_id=1, description='Search', action='search'
@@ -563,27 +1505,32 @@ class Zee5Plugin(object):
         :return: plugin call URL
         :rtype: str
         """
-        valid_kwargs = {
-            key: Zee5Plugin.safe_string(value)
+        valid_kwargs = sorted(
+            (key, Zee5Plugin.safe_string(value))
             for key, value in kwargs.iteritems()
             if value is not None
-        }
-        valid_kwargs['token'] = self.token
+        )
         return '{0}?{1}'.format(self.plugin_url, urlencode(valid_kwargs))
 
     def play_video(self, item_id):
         """
         Play a video by the provided path.
         """
-        def get_subtitles(item):
-            _subtitles = item['video_details'].get('subtitles')
-            if not _subtitles:
-                return []
-
-            url = item['video_details'].get('url')
-            subtitles_files = []
-            for subtitle_lang in _subtitles:
-                if not subtitle_lang:
+        from .vtt import VttToSrtConverter
+
+        def download_subtitles(details, workers):
+            """
+            Returns the subtitle files already in the store, and starts downloading
+            the missing ones, returning their download tasks.
+            """
+            url = details['manifest_url']
+            stored = []
+            tasks = []
+            for subtitle_lang in details['subtitles'] if url else []:
+                suffix = '.{}.srt'.format(subtitle_lang)
+                subtitle_file = self.subtitles.get(item_id, suffix)
+                if subtitle_file:
+                    stored.append(subtitle_file)
                     continue
 
                 # https://zee5vod.akamaized.net/drm/PRIORITY1080/TELUGU_MOVIES/
@@ -593,45 +1540,48 @@ class Zee5Plugin(object):
                         '/manifest.mpd', '/manifest-{}.vtt'.format(subtitle_lang)
                     )
                 )
-                subtitle_file = kodiutils.download_url_content_to_temp(subtitle_url, '{}-{}.srt'.format(
-                    Zee5Plugin.safe_string(item['title']),
-                    subtitle_lang,
+                tasks.append(workers.submit(
+                    kodiutils.download_url_content,
+                    subtitle_url,
+                    self.subtitles.path(item_id, suffix),
+                    session=self.transport,
+                    timeout=SUBTITLE_TIMEOUT,
+                    converter=VttToSrtConverter,
                 ))
-                subtitles_files.append(subtitle_file)
 
-            return subtitles_files
+            return stored, tasks
 
-        def get_video_url(item):
-            hls_url = item['video_details']['hls_url']
-            if not hls_url:
-                kodiutils.notification(
-                    "Video URL missing!", "Missing video URL for {}".format(data.get('title')),
-                )
-                return
+        # A title played or resumed a while ago resolves from this one lookup.
+        with self.timings.phase('cache'):
+            stream = self.cache.get(STREAM_KEY.format(item_id))
+        details = stream.value if stream else self.get_details(item_id)
 
-            token = self._get_video_token()
-            # PRIORITY1080/PROMOS/December/13122018/WhatsupVel_Trailer_WN_PF_13122018NEW.mp4/
-            # index.m3u8?token
-            return 'https://zee5vodnd.akamaized.net/{url}{token}|{user_agent}'.format(
-                url=hls_url.replace('/drm', '/hls'),
-                token=token,
-                user_agent=urlencode({'User-Agent': USER_AGENT})
-            )
+        # Subtitles download while the video token is fetched, playback doesn't wait for them.
+        self.subtitles.ensure_directory()
+        workers = WorkerPool(SUBTITLE_WORKERS)
+        subtitles, subtitle_tasks = download_subtitles(details, workers)
+        attached = []
+        if subtitle_tasks:
+            self.deferred.append(lambda: self._add_late_subtitles(
+                [task for task in subtitle_tasks if task not in attached], workers
+            ))
 
-        data = self.make_request('https://gwapi.zee5.com/content/details/{}?translation=en'.format(item_id))
-        video_url = get_video_url(data)
+        video_url = details['url'] if stream else self._resolve_stream(item_id, details)
         if not video_url:
+            kodiutils.notification(
+                "Video URL missing!", "Missing video URL for {}".format(details['title']),
+            )
             return
 
-        subtitles = get_subtitles(data)
+        attached.extend(task for task in subtitle_tasks if task.done and not task.failed)
+        subtitles.extend(task.result() for task in attached)
 
-        logger.debug('Playing video: {}, subtitles: {}'.format(video_url, subtitles))
+        logger.debug('Playing video: %s, subtitles: %s', video_url, subtitles)
         # Create a playable item with a path to play.
-        cover_image, _ = self.get_images(data)
         play_item = xbmcgui.ListItem(
             path=video_url,
-            iconImage=cover_image,
-            thumbnailImage=cover_image,
+            iconImage=details['list_image'],
+            thumbnailImage=details['list_image'],
         )
         if subtitles:
             play_item.setSubtitles(subtitles)
@@ -639,16 +1589,112 @@ class Zee5Plugin(object):
         # Pass the item to the Kodi player.
         xbmcplugin.setResolvedUrl(self.handle, True, listitem=play_item)
 
+    def play_live(self, channel_id):
+        """
+        Plays the live stream of the channel.
+        """
+        channel = next((channel for channel in self.get_channels() if channel['id'] == channel_id), None)
+        if not channel or not channel.get('stream_url_hls'):
+            kodiutils.notification("Video URL missing!", "Missing stream URL for {}".format(channel_id))
+            return
+
+        video_url = '{url}{token}|{user_agent}'.format(
+            url=channel['stream_url_hls'],
+            token=self._get_video_token(),
+            user_agent=urlencode({'User-Agent': USER_AGENT})
+        )
+        logger.debug('Playing channel: %s', video_url)
+        play_item = xbmcgui.ListItem(path=video_url)
+        xbmcplugin.setResolvedUrl(self.handle, True, listitem=play_item)
+
+    def get_details(self, item_id):
+        """
+        Returns the playback details (`models.parse_details`) of the video.
+        """
+        key = DETAILS_KEY.format(item_id)
+        with self.timings.phase('cache'):
+            entry = self.cache.get(key)
+        if entry:
+            return entry.value
+
+        details = parse_details(self._fetch(DETAILS_URL.format(item_id)))
+        self.cache.set(key, details, DETAILS_TTL)
+        return details
+
+    def _resolve_stream(self, item_id, details):
+        """
+        Returns the playable URL of the video, and keeps it with the details
+        for as long as its video token is valid.
+        """
+        if not details['hls_url']:
+            return None
+
+        token = self._get_video_token()
+        # PRIORITY1080/PROMOS/December/13122018/WhatsupVel_Trailer_WN_PF_13122018NEW.mp4/
+        # index.m3u8?token
+        url = 'https://zee5vodnd.akamaized.net/{url}{token}|{user_agent}'.format(
+            url=details['hls_url'].replace('/drm', '/hls'),
+            token=token,
+            user_agent=urlencode({'User-Agent': USER_AGENT})
+        )
+
+        ttl = tokens.get_expiry(token, VIDEO_TOKEN_TTL) - time.time() - TOKEN_REFRESH_MARGIN
+        if ttl > 0:
+            stream = dict(details, url=url)
+            self.cache.set(STREAM_KEY.format(item_id), stream, ttl)
+        return url
+
+    def _add_late_subtitles(self, tasks, workers):
+        """
+        Hands the subtitle tracks that missed `setResolvedUrl` to the player,
+        skipping the ones that fail or time out.
+        """
+        deadline = time.time() + SUBTITLE_TIMEOUT
+        subtitles = []
+        for task in wait_all(tasks, deadline):
+            if task.failed:
+                try:
+                    task.result()
+                except Exception as e:
+                    logger.warn('Failed to download subtitles -- %s', e)
+            else:
+                subtitles.append(task.result())
+
+        workers.shutdown(timeout=max(deadline - time.time(), 0))
+        if subtitles:
+            kodiutils.add_subtitles_to_player(subtitles)
+
+        # New files were added, keep the store within its budget.
+        self.subtitles.evict()
+        kodiutils.cleanup_temp_dir()
+
+    def report_error(self, error):
+        """
+        Tells the user the folder or video could not be loaded, and Kodi that
+        the call failed.
+        """
+        logger.error('Request failed -- %s', error)
+        kodiutils.notification('Zee5 is not reachable', str(error), icon=xbmcgui.NOTIFICATION_ERROR)
+        if self.params.get('action') in ('play', 'play_live'):
+            xbmcplugin.setResolvedUrl(self.handle, False, xbmcgui.ListItem())
+        else:
+            xbmcplugin.endOfDirectory(self.handle, succeeded=False)
+
+    @timed('route')
     def router(self):
         """
         Main routing function which parses the plugin param string and handles it appropirately.
         """
         # Check the parameters passed to the plugin
-        logger.info('Handling route params -- {}'.format(self.params))
+        logger.info('Handling route params -- %s', self.params)
         if self.params:
             action = self.params.get('action')
             content_id = self.params.get('content_id')
+            # URLs of older versions carry the breadcrumb. It may be missing
+            # when the folder is opened from a favourite after ROUTE_TTL.
             title = self.params.get('title')
+            if title is None and action in LISTING_URLS:
+                title = self.get_breadcrumb(action, content_id) or ''
             page_number = self.params.get('page_number', 1)
 
             if action == 'collection':
@@ -666,8 +1712,14 @@ class Zee5Plugin(object):
             elif action == 'play':
                 self.play_video(content_id)
 
+            elif action == 'live':
+                self.list_live()
+
+            elif action == 'play_live':
+                self.play_live(content_id)
+
             elif action == 'search':
-                self.list_search()
+                self.list_search(self.params.get('query'), new=bool(self.params.get('new')))
 
             else:
                 # If the provided paramstring does not contain a supported action
@@ -681,9 +1733,26 @@ class Zee5Plugin(object):
 
 
 def run():
-    # Initial stuffs.
-    kodiutils.cleanup_temp_dir()
+    kodilogging.config(*LOGGERS)
+
+    profiler = None
+    if settings.is_profiling_enabled():
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
 
     # Call the router function and pass the plugin call parameters to it.
     # We use string slicing to trim the leading '?' from the plugin call paramstring
-    Zee5Plugin(sys.argv).router()
+    plugin = Zee5Plugin(sys.argv)
+    try:
+        plugin.router()
+    except ApiError as e:
+        plugin.report_error(e)
+    finally:
+        plugin.finish()
+
+        if profiler:
+            profiler.disable()
+            kodiutils.save_profile(profiler, plugin.timings.label)
+
+        kodilogging.flush(*LOGGERS)
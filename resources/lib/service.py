@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Optional background service keeping the data of the root folder warm.
+
+Every few minutes (the "service_interval" setting) it refreshes the platform
+token, the country list and the first page of each collection in the shared
+response cache, so opening the add-on needs no network round trip. Nothing
+is fetched while a video plays or the device sits unattended, and failed
+rounds are retried with an exponentially growing delay.
+"""
+import logging
+
+import xbmc
+
+from . import kodilogging
+from . import kodiutils
+from . import settings
+from .plugin import LOGGERS, Zee5Plugin
+from .transport import ApiError
+from .workers import TaskTimeout
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait after Kodi starts, and between checks of the setting
+# while the service is turned off.
+START_DELAY = 60
+DISABLED_DELAY = 5 * 60
+
+# Seconds to wait while a video plays, and after this many seconds without
+# user input the device is considered unattended.
+PLAYBACK_DELAY = 5 * 60
+IDLE_TIME = 2 * 60 * 60
+
+# Upper bound of the delay after failed rounds.
+MAX_BACKOFF = 4 * 60 * 60
+
+
+class Warmer(object):
+
+    def __init__(self):
+        self.plugin_url = 'plugin://{}/'.format(kodiutils.ADD_ON.getAddonInfo('id'))
+        self.player = xbmc.Player()
+        self.failures = 0
+
+    def step(self):
+        """
+        Runs one round if it is due; returns the seconds until the next one.
+        """
+        if not settings.is_service_enabled():
+            return DISABLED_DELAY
+
+        if self.player.isPlaying():
+            return PLAYBACK_DELAY
+
+        interval = settings.get_service_interval()
+        if xbmc.getGlobalIdleTime() > IDLE_TIME:
+            return interval
+
+        # Loaded by the plugin anyway, on its first request.
+        import requests
+
+        kodilogging.config(*LOGGERS)
+        plugin = Zee5Plugin((self.plugin_url, '-1', '?action=warm'), foreground=False)
+        try:
+            # Refresh what would expire before the next round.
+            refreshed = plugin.warm(horizon=interval)
+        except (ApiError, TaskTimeout, requests.RequestException, IOError, ValueError, KeyError) as e:
+            self.failures += 1
+            logger.warn('Warming the cache failed %s times in a row -- %s', self.failures, e)
+            return min(interval * 2 ** (self.failures - 1), MAX_BACKOFF)
+        finally:
+            plugin.finish()
+            kodilogging.flush(*LOGGERS)
+
+        self.failures = 0
+        logger.debug('Refreshed %s cache entries', refreshed)
+        return interval
+
+
+def run():
+    monitor = xbmc.Monitor()
+    warmer = Warmer()
+    delay = START_DELAY
+    while not monitor.waitForAbort(delay):
+        delay = warmer.step()
@@ -1,4 +1,23 @@
-from .kodiutils import get_setting_as_bool
+"""
+Add-on settings, read once into an immutable snapshot.
+
+Every `ADD_ON.getSetting` call is a round trip into Kodi, so the snapshot
+is built by parsing the add-on's settings definition for the defaults and
+the user's settings.xml in the profile for the changed values. It is kept
+until the mtime of that file changes. Should the file be unreadable, the
+values are asked from Kodi instead, still once per setting.
+"""
+import logging
+import os
+
+from .kodiutils import ADD_ON, PROFILE, get_setting
+
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
 
 LANGUAGES = [
     "ta", "kn", "pa", "bn", "en", "ml", "mr", "hr", "gu", "te", "hi"
@@ -6,12 +25,151 @@ LANGUAGES = [
 
 DEFAULT_LANGUAGES = 'en,ta'
 
+DEFAULT_PAGE_SIZE = 25
+DEFAULT_LOAD_ALL_MAX_ITEMS = 500
+DEFAULT_SERVICE_INTERVAL = 30
+
+DEFINITION_FILE = os.path.join(
+    unicode(ADD_ON.getAddonInfo('path'), 'utf-8'), 'resources', 'settings.xml'
+)
+USER_FILE = os.path.join(PROFILE, 'settings.xml')
+
+
+class Settings(object):
+    """
+    Read-only view of the setting values, as unicode strings by id.
+    """
+    __slots__ = ('_values', 'mtime')
+
+    def __init__(self, values, mtime=None):
+        object.__setattr__(self, '_values', dict(values))
+        object.__setattr__(self, 'mtime', mtime)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Settings are read-only')
+
+    def get(self, setting_id):
+        return self._values.get(setting_id, u'').strip()
+
+    def get_bool(self, setting_id):
+        return self.get(setting_id).lower() == 'true'
+
+    def get_int(self, setting_id):
+        try:
+            return int(float(self.get(setting_id)))
+        except ValueError:
+            return 0
+
+
+# The current snapshot, replaced when the user settings file changes.
+_snapshot = [None]
+
+
+def snapshot():
+    """
+    Returns the settings snapshot, loading it again only if the user settings
+    file was modified since.
+    """
+    try:
+        mtime = os.stat(USER_FILE).st_mtime
+    except OSError:
+        mtime = None
+
+    current = _snapshot[0]
+    if current is None or current.mtime != mtime:
+        current = _snapshot[0] = load(mtime)
+    return current
+
+
+def invalidate():
+    _snapshot[0] = None
+
+
+def load(mtime):
+    try:
+        values = read_defaults(DEFINITION_FILE)
+        if mtime is not None:
+            values.update(read_user_values(USER_FILE))
+    except (IOError, SyntaxError) as e:
+        logger.warn('Failed to read the settings files, asking Kodi -- %s', e)
+        values = {setting_id: get_setting(setting_id) for setting_id in read_ids(DEFINITION_FILE)}
+    return Settings(values, mtime)
+
+
+def read_ids(path):
+    try:
+        return [setting.get('id') for setting in ElementTree.parse(path).iter('setting') if setting.get('id')]
+    except (IOError, SyntaxError):
+        return []
+
+
+def read_defaults(path):
+    return {
+        setting.get('id'): _unicode(setting.get('default', ''))
+        for setting in ElementTree.parse(path).iter('setting')
+        if setting.get('id')
+    }
+
+
+def read_user_values(path):
+    """
+    Reads the values of the user settings file, in the Kodi 18 format
+    (`<setting id="..">value</setting>`) or the older one (`value` attribute).
+    """
+    values = {}
+    for setting in ElementTree.parse(path).iter('setting'):
+        setting_id = setting.get('id')
+        if setting_id:
+            value = setting.get('value')
+            values[setting_id] = _unicode(setting.text or '' if value is None else value)
+    return values
+
+
+def _unicode(value):
+    return value if isinstance(value, unicode) else value.decode('utf-8')
+
 
 def get_languages():
+    values = snapshot()
     return ','.join([
-        lang for lang in LANGUAGES if get_setting_as_bool(lang)
+        lang for lang in LANGUAGES if values.get_bool(lang)
     ]) or DEFAULT_LANGUAGES
 
 
 def is_debug():
-    return get_setting_as_bool('debug')
\ No newline at end of file
+    return snapshot().get_bool('debug')
+
+
+def is_log_buffered():
+    return snapshot().get_bool('log_buffered')
+
+
+def is_timing_enabled():
+    return snapshot().get_bool('timings')
+
+
+def is_profiling_enabled():
+    return snapshot().get_bool('profiling')
+
+
+def get_page_size():
+    return snapshot().get_int('page_size') or DEFAULT_PAGE_SIZE
+
+
+def is_load_all():
+    return snapshot().get_bool('load_all')
+
+
+def get_load_all_max_items():
+    return snapshot().get_int('load_all_max_items') or DEFAULT_LOAD_ALL_MAX_ITEMS
+
+
+def is_service_enabled():
+    return snapshot().get_bool('service')
+
+
+def get_service_interval():
+    """
+    Returns the seconds between two rounds of the background service.
+    """
+    return (snapshot().get_int('service_interval') or DEFAULT_SERVICE_INTERVAL) * 60
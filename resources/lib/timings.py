@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in timing of the phases of one plugin invocation.
+
+Phases are named buckets of wall-clock time (token, json, items, ...)
+that may be entered any number of times. HTTP requests are recorded one by
+one, split into DNS lookup, connect, time to first byte (which includes the
+TLS handshake) and body; the DNS and connect parts come from probes wrapped
+around `socket.getaddrinfo` and urllib3's `create_connection`.
+
+A disabled `Timings` hands out a shared no-op context manager, so the
+instrumented code paths cost next to nothing when timing is off.
+"""
+import functools
+import json
+import logging
+import threading
+import time
+
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Invocations kept in the rolling timings file.
+MAX_RECORDS = 100
+
+
+class _NullPhase(object):
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_PHASE = _NullPhase()
+
+
+class Timings(object):
+
+    def __init__(self, enabled, label=''):
+        self.enabled = enabled
+        self.label = label
+        self.started = time.time()
+        self.phases = {}
+        self.requests = []
+
+        self._lock = threading.Lock()
+        self._current = threading.local()
+
+    def phase(self, name):
+        """
+        Returns a context manager adding the time spent in it to the named phase.
+        """
+        if not self.enabled:
+            return NULL_PHASE
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name):
+        started = time.time()
+        try:
+            yield
+        finally:
+            self.add(name, time.time() - started)
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0) + seconds
+
+    def request(self, url):
+        """
+        Returns a context manager recording one HTTP request. It yields the record
+        (a dict) for the caller to fill in `status`, `ttfb` and `bytes`, or None
+        when timing is off.
+        """
+        if not self.enabled:
+            return NULL_PHASE
+        return self._request(url)
+
+    @contextmanager
+    def _request(self, url):
+        record = {'url': url.split('?', 1)[0], 'dns': 0, 'connect': 0, 'ttfb': 0}
+        self._current.record = record
+        started = time.time()
+        try:
+            yield record
+        finally:
+            self._current.record = None
+            record['total'] = time.time() - started
+            record['body'] = max(record['total'] - record['dns'] - record['connect'] - record['ttfb'], 0)
+            with self._lock:
+                self.requests.append(record)
+
+    def _probe(self, field, seconds):
+        record = getattr(self._current, 'record', None)
+        if record is not None:
+            record[field] += seconds
+
+    def install_network_probes(self):
+        """
+        Attributes the time of DNS lookups and socket connects to the request
+        being made on the current thread.
+        """
+        if self.enabled:
+            _install_network_probes()
+            _probe_target[0] = self
+
+    def to_dict(self):
+        return {
+            'label': self.label,
+            'started': self.started,
+            'total': time.time() - self.started,
+            'phases': self.phases,
+            'requests': self.requests,
+        }
+
+    def summary(self):
+        """
+        Returns a one-line summary, times in milliseconds.
+        """
+        def ms(seconds):
+            return int(round(seconds * 1000))
+
+        parts = ['{} total={}'.format(self.label, ms(time.time() - self.started))]
+        parts.extend('{}={}'.format(name, ms(seconds)) for name, seconds in sorted(self.phases.items()))
+        if self.requests:
+            parts.append('http={}x/{} (dns={} connect={} ttfb={} body={})'.format(
+                len(self.requests),
+                ms(sum(record['total'] for record in self.requests)),
+                *[ms(sum(record[field] for record in self.requests)) for field in ('dns', 'connect', 'ttfb', 'body')]
+            ))
+        return ' '.join(parts)
+
+
+# The Timings the network probes report to.
+_probe_target = [None]
+
+
+def _probe(field, seconds):
+    timings = _probe_target[0]
+    if timings is not None:
+        timings._probe(field, seconds)
+
+
+def _current_record():
+    timings = _probe_target[0]
+    return getattr(timings._current, 'record', None) if timings is not None else None
+
+
+def _install_network_probes():
+    """
+    Wraps `socket.getaddrinfo` and urllib3's `create_connection`, once per process.
+    """
+    import socket
+
+    if getattr(socket.getaddrinfo, 'timed', False):
+        return
+
+    getaddrinfo = socket.getaddrinfo
+
+    def timed_getaddrinfo(*args, **kwargs):
+        started = time.time()
+        try:
+            return getaddrinfo(*args, **kwargs)
+        finally:
+            _probe('dns', time.time() - started)
+
+    timed_getaddrinfo.timed = True
+    socket.getaddrinfo = timed_getaddrinfo
+
+    try:
+        from urllib3.util import connection
+    except ImportError:
+        try:
+            from requests.packages.urllib3.util import connection
+        except ImportError:
+            return
+
+    create_connection = connection.create_connection
+
+    def timed_create_connection(*args, **kwargs):
+        record = _current_record()
+        dns = record['dns'] if record else 0
+        started = time.time()
+        try:
+            return create_connection(*args, **kwargs)
+        finally:
+            if record:
+                # The lookup done inside create_connection is already counted as dns.
+                record['connect'] += time.time() - started - (record['dns'] - dns)
+
+    connection.create_connection = timed_create_connection
+
+
+def timed(phase):
+    """
+    Decorator adding the duration of each call to the named phase of the
+    `timings` attribute of the object the method is called on.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.timings.phase(phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def append_record(path, record, max_records=MAX_RECORDS):
+    """
+    Appends the record to the JSON list stored in `path`, keeping the last `max_records`.
+    """
+    records = []
+    try:
+        with open(path) as f:
+            records = json.load(f)
+    except (IOError, ValueError):
+        pass
+
+    records.append(record)
+    try:
+        with open(path, 'w') as f:
+            json.dump(records[-max_records:], f)
+    except IOError as e:
+        logger.warn('Failed to write timings to %s -- %s', path, e)
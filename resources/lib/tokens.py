@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers to work out how long the Zee5 access tokens stay valid.
+"""
+import base64
+import json
+import re
+import time
+
+# Akamai edge tokens look like `?hdnea=st=1550000000~exp=1550003600~acl=/*~hmac=...`
+AKAMAI_EXPIRY = re.compile(r'exp=(\d+)')
+
+
+def _decode_jwt_payload(token):
+    parts = token.split('.')
+    if len(parts) != 3:
+        return None
+
+    payload = parts[1].encode('ascii') if isinstance(parts[1], unicode) else parts[1]
+    try:
+        return json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_expiry(token, default_ttl):
+    """
+    Returns the unix timestamp at which the token expires.
+
+    Understands JWTs (`exp` claim) and Akamai edge tokens (`exp=` field), and
+    falls back to `default_ttl` seconds from now for anything else.
+    """
+    if token:
+        payload = _decode_jwt_payload(token)
+        if isinstance(payload, dict) and isinstance(payload.get('exp'), (int, long, float)):
+            return float(payload['exp'])
+
+        match = AKAMAI_EXPIRY.search(token)
+        if match:
+            return float(match.group(1))
+
+    return time.time() + default_ttl
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP transport of the add-on: a pooled `requests` session with explicit
+timeouts, retries of failed GETs and a circuit breaker per host.
+
+Kodi blocks its UI while a folder loads, so no request may hang: every one
+gets a connect and a read timeout. Connection errors, timeouts and 5xx/429
+answers are retried with exponentially growing, fully jittered delays.
+After BREAKER_THRESHOLD consecutive failed requests to a host, further
+requests to it fail right away for BREAKER_OPEN seconds. The breaker state
+lives in a small JSON file of its own, so it carries over between
+invocations; it is read once per invocation and only written when the state
+of a host changes.
+"""
+import json
+import logging
+import random
+import threading
+import time
+
+from urlparse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Seconds allowed to set up a connection, and to wait for data on it.
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+
+# Connections kept open per host. Worker pools may nest (load all pages, then
+# their language shards), so the requests in flight are capped to match.
+POOL_SIZE = 8
+
+# Retries of a failed request, and the base of the backoff between them.
+RETRIES = 2
+BACKOFF = 0.5
+
+RETRIED_STATUSES = (429, 500, 502, 503, 504)
+
+# Consecutive failures opening the circuit of a host, and for how long.
+BREAKER_THRESHOLD = 3
+BREAKER_OPEN = 30
+# Failures older than this are forgotten.
+BREAKER_WINDOW = 5 * 60
+
+
+class ApiError(Exception):
+    """
+    A request that did not get a successful answer; `status` is None when
+    no answer came at all.
+    """
+
+    def __init__(self, message, url, status=None):
+        Exception.__init__(self, message)
+        self.url = url
+        self.status = status
+
+
+class CircuitOpenError(ApiError):
+    pass
+
+
+class CircuitBreaker(object):
+
+    def __init__(self, path):
+        self.path = path
+
+        self._lock = threading.Lock()
+        # {host: {'failures', 'failed_at'[, 'open_until']}} of the hosts that
+        # failed lately, loaded on first use.
+        self._states = None
+
+    def check(self, host, url):
+        """
+        Raises CircuitOpenError while requests to the host are suspended.
+        """
+        with self._lock:
+            state = self._get_states().get(host)
+        if state and state.get('open_until', 0) > time.time():
+            raise CircuitOpenError(
+                '{} is not responding, retrying in {}s'.format(host, int(state['open_until'] - time.time())),
+                url,
+            )
+
+    def record_failure(self, host):
+        now = time.time()
+        with self._lock:
+            states = self._get_states()
+            state = states.get(host)
+            failures = (state['failures'] if state and state['failed_at'] > now - BREAKER_WINDOW else 0) + 1
+            state = {'failures': failures, 'failed_at': now}
+            if failures >= BREAKER_THRESHOLD:
+                logger.warn('Suspending requests to %s for %ss after %s failures', host, BREAKER_OPEN, failures)
+                state['open_until'] = now + BREAKER_OPEN
+            states[host] = state
+            self._save()
+
+    def record_success(self, host):
+        with self._lock:
+            if self._get_states().pop(host, None) is not None:
+                self._save()
+
+    def _get_states(self):
+        if self._states is None:
+            try:
+                with open(self.path) as f:
+                    states = json.load(f)
+            except (IOError, ValueError):
+                states = {}
+
+            since = time.time() - BREAKER_WINDOW
+            self._states = dict(
+                (host, state) for host, state in states.iteritems()
+                if isinstance(state, dict) and state.get('failed_at', 0) > since
+            )
+        return self._states
+
+    def _save(self):
+        try:
+            with open(self.path, 'w') as f:
+                json.dump(self._states, f)
+        except IOError as e:
+            logger.warn('Failed to write %s -- %s', self.path, e)
+
+
+class Transport(object):
+
+    def __init__(self, circuits_file):
+        self.breaker = CircuitBreaker(circuits_file)
+        self._session = None
+        self._slots = threading.BoundedSemaphore(POOL_SIZE)
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = create_session()
+        return self._session
+
+    def get(self, url, headers=None, timeout=None, retries=RETRIES, stream=False):
+        """
+        Returns the response to a GET of the URL, or raises ApiError when it
+        failed or was answered with anything but 200.
+        """
+        import requests
+
+        host = urlsplit(url).netloc
+        self.breaker.check(host, url)
+
+        session = self.session
+        read_timeout = timeout or READ_TIMEOUT
+        attempt = 0
+        while True:
+            try:
+                with self._slots:
+                    response = session.get(
+                        url, headers=headers, stream=stream, timeout=(min(CONNECT_TIMEOUT, read_timeout), read_timeout)
+                    )
+            except requests.RequestException as e:
+                error, status = e, None
+            else:
+                if response.status_code == 200:
+                    self.breaker.record_success(host)
+                    return response
+                if response.status_code not in RETRIED_STATUSES:
+                    # The host is up, the request itself is refused.
+                    self.breaker.record_success(host)
+                    raise ApiError('{} answered HTTP {} for {}'.format(
+                        host, response.status_code, urlsplit(url).path), url, response.status_code)
+                error, status = 'HTTP {}'.format(response.status_code), response.status_code
+                response.close()
+
+            if attempt >= retries:
+                self.breaker.record_failure(host)
+                raise ApiError('{} failed after {} attempts -- {}'.format(host, attempt + 1, error), url, status)
+
+            delay = random.uniform(0, BACKOFF * 2 ** attempt)
+            logger.info('Retrying %s in %.2fs -- %s', url, delay, error)
+            time.sleep(delay)
+            attempt += 1
+
+
+def create_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    # Retries are done by Transport.get, with backoff and the circuit breaker.
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
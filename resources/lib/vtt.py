@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming WebVTT to SubRip (SRT) conversion.
+
+The converter is fed the raw bytes of a WebVTT file in arbitrary chunks and
+writes SRT cues as soon as they are complete, so only the cue currently
+being read is ever held in memory.
+"""
+import re
+
+# 01:02:03.456 or 02:03.456
+TIMESTAMP = re.compile(br'(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{1,3})')
+
+# Inline tags SRT players understand; everything else (classes, voices,
+# languages, ruby text, karaoke timestamps) is stripped, keeping the text.
+KEPT_TAGS = (b'b', b'i', b'u')
+TAG = re.compile(br'<(/?)([^\s.>/]*)[^>]*>')
+
+ENTITIES = (
+    (b'&lt;', b'<'),
+    (b'&gt;', b'>'),
+    (b'&nbsp;', b' '),
+    (b'&lrm;', b''),
+    (b'&rlm;', b''),
+    (b'&amp;', b'&'),
+)
+
+# Blocks that carry no cues.
+SKIPPED_BLOCKS = (b'WEBVTT', b'NOTE', b'STYLE', b'REGION')
+
+
+def convert_timestamp(timestamp):
+    """
+    Converts a WebVTT timestamp to the SRT `HH:MM:SS,mmm` form; returns None if it is malformed.
+    """
+    match = TIMESTAMP.match(timestamp.strip())
+    if not match:
+        return None
+
+    hours, minutes, seconds, millis = match.groups()
+    return b'%02d:%s:%s,%s' % (int(hours or 0), minutes.zfill(2), seconds, millis.ljust(3, b'0'))
+
+
+def _replace_tag(match):
+    closing, name = match.groups()
+    if name.lower() in KEPT_TAGS:
+        return b'<' + closing + name.lower() + b'>'
+    return b''
+
+
+def convert_text(line):
+    line = TAG.sub(_replace_tag, line)
+    for entity, value in ENTITIES:
+        line = line.replace(entity, value)
+    return line
+
+
+class VttToSrtConverter(object):
+
+    def __init__(self, write):
+        self.write = write
+        self.cues = 0
+
+        self._pending = b''
+        self._first_line = True
+        # The lines of the block being read, and whether the block is skipped.
+        self._block = []
+        self._skipping = False
+
+    def feed(self, data):
+        data = self._pending + data
+        lines = data.split(b'\n')
+        self._pending = lines.pop()
+        for line in lines:
+            self._feed_line(line)
+
+    def close(self):
+        if self._pending:
+            self._feed_line(self._pending)
+            self._pending = b''
+        self._end_block()
+
+    def _feed_line(self, line):
+        line = line.rstrip(b'\r')
+        if self._first_line:
+            self._first_line = False
+            if line.startswith(b'\xef\xbb\xbf'):
+                line = line[3:]
+
+        if not line.strip():
+            self._end_block()
+            return
+
+        if self._skipping:
+            return
+
+        if not self._block and line.startswith(SKIPPED_BLOCKS) and b'-->' not in line:
+            self._skipping = True
+            return
+
+        self._block.append(line)
+
+    def _end_block(self):
+        block, self._block = self._block, []
+        self._skipping = False
+
+        # An optional cue identifier precedes the timing line.
+        for index, line in enumerate(block[:2]):
+            if b'-->' in line:
+                break
+        else:
+            return
+
+        start, _, end = block[index].partition(b'-->')
+        start = convert_timestamp(start)
+        # Drop the cue settings (position, align, ...) following the end time.
+        end = convert_timestamp(end.strip().split(None, 1)[0] if end.strip() else end)
+        if not start or not end:
+            return
+
+        self.cues += 1
+        text = b'\n'.join(convert_text(line) for line in block[index + 1:])
+        self.write(b'%d\n%s --> %s\n%s\n\n' % (self.cues, start, end, text))
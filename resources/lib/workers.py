@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+A small bounded thread pool.
+
+`multiprocessing.pool.ThreadPool` needs working semaphores, which some Kodi
+platforms (Android) do not provide, so this sticks to `threading` and `Queue`.
+"""
+import logging
+import sys
+import threading
+import time
+
+from Queue import Queue
+
+logger = logging.getLogger(__name__)
+
+
+class TaskTimeout(Exception):
+    pass
+
+
+class Task(object):
+
+    def __init__(self, fn, args, kwargs):
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def run(self):
+        try:
+            self._result = self._fn(*self._args, **self._kwargs)
+        except Exception:
+            self._error = sys.exc_info()
+        finally:
+            self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def failed(self):
+        return self._error is not None
+
+    def wait(self, timeout=None):
+        """
+        Blocks until the task is finished or the timeout expires; returns whether it finished.
+        """
+        return self._done.wait(timeout)
+
+    def result(self, timeout=None):
+        """
+        Returns the task result, re-raising its exception if it failed, or
+        raises TaskTimeout if it did not finish in time.
+        """
+        if not self.wait(timeout):
+            raise TaskTimeout('Task did not finish within {}s'.format(timeout))
+
+        if self._error:
+            raise self._error[0], self._error[1], self._error[2]
+
+        return self._result
+
+
+class WorkerPool(object):
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._queue = Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        task = Task(fn, args, kwargs)
+        self._queue.put(task)
+
+        with self._lock:
+            # Start workers lazily, up to the limit.
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work)
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+        return task
+
+    def _work(self):
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+            task.run()
+
+    def shutdown(self, timeout=None):
+        """
+        Lets the queued tasks finish and stops the workers, waiting at most
+        `timeout` seconds for them.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+
+        for _ in threads:
+            self._queue.put(None)
+
+        deadline = None if timeout is None else time.time() + timeout
+        for thread in threads:
+            thread.join(None if deadline is None else max(deadline - time.time(), 0))
+            if thread.is_alive():
+                logger.warn('Worker thread did not stop in time')
+                break
+
+
+def wait_all(tasks, deadline):
+    """
+    Waits for the tasks until the unix timestamp `deadline`; returns the tasks that finished.
+    """
+    for task in tasks:
+        remaining = deadline - time.time()
+        if remaining <= 0 or not task.wait(remaining):
+            break
+
+    return [task for task in tasks if task.done]
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+
+from resources.lib import service
+
+# Keep this file to a minimum, as Kodi
+# doesn't keep a compiled copy of this
+
+service.run()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of release date parsing: the strptime/datetime/strftime path
+add_video_item used to take against models.parse_date, with an empty memo
+(every date new) and a warm one.
+
+The dates mimic a listing of a daily show: many episodes, few distinct days.
+
+Usage: python tests/benchmarks/bench_dates.py [--dates N] [--distinct N] [--rounds N]
+"""
+import argparse
+import os
+import sys
+import time
+
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import harness  # noqa: E402
+harness.install_stubs()
+
+from resources.lib import models  # noqa: E402
+
+
+def parse_strptime(value):
+    date = datetime(*(time.strptime(value.split('T')[0], "%Y-%m-%d")[0:6]))
+    return date.year, date.strftime('%d.%m.%Y')
+
+
+def best_of(rounds, fn, values, setup=None):
+    timings = []
+    for _ in range(rounds):
+        if setup:
+            setup()
+        started = time.time()
+        for value in values:
+            fn(value)
+        timings.append(time.time() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dates', type=int, default=500)
+    parser.add_argument('--distinct', type=int, default=30)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    start = datetime(2019, 1, 1)
+    values = [
+        u'{}T00:00:00'.format((start + timedelta(days=index % args.distinct)).strftime('%Y-%m-%d'))
+        for index in range(args.dates)
+    ]
+    unique = list(set(values))
+    assert all(parse_strptime(value) == models.parse_date(value) for value in unique)
+
+    baseline = best_of(args.rounds, parse_strptime, values)
+    print('{} dates, {} distinct'.format(args.dates, args.distinct))
+    print('{:<20} {:>10} {:>9}'.format('', 'ms', 'speedup'))
+    for name, setup, dates in (
+        ('strptime', None, values),
+        ('parse_date, cold', models._dates.clear, unique),
+        ('parse_date, listing', models._dates.clear, values),
+        ('parse_date, warm', None, values),
+    ):
+        elapsed = baseline if name == 'strptime' else best_of(args.rounds, models.parse_date, dates, setup)
+        # Per-date cost scaled to the full list, to compare like with like.
+        elapsed *= len(values) / float(len(dates))
+        print('{:<20} {:>10.3f} {:>8.1f}x'.format(name, elapsed * 1000, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
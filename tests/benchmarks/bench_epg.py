@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the live TV guide, against the fake API: fetching the windows
+of the 84 fixture channels, telling now/next for all of them from the
+cached windows, and the same lookups done by scanning the raw programme
+lists instead of bisecting the schedules.
+
+Run at 22:30 UTC by default, so the guide spans two windows.
+
+Usage: python tests/benchmarks/bench_epg.py [--hour H] [--rounds N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import harness  # noqa: E402
+harness.install_stubs()
+
+from resources.lib import epg  # noqa: E402
+from resources.lib.plugin import EPG_LOOKAHEAD, Zee5Plugin  # noqa: E402
+
+
+def now_next_scan(programmes, when):
+    current = upcoming = None
+    for programme in programmes:
+        start, end = epg.parse_time(programme['start_time']), epg.parse_time(programme['end_time'])
+        if start <= when < end:
+            current = programme
+        elif start > when and (upcoming is None or start < epg.parse_time(upcoming['start_time'])):
+            upcoming = programme
+    return current, upcoming
+
+
+def best_of(rounds, fn):
+    timings = []
+    for _ in range(rounds):
+        started = time.time()
+        fn()
+        timings.append(time.time() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--hour', type=float, default=22.5)
+    parser.add_argument('--rounds', type=int, default=10)
+    args = parser.parse_args()
+
+    with harness.fake_api() as api:
+        run(api, args)
+
+
+def run(api, args):
+    harness.clear_profile()
+
+    plugin = Zee5Plugin([harness.PLUGIN_URL, '1', '?action=live'], foreground=False)
+    channel_ids = [channel['id'] for channel in plugin.get_channels()]
+    now = epg.get_window(time.time()) + args.hour * 60 * 60
+
+    api.reset()
+    started = time.time()
+    plugin.get_guide(channel_ids, now)
+    cold = time.time() - started
+    requests = len(api.requests)
+
+    def run_cached():
+        guide = plugin.get_guide(channel_ids, now)
+        for channel_id in channel_ids:
+            guide.now_next(channel_id, now)
+
+    guide = plugin.get_guide(channel_ids, now)
+    schedules = dict((channel_id, guide.get_schedule(channel_id)) for channel_id in channel_ids)
+
+    def run_lookups():
+        for channel_id in channel_ids:
+            schedules[channel_id].now_next(now)
+
+    raw = [json.loads(api.respond('gwapi.zee5.com', '/v1/epg', {'start': str(offset)})[1])
+           for offset in range(len(epg.get_windows(now, EPG_LOOKAHEAD)))]
+    programmes = dict((channel_id, []) for channel_id in channel_ids)
+    for window in raw:
+        for channel in window['items']:
+            programmes[channel['id']].extend(channel['items'])
+
+    def run_scan():
+        for channel_id in channel_ids:
+            now_next_scan(programmes[channel_id], now)
+
+    print('{} channels, {} requests for the cold guide'.format(len(channel_ids), requests))
+    print('{:<24} {:>10}'.format('', 'ms'))
+    print('{:<24} {:>10.1f}'.format('cold fetch', cold * 1000))
+    print('{:<24} {:>10.2f}'.format('cached guide + now/next', best_of(args.rounds, run_cached) * 1000))
+    print('{:<24} {:>10.2f}'.format('now/next (bisect)', best_of(args.rounds, run_lookups) * 1000))
+    print('{:<24} {:>10.2f}'.format('now/next (raw scan)', best_of(args.rounds, run_scan) * 1000))
+
+    plugin.finish()
+
+
+if __name__ == '__main__':
+    main()
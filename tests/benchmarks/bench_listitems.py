@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of rendering a listing against the stubbed `xbmcplugin`.
+
+Compares handing the items over in one `addDirectoryItems` call with the
+previous pattern of one `addDirectoryItem` plus one `setContent` call per
+video. Each stub call costs `call_cost` seconds to simulate the IPC
+crossing into Kodi.
+
+Usage: python tests/benchmarks/bench_listitems.py [items] [call cost in ms]
+"""
+import copy
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import harness  # noqa: E402
+harness.install_stubs()
+
+import fakeapi  # noqa: E402
+import xbmcplugin  # noqa: E402
+from resources.lib import models  # noqa: E402
+from resources.lib.plugin import Zee5Plugin  # noqa: E402
+
+
+def make_videos(count):
+    """
+    Returns `count` episodes of the season fixture, as `models.Item`s.
+    """
+    episode = json.loads(fakeapi.load_fixture('season.json'))['episode'][0]
+    videos = []
+    for index in range(count):
+        video = copy.deepcopy(episode)
+        video['id'] = '0-1-{}'.format(index)
+        video['title'] = u'Episode {}'.format(index)
+        video['episode_number'] = index
+        video['release_date'] = '2019-01-{:02d}T00:00:00'.format(index % 28 + 1)
+        videos.append(video)
+    return models.parse_items(videos)
+
+
+def render_batched(plugin, videos):
+    for video in videos:
+        plugin.add_video_item(video)
+    plugin.end_directory()
+
+
+def render_per_item(plugin, videos):
+    for video in videos:
+        plugin.add_video_item(video)
+        for url, list_item, is_folder in plugin.directory_items:
+            xbmcplugin.addDirectoryItem(plugin.handle, url, list_item, is_folder)
+            xbmcplugin.setContent(plugin.handle, 'video')
+        plugin.directory_items = []
+    plugin.content = None
+    plugin.end_directory()
+
+
+def measure(render, videos, rounds=5):
+    best = None
+    for _ in range(rounds):
+        plugin = Zee5Plugin([harness.PLUGIN_URL, '1', '?token=benchmark'])
+        xbmcplugin.reset()
+        started = time.time()
+        render(plugin, videos)
+        elapsed = time.time() - started
+        best = elapsed if best is None else min(best, elapsed)
+        plugin.finish()
+    return best, len(xbmcplugin.calls)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    xbmcplugin.call_cost = (float(sys.argv[2]) if len(sys.argv) > 2 else 0.2) / 1000.0
+    videos = make_videos(count)
+
+    print('{} videos, {:.2f} ms per xbmcplugin call'.format(count, xbmcplugin.call_cost * 1000))
+    results = {}
+    # Shown artwork is left to Kodi; stray requests get the fixtures.
+    with harness.fake_api():
+        for name, render in (('per-item', render_per_item), ('batched', render_batched)):
+            elapsed, calls = measure(render, videos)
+            results[name] = elapsed
+            print('{:<9} {:8.2f} ms  {:5d} xbmcplugin calls'.format(name, elapsed * 1000, calls))
+    print('speedup   {:8.2f}x'.format(results['per-item'] / results['batched']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the compact item model against raw gwapi dicts, on a listing
+of 500 episodes built from the season fixture.
+
+Reports the memory retained by the 500 items, the size of their cached JSON
+and the time to parse and render them. The raw-dict renderer replays what
+add_video_item did before the model: genre and images looked up in the
+full dict on every render.
+
+Usage: python tests/benchmarks/bench_models.py [--items N] [--rounds N]
+"""
+import argparse
+import copy
+import gc
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import harness  # noqa: E402
+harness.install_stubs()
+
+import fakeapi  # noqa: E402
+import xbmcgui  # noqa: E402
+
+from resources.lib import models  # noqa: E402
+from resources.lib.plugin import Zee5Plugin  # noqa: E402
+
+
+def make_payload(count):
+    episode = json.loads(fakeapi.load_fixture('season.json'))['episode'][0]
+    items = []
+    for index in range(count):
+        item = copy.deepcopy(episode)
+        item['id'] = '0-1-{}'.format(100000 + index)
+        item['title'] = u'Episode {}'.format(index + 1)
+        item['episode_number'] = index + 1
+        items.append(item)
+    # Through JSON, like a real response.
+    return json.dumps(items)
+
+
+def deep_size(value, seen=None):
+    """
+    Returns the bytes taken by the value and everything it references.
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(key, seen) + deep_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(deep_size(item, seen) for item in value)
+    elif hasattr(value, '__slots__'):
+        size += sum(deep_size(getattr(value, name), seen) for name in value.__slots__)
+    return size
+
+
+def render_raw(plugin, video):
+    list_item = xbmcgui.ListItem(label=video['title'])
+    list_item.setInfo('video', {
+        'title': video['title'],
+        'genre': models.get_genre(video),
+        'episode': video.get('episode_number'),
+        'plot': video.get('description'),
+        'duration': video.get('duration'),
+        'mediatype': 'video',
+    })
+    list_image, cover_image = models.get_images(video)
+    list_item.setArt({
+        'thumb': list_image or cover_image,
+        'icon': list_image or cover_image,
+        'fanart': cover_image or list_image,
+    })
+    list_item.setProperty('IsPlayable', 'true')
+    plugin.directory_items.append((plugin.get_url(action='play', content_id=video['id']), list_item, False))
+
+
+def render_model(plugin, video):
+    list_item = xbmcgui.ListItem(label=video.title)
+    list_item.setInfo('video', {
+        'title': video.title,
+        'genre': video.genre,
+        'episode': video.episode,
+        'plot': video.description,
+        'duration': video.duration,
+        'mediatype': 'video',
+    })
+    list_item.setArt({
+        'thumb': video.list_image or video.cover_image,
+        'icon': video.list_image or video.cover_image,
+        'fanart': video.cover_image or video.list_image,
+    })
+    list_item.setProperty('IsPlayable', 'true')
+    plugin.directory_items.append((plugin.get_url(action='play', content_id=video.id), list_item, False))
+
+
+def best_of(rounds, fn):
+    timings = []
+    for _ in range(rounds):
+        gc.collect()
+        started = time.time()
+        fn()
+        timings.append(time.time() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    payload = make_payload(args.items)
+    raw = json.loads(payload)
+    items = models.parse_items(raw)
+    plugin = Zee5Plugin([harness.PLUGIN_URL, '1', ''], foreground=False)
+
+    def run_raw():
+        del plugin.directory_items[:]
+        for video in raw:
+            render_raw(plugin, video)
+
+    def run_model():
+        del plugin.directory_items[:]
+        for video in models.parse_items(raw):
+            render_model(plugin, video)
+
+    def run_cached():
+        del plugin.directory_items[:]
+        for video in json.loads(cached):
+            render_model(plugin, models.Item.from_json(video))
+
+    cached = json.dumps([item.to_json() for item in items], separators=(',', ':'))
+
+    print('{} items'.format(args.items))
+    print('{:<8} {:>12} {:>12} {:>12}'.format('', 'memory KB', 'cached KB', 'render ms'))
+    print('{:<8} {:>12.0f} {:>12.0f} {:>12.1f}'.format(
+        'raw', deep_size(raw) / 1024.0, len(json.dumps(raw, separators=(',', ':'))) / 1024.0,
+        best_of(args.rounds, run_raw) * 1000))
+    print('{:<8} {:>12.0f} {:>12.0f} {:>12.1f}'.format(
+        'model', deep_size(items) / 1024.0, len(cached) / 1024.0, best_of(args.rounds, run_model) * 1000))
+    print('{:<8} {:>12} {:>12} {:>12.1f}'.format('cached', '', '', best_of(args.rounds, run_cached) * 1000))
+
+    plugin.finish()
+
+
+if __name__ == '__main__':
+    main()
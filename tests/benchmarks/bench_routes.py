@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of every plugin route against the local Zee5 stand-in.
+
+Each route is run with an empty profile (cold) and right after a first
+invocation (warm). Reports the median wall-clock time, the number of API
+requests and, where the tracemalloc module is available, the peak memory
+allocated by the invocation.
+
+Usage: python tests/benchmarks/bench_routes.py [--rounds N] [--latency SECONDS] [--route NAME]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import harness  # noqa: E402
+harness.install_stubs()
+
+import xbmc  # noqa: E402
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+ROUTES = (
+    ('root', ''),
+    ('collection', '?action=collection&content_id=0-8-homepage'),
+    ('manual', '?action=manual&content_id=0-8-manualcol_1'),
+    ('show', '?action=show&content_id=0-6-100'),
+    ('season', '?action=season&content_id=0-2-500'),
+    ('play', '?action=play&content_id=0-0-1000'),
+    ('search', '?action=search'),
+    ('live', '?action=live'),
+)
+
+
+def measure(api, query):
+    api.reset()
+    if tracemalloc:
+        tracemalloc.start()
+
+    started = time.time()
+    harness.run_plugin(query)
+    elapsed = time.time() - started
+
+    allocated = None
+    if tracemalloc:
+        allocated = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return elapsed, len(api.requests), allocated
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0, help='seconds added to every API response')
+    parser.add_argument('--route', action='append', help='only run the named route(s)')
+    args = parser.parse_args()
+
+    xbmc.Keyboard.text = 'fixture'
+    xbmc.Player.playing = True
+
+    with harness.fake_api(args.latency) as api:
+        run(api, args)
+
+
+def run(api, args):
+    print('{:<11} {:>10} {:>5} {:>9}   {:>10} {:>5} {:>9}'.format(
+        'route', 'cold ms', 'reqs', 'peak KB', 'warm ms', 'reqs', 'peak KB'))
+    for name, query in ROUTES:
+        if args.route and name not in args.route:
+            continue
+
+        cold, warm = [], []
+        for _ in range(args.rounds):
+            harness.clear_profile()
+            cold.append(measure(api, query))
+            warm.append(measure(api, query))
+
+        row = []
+        for results in (cold, warm):
+            elapsed = median([result[0] for result in results])
+            requests = median([result[1] for result in results])
+            allocated = '{:.0f}'.format(median([result[2] for result in results]) / 1024.0) if tracemalloc else '-'
+            row.extend((elapsed * 1000, requests, allocated))
+        print('{:<11} {:>10.1f} {:>5} {:>9}   {:>10.1f} {:>5} {:>9}'.format(name, *row))
+
+
+if __name__ == '__main__':
+    main()
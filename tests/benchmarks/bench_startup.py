@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Cold start benchmark: every invocation runs in a fresh interpreter, the way
+Kodi starts the add-on for each folder.
+
+For each route, with an empty profile (cold) and right after a first
+invocation (warm), reports the median time to import the plugin module,
+the time until the folder or the playable item is handed over to Kodi,
+and whether `requests` got imported at all.
+
+Usage: python tests/benchmarks/bench_startup.py [--rounds N] [--latency SECONDS] [--route NAME]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, TESTS_DIR)
+
+from bench_routes import ROUTES, median  # noqa: E402
+
+API_URL_VARIABLE = 'BENCH_FAKE_API_URL'
+
+
+def child(query):
+    """
+    Runs one invocation and prints its measurements as JSON.
+    """
+    started = time.time()
+
+    import harness
+    harness.install_stubs()
+
+    import fakeapi
+    import xbmc
+    import xbmcplugin
+
+    xbmc.Keyboard.text = 'fixture'
+    xbmc.Player.playing = True
+    fakeapi.route_requests_to(os.environ[API_URL_VARIABLE])
+
+    handed_over = []
+
+    def timed(function):
+        def wrapper(*args, **kwargs):
+            if not handed_over:
+                handed_over.append(time.time())
+            return function(*args, **kwargs)
+        return wrapper
+
+    xbmcplugin.endOfDirectory = timed(xbmcplugin.endOfDirectory)
+    xbmcplugin.setResolvedUrl = timed(xbmcplugin.setResolvedUrl)
+
+    import_started = time.time()
+    from resources.lib import plugin  # noqa: F401
+    imported = time.time()
+
+    harness.run_plugin(query)
+
+    print(json.dumps({
+        'import': imported - import_started,
+        'first': (handed_over[0] if handed_over else time.time()) - started,
+        'requests': 'requests' in sys.modules,
+    }))
+
+
+def spawn(query, home, api_url):
+    env = dict(os.environ, KODI_STUB_HOME=home)
+    env[API_URL_VARIABLE] = api_url
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child', query], env=env)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0, help='seconds added to every API response')
+    parser.add_argument('--route', action='append', help='only run the named route(s)')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        child(args.child)
+        return
+
+    import fakeapi
+
+    api = fakeapi.FakeApi(latency=args.latency).start()
+    home = tempfile.mkdtemp(prefix='kodi-stub-')
+
+    print('{:<11} {:>9} {:>9} {:>9}   {:>9} {:>9} {:>9}'.format(
+        'route', 'import ms', 'first ms', 'requests', 'import ms', 'first ms', 'requests'))
+    try:
+        for name, query in ROUTES:
+            if args.route and name not in args.route:
+                continue
+
+            cold, warm = [], []
+            for _ in range(args.rounds):
+                shutil.rmtree(os.path.join(home, 'profile'), ignore_errors=True)
+                cold.append(spawn(query, home, api.base_url))
+                warm.append(spawn(query, home, api.base_url))
+
+            row = []
+            for results in (cold, warm):
+                row.extend((
+                    median([result['import'] for result in results]) * 1000,
+                    median([result['first'] for result in results]) * 1000,
+                    'yes' if any(result['requests'] for result in results) else 'no',
+                ))
+            print('{:<11} {:>9.1f} {:>9.1f} {:>9}   {:>9.1f} {:>9.1f} {:>9}'.format(name, *row))
+    finally:
+        api.stop()
+        shutil.rmtree(home, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the streaming WebVTT to SRT converter on a synthetic 3-hour
+subtitle file. Reports throughput and the peak RSS of the process.
+
+Usage: python tests/benchmarks/bench_vtt.py [hours]
+"""
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from resources.lib.vtt import VttToSrtConverter  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+
+
+def timestamp(millis):
+    seconds, millis = divmod(millis, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return '%02d:%02d:%02d.%03d' % (hours, minutes, seconds, millis)
+
+
+def synthetic_vtt(hours):
+    """
+    Yields a WebVTT file in CHUNK_SIZE chunks, with a cue every 2.5 seconds.
+    """
+    buf = [b'WEBVTT\n\nNOTE synthetic benchmark file\n\n']
+    size = 0
+    for index, start in enumerate(range(0, int(hours * 60 * 60 * 1000), 2500)):
+        cue = (
+            'cue-%d\n%s --> %s align:start position:10%%\n'
+            '<v Narrator><c.yellow>Line %d of the synthetic subtitle track</c></v>\n'
+            '<i>with a second, styled line &amp; an entity</i>\n\n'
+        ) % (index, timestamp(start), timestamp(start + 2000), index)
+        buf.append(cue.encode('utf-8'))
+        size += len(cue)
+        if size >= CHUNK_SIZE:
+            data = b''.join(buf)
+            buf, size = [], 0
+            yield data
+    yield b''.join(buf)
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024.0 * 1024.0) if sys.platform == 'darwin' else rss / 1024.0
+
+
+def main():
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    written = [0]
+
+    def write(data):
+        written[0] += len(data)
+
+    rss_before = peak_rss_mb()
+    converter = VttToSrtConverter(write)
+    read = 0
+    started = time.time()
+    for chunk in synthetic_vtt(hours):
+        read += len(chunk)
+        converter.feed(chunk)
+    converter.close()
+    elapsed = time.time() - started
+
+    print('input:      %.1f MB WebVTT, %d cues (%.1f hours)' % (read / 1e6, converter.cues, hours))
+    print('output:     %.1f MB SRT' % (written[0] / 1e6))
+    print('time:       %.3f s' % elapsed)
+    print('throughput: %.1f MB/s, %d cues/s' % (read / 1e6 / elapsed, converter.cues / elapsed))
+    print('peak RSS:   %.1f MB (%.1f MB before converting)' % (peak_rss_mb(), rss_before))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Shared fixtures of the unit tests: the Kodi stubs are installed before any
+add-on module is imported, `api` serves the recorded responses and
+`configure` changes the add-on settings.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import harness  # noqa: E402
+harness.install_stubs()
+
+import pytest  # noqa: E402
+
+
+class Clock(object):
+    """
+    Stand-in for the `time` module whose time only moves when told to.
+    """
+
+    def __init__(self, now=1500000000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def api():
+    harness.clear_profile()
+    with harness.fake_api() as api:
+        yield api
+
+
+@pytest.fixture
+def configure():
+    """
+    Returns a function setting add-on settings by id, the way the settings
+    dialog does; all settings are back to their defaults afterwards.
+    """
+    import xbmcaddon
+    from resources.lib import settings
+
+    def configure(**values):
+        for setting_id, value in values.items():
+            xbmcaddon.settings[setting_id] = str(value).lower() if isinstance(value, bool) else str(value)
+        xbmcaddon.save_settings()
+        settings.invalidate()
+
+    yield configure
+    xbmcaddon.reset_settings()
+    settings.invalidate()
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for the Zee5 APIs, replaying the recorded responses in `fixtures/`.
+
+`FakeApi` serves the fixtures over HTTP on 127.0.0.1 and `route_requests_to`
+makes `requests` send all https:// traffic there, so the add-on code runs
+unchanged. Requests are answered from the first matching entry of ROUTES,
+listings being cut to the page and languages asked for (see `paginate`).
+The EPG fixture holds one day of programmes, which is moved to the day
+asked for and narrowed down to the channels asked for.
+"""
+import calendar
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+# time.strptime imports it lazily, which is not thread-safe on Python 2.
+import _strptime  # noqa: F401
+
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+from urlparse import parse_qsl, urlsplit, urlunsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# (host, path prefix, required query parameter or None, fixture file)
+ROUTES = (
+    ('useraction.zee5.com', '/token/platform_tokens.php', None, 'token.json'),
+    ('useraction.zee5.com', '/tokennd', None, 'video_token.json'),
+    ('b2bapi.zee5.com', '/front/countrylist.php', None, 'countrylist.json'),
+    ('gwapi.zee5.com', '/content/collection/', 'item_limit', 'collection.json'),
+    ('gwapi.zee5.com', '/content/collection/', None, 'manual.json'),
+    ('gwapi.zee5.com', '/content/tvshow/', None, 'tvshow.json'),
+    ('gwapi.zee5.com', '/content/season/', None, 'season.json'),
+    ('gwapi.zee5.com', '/content/details/', None, 'details.json'),
+    ('gwapi.zee5.com', '/content/getContent/autoSuggest', None, 'search.json'),
+    ('gwapi.zee5.com', '/v1/epg', None, 'epg.json'),
+    ('catalogapi.zee5.com', '/v1/channel/bygenre', None, 'channels.json'),
+    ('zee5vod.akamaized.net', '/', None, 'subtitle.vtt'),
+    ('akamaividz.zee5.com', '/resources/', None, 'artwork.jpg'),
+    ('akamaividz1.zee5.com', '/resources/', None, 'artwork.jpg'),
+)
+
+# The day the EPG fixture was recorded on.
+EPG_DAY = calendar.timegm((2019, 1, 10, 0, 0, 0))
+
+# Content types of the fixtures other than JSON, by extension.
+CONTENT_TYPES = {'.vtt': 'text/vtt', '.jpg': 'image/jpeg'}
+
+# Hosts serving files rather than API responses.
+CDN_HOSTS = ('zee5vod.akamaized.net', 'akamaividz.zee5.com', 'akamaividz1.zee5.com')
+
+# Seconds `FakeApi.stop` waits for each of the server threads.
+STOP_TIMEOUT = 5
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Send each response in one write, avoiding Nagle/delayed ACK stalls.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        # Paths look like /<original host>/<original path>.
+        _, host, path = self.path.split('/', 2)
+        path, _, query = ('/' + path).partition('?')
+        params = dict(parse_qsl(query))
+
+        api = self.server.api
+        api.record(host, path, params)
+        if api.latency:
+            time.sleep(api.latency)
+
+        status, body, content_type = api.respond(host, path, params)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class):
+        HTTPServer.__init__(self, server_address, handler_class)
+        self.stopping = False
+        self._lock = threading.Lock()
+        # {request socket: handler thread} of the open connections.
+        self._connections = {}
+
+    def process_request(self, request, client_address):
+        thread = threading.Thread(target=self.process_request_thread, args=(request, client_address))
+        thread.daemon = self.daemon_threads
+        with self._lock:
+            self._connections[request] = thread
+        thread.start()
+
+    def process_request_thread(self, request, client_address):
+        try:
+            ThreadingMixIn.process_request_thread(self, request, client_address)
+        finally:
+            with self._lock:
+                self._connections.pop(request, None)
+
+    def handle_error(self, request, client_address):
+        # Connections cut by close_connections are expected to fail.
+        if not self.stopping:
+            HTTPServer.handle_error(self, request, client_address)
+
+    def close_connections(self, timeout):
+        """
+        Cuts the connections clients keep alive, and waits for their handler
+        threads to finish.
+        """
+        self.stopping = True
+        with self._lock:
+            connections = list(self._connections.items())
+        for request, _ in connections:
+            try:
+                request.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+        for _, thread in connections:
+            thread.join(timeout)
+
+
+class FakeApi(object):
+
+    def __init__(self, latency=0):
+        # Seconds every response is delayed by, to mimic a slow network.
+        self.latency = latency
+        # Requests received, as (host, path, params) tuples.
+        self.requests = []
+        # Forced responses, {(host, path prefix): status}.
+        self.failures = {}
+        # Forced responses to the next matching request only, likewise.
+        self.next_failures = {}
+
+        self._lock = threading.Lock()
+        self._fixtures = {}
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), FakeApiHandler)
+        self._server.api = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return 'http://127.0.0.1:{}'.format(self._server.server_address[1])
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops serving and waits for the server threads, so none is left
+        running when the interpreter shuts down.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._server.close_connections(STOP_TIMEOUT)
+            self._thread.join(STOP_TIMEOUT)
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset(self):
+        with self._lock:
+            del self.requests[:]
+        self.failures.clear()
+        self.next_failures.clear()
+
+    def record(self, host, path, params):
+        with self._lock:
+            self.requests.append((host, path, params))
+
+    def api_requests(self, path=None):
+        """
+        Returns the requests received but those for CDN_HOSTS, only the ones
+        whose path starts with `path` if given.
+        """
+        with self._lock:
+            return [
+                request for request in self.requests
+                if request[0] not in CDN_HOSTS and (path is None or request[1].startswith(path))
+            ]
+
+    def fixture(self, name):
+        if name not in self._fixtures:
+            self._fixtures[name] = load_fixture(name)
+        return self._fixtures[name]
+
+    def respond(self, host, path, params):
+        with self._lock:
+            for (failing_host, prefix), status in self.next_failures.items():
+                if host == failing_host and path.startswith(prefix):
+                    del self.next_failures[(failing_host, prefix)]
+                    return status, b'{"error": "forced failure"}', 'application/json'
+        for (failing_host, prefix), status in self.failures.items():
+            if host == failing_host and path.startswith(prefix):
+                return status, b'{"error": "forced failure"}', 'application/json'
+
+        for route_host, prefix, required, name in ROUTES:
+            if host != route_host or not path.startswith(prefix):
+                continue
+            if required and required not in params:
+                continue
+
+            body = self.fixture(name)
+            extension = os.path.splitext(name)[1]
+            if extension in CONTENT_TYPES:
+                return 200, body, CONTENT_TYPES[extension]
+
+            if name == 'epg.json':
+                body = shift_epg(body, params)
+            if 'page' in params:
+                data = json.loads(body)
+                if isinstance(data, dict) and 'page' in data:
+                    body = json.dumps(paginate(data, params))
+            return 200, body, 'application/json'
+
+        return 404, b'{"error": "no fixture"}', 'application/json'
+
+
+def paginate(data, params):
+    """
+    Returns the page asked for of a listing fixture, paged by `limit`. The
+    fixture holds the first items of the listing; the following ones repeat
+    them up to `total`, with the repetition number appended to their ids and
+    their `orderid` moved along. With a `languages` parameter only the items
+    in one of those languages are listed, the way gwapi filters listings.
+    """
+    bucketed = len(data.get('buckets') or []) == 1 and 'items' in data['buckets'][0]
+    key = next((key for key in ('episode', 'seasons') if key in data), 'buckets')
+    items = (data['buckets'][0]['items'] if bucketed else data.get(key)) or []
+
+    listing = []
+    for number in range((data.get('total', 0) + len(items) - 1) // len(items) if items else 0):
+        for item in items:
+            item = dict(item, orderid=item.get('orderid', 0) + number * len(items))
+            if number:
+                item['id'] = '{}-{}'.format(item['id'], number + 1)
+            listing.append(item)
+    del listing[data.get('total', 0):]
+
+    if params.get('languages'):
+        languages = set(params['languages'].split(','))
+        listing = [item for item in listing if languages.intersection(item.get('languages') or languages)]
+
+    page, limit = int(params['page']), int(params.get('limit') or data.get('limit') or 25)
+    page_items = listing[(page - 1) * limit:page * limit]
+    data = dict(data, page=page, limit=limit, total=len(listing))
+    if bucketed:
+        data['buckets'] = [dict(data['buckets'][0], items=page_items, total=len(listing))]
+    else:
+        data[key] = page_items
+    return data
+
+
+def shift_epg(body, params):
+    """
+    Returns the EPG fixture moved from EPG_DAY to the day `start` days from
+    today (UTC), with only the `channels` asked for.
+    """
+    day = int(time.time()) // 86400 * 86400 + int(params.get('start', 0)) * 86400
+    channels = set(params['channels'].split(',')) if params.get('channels') else None
+
+    def shift(value):
+        timestamp = calendar.timegm(time.strptime(value, '%Y-%m-%dT%H:%M:%SZ')) - EPG_DAY + day
+        return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+    data = json.loads(body)
+    data['items'] = [channel for channel in data['items'] if channels is None or channel['id'] in channels]
+    for channel in data['items']:
+        for programme in channel['items']:
+            programme['start_time'] = shift(programme['start_time'])
+            programme['end_time'] = shift(programme['end_time'])
+    return json.dumps(data)
+
+
+# The unpatched HTTPAdapter.send, once routing is in place.
+_original_send = []
+
+
+def route_requests_to(base_url):
+    """
+    Makes every `requests` transport adapter send https://<host>/<path> to
+    <base_url>/<host>/<path> instead of the internet.
+
+    `requests` is not imported for this: when it is not loaded yet, the
+    adapter gets patched on import, so start-up measurements are unaffected.
+    """
+    _RoutingImporter.base_url = urlsplit(base_url)
+    if 'requests.adapters' in sys.modules:
+        _patch_adapter(sys.modules['requests.adapters'])
+    elif _RoutingImporter not in sys.meta_path:
+        sys.meta_path.insert(0, _RoutingImporter)
+
+
+def restore_requests():
+    if _RoutingImporter in sys.meta_path:
+        sys.meta_path.remove(_RoutingImporter)
+    if _original_send:
+        sys.modules['requests.adapters'].HTTPAdapter.send = _original_send.pop()
+
+
+def _patch_adapter(adapters):
+    if not _original_send:
+        _original_send.append(adapters.HTTPAdapter.send)
+    original_send = _original_send[0]
+
+    def send(adapter, request, **kwargs):
+        base_url = _RoutingImporter.base_url
+        scheme, host, path, query, fragment = urlsplit(request.url)
+        if scheme == 'https':
+            request.url = urlunsplit((base_url.scheme, base_url.netloc, '/' + host + path, query, fragment))
+        return original_send(adapter, request, **kwargs)
+
+    adapters.HTTPAdapter.send = send
+
+
+class _RoutingImporter(object):
+    """
+    Import hook patching `requests.adapters` as soon as it is loaded.
+    """
+    base_url = None
+
+    @classmethod
+    def find_module(cls, fullname, path=None):
+        return cls if fullname == 'requests.adapters' else None
+
+    @classmethod
+    def load_module(cls, fullname):
+        sys.meta_path.remove(cls)
+        __import__(fullname)
+        module = sys.modules[fullname]
+        _patch_adapter(module)
+        return module
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Recording stand-in for Kodi's `xbmc` module.
+
+`special://` paths resolve below the directory named by the
+KODI_STUB_HOME environment variable (a temporary directory by default).
+"""
+import os
+import tempfile
+
+LOGDEBUG = 0
+LOGINFO = 1
+LOGNOTICE = 2
+LOGWARNING = 3
+LOGERROR = 4
+LOGSEVERE = 5
+LOGFATAL = 6
+LOGNONE = 7
+
+HOME = os.environ.get('KODI_STUB_HOME') or tempfile.mkdtemp(prefix='kodi-stub-')
+
+# Log lines, as (level, message) tuples.
+logs = []
+
+# Built-in functions executed.
+builtins = []
+
+# Info labels and visibility conditions reported to the add-on.
+info_labels = {}
+conditions = {}
+
+
+def log(msg, level=LOGDEBUG):
+    logs.append((level, msg))
+    if os.environ.get('KODI_STUB_VERBOSE'):
+        print('[kodi] {}'.format(msg))
+
+
+def translatePath(path):
+    if path.startswith('special://'):
+        path = os.path.join(HOME, path[len('special://'):])
+    return path.encode('utf-8') if isinstance(path, unicode) else path
+
+
+def executebuiltin(function, wait=False):
+    builtins.append(function)
+
+
+def executeJSONRPC(request):
+    return '{"id": 1, "jsonrpc": "2.0", "result": {}}'
+
+
+def getInfoLabel(label):
+    return info_labels.get(label, '')
+
+
+def getCondVisibility(condition):
+    return conditions.get(condition, False)
+
+
+def getGlobalIdleTime():
+    return 0
+
+
+def sleep(milliseconds):
+    import time
+    time.sleep(milliseconds / 1000.0)
+
+
+class Keyboard(object):
+    # Text "typed" into every keyboard; None cancels the dialog.
+    text = None
+
+    def __init__(self, line='', heading='', hidden=False):
+        self.heading = heading
+
+    def doModal(self, autoclose=0):
+        pass
+
+    def isConfirmed(self):
+        return Keyboard.text is not None
+
+    def getText(self):
+        return Keyboard.text or ''
+
+
+class Monitor(object):
+
+    def abortRequested(self):
+        return False
+
+    def waitForAbort(self, timeout=0):
+        import time
+        time.sleep(timeout or 0)
+        return False
+
+
+class Player(object):
+    playing = False
+    subtitles = []
+
+    def isPlaying(self):
+        return Player.playing
+
+    def isPlayingVideo(self):
+        return Player.playing
+
+    def setSubtitles(self, subtitleFile):
+        Player.subtitles.append(subtitleFile)
+
+    def getSubtitles(self):
+        return ''
+
+    def getAvailableSubtitleStreams(self):
+        return list(Player.subtitles)
+
+    def setSubtitleStream(self, stream):
+        pass
+
+    def showSubtitles(self, visible):
+        pass
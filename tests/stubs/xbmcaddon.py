@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-in for Kodi's `xbmcaddon` module.
+
+Settings start from the defaults in resources/settings.xml and can be
+changed through the module level `settings` dict; `save_settings()` then
+writes them to the profile settings.xml, as Kodi does when the settings
+dialog is closed.
+"""
+import os
+from xml.etree import ElementTree
+
+import xbmc
+
+ADDON_ID = 'plugin.video.youngkbell.zee5'
+ADDON_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def _default_settings():
+    tree = ElementTree.parse(os.path.join(ADDON_PATH, 'resources', 'settings.xml'))
+    return {
+        setting.get('id'): setting.get('default', '')
+        for setting in tree.iter('setting')
+        if setting.get('id')
+    }
+
+
+settings = _default_settings()
+
+
+def reset_settings():
+    settings.clear()
+    settings.update(_default_settings())
+    save_settings()
+
+
+def save_settings():
+    directory = os.path.join(xbmc.HOME, 'profile', 'addon_data', ADDON_ID)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    root = ElementTree.Element('settings', version='2')
+    for key, value in sorted(settings.items()):
+        ElementTree.SubElement(root, 'setting', id=key).text = value
+    ElementTree.ElementTree(root).write(os.path.join(directory, 'settings.xml'), encoding='utf-8')
+
+
+class Addon(object):
+
+    def __init__(self, id=None):
+        pass
+
+    def getAddonInfo(self, key):
+        return {
+            'id': ADDON_ID,
+            'name': 'Zee 5',
+            'path': ADDON_PATH,
+            'profile': 'special://profile/addon_data/{}/'.format(ADDON_ID),
+            'icon': os.path.join(ADDON_PATH, 'resources', 'icon_zee5.jpg'),
+            'version': '0.0.0',
+        }.get(key, '')
+
+    def getSetting(self, key):
+        return settings.get(key, '')
+
+    def setSetting(self, key, value):
+        settings[key] = value
+        save_settings()
+
+    def getLocalizedString(self, string_id):
+        return u''
+
+    def openSettings(self):
+        pass
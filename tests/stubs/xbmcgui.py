@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Recording stand-in for Kodi's `xbmcgui` module.
+"""
+NOTIFICATION_INFO = 'info'
+NOTIFICATION_WARNING = 'warning'
+NOTIFICATION_ERROR = 'error'
+
+# Notifications shown, as (heading, message) tuples.
+notifications = []
+
+
+class ListItem(object):
+
+    def __init__(self, label='', label2='', iconImage='', thumbnailImage='', path='', offscreen=False):
+        self.label = label
+        self.label2 = label2
+        self.path = path
+        self.info = {}
+        self.art = {}
+        self.properties = {}
+        self.subtitles = []
+        if iconImage or thumbnailImage:
+            self.art.update(icon=iconImage, thumb=thumbnailImage)
+
+    def setLabel(self, label):
+        self.label = label
+
+    def setLabel2(self, label):
+        self.label2 = label
+
+    def setInfo(self, type, infoLabels):
+        self.info.update(infoLabels)
+
+    def setArt(self, values):
+        self.art.update(values)
+
+    def setProperty(self, key, value):
+        self.properties[key] = value
+
+    def setSubtitles(self, subtitleFiles):
+        self.subtitles = list(subtitleFiles)
+
+    def getLabel(self):
+        return self.label
+
+
+class Dialog(object):
+
+    def notification(self, heading, message, icon='', time=5000, sound=True):
+        notifications.append((heading, message))
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Recording stand-in for Kodi's `xbmcplugin` module.
+"""
+SORT_METHOD_NONE = 0
+SORT_METHOD_LABEL = 1
+
+# Every call made to this module, as (function name, args) tuples.
+calls = []
+
+# The items of the current virtual folder, as (url, ListItem, isFolder) tuples.
+items = []
+
+# Per-call cost (in seconds) to simulate the IPC crossing into Kodi.
+call_cost = 0
+
+
+def _record(name, *args):
+    calls.append((name, args))
+    if call_cost:
+        _spin(call_cost)
+
+
+def _spin(seconds):
+    import time
+    end = time.time() + seconds
+    while time.time() < end:
+        pass
+
+
+def reset():
+    del calls[:]
+    del items[:]
+
+
+def setPluginCategory(handle, category):
+    _record('setPluginCategory', handle, category)
+
+
+def setContent(handle, content):
+    _record('setContent', handle, content)
+
+
+def addSortMethod(handle, sortMethod, label2Mask=''):
+    _record('addSortMethod', handle, sortMethod)
+
+
+def addDirectoryItem(handle, url, listitem, isFolder=False, totalItems=0):
+    _record('addDirectoryItem', handle, url, listitem, isFolder)
+    items.append((url, listitem, isFolder))
+    return True
+
+
+def addDirectoryItems(handle, items_, totalItems=0):
+    _record('addDirectoryItems', handle, len(items_))
+    items.extend(items_)
+    return True
+
+
+def endOfDirectory(handle, succeeded=True, updateListing=False, cacheToDisc=True):
+    _record('endOfDirectory', handle, succeeded)
+
+
+def setResolvedUrl(handle, succeeded, listitem):
+    _record('setResolvedUrl', handle, succeeded, listitem)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-in for Kodi's `xbmcvfs` module, backed by the local file system.
+"""
+import os
+import shutil
+
+
+class File(object):
+
+    def __init__(self, path, mode='r'):
+        self._file = open(path, mode if 'b' in mode else mode + 'b')
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def write(self, data):
+        self._file.write(data)
+        return True
+
+    def size(self):
+        return os.fstat(self._file.fileno()).st_size
+
+    def close(self):
+        self._file.close()
+
+
+class Stat(object):
+    # Kodi reports zeros for files it cannot stat.
+
+    def __init__(self, path):
+        try:
+            self._stat = os.stat(path)
+        except OSError:
+            self._stat = None
+
+    def st_size(self):
+        return self._stat.st_size if self._stat else 0
+
+    def st_atime(self):
+        return int(self._stat.st_atime) if self._stat else 0
+
+    def st_mtime(self):
+        return int(self._stat.st_mtime) if self._stat else 0
+
+
+def exists(path):
+    return os.path.exists(path)
+
+
+def listdir(path):
+    names = os.listdir(path)
+    dirs = [name for name in names if os.path.isdir(os.path.join(path, name))]
+    return dirs, [name for name in names if name not in dirs]
+
+
+def mkdir(path):
+    os.mkdir(path)
+    return True
+
+
+def mkdirs(path):
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    return True
+
+
+def delete(path):
+    try:
+        os.remove(path)
+    except OSError:
+        return False
+    return True
+
+
+def rmdir(path, force=False):
+    shutil.rmtree(path) if force else os.rmdir(path)
+    return True
+
+
+def rename(source, target):
+    os.rename(source, target)
+    return True
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import pytest
+import xbmcgui
+
+from resources.lib.artwork import Artwork, resize
+from resources.lib.filestore import FileStore
+
+LIST_IMAGE = 'https://akamaividz.zee5.com/resources/0-1-700/list/270x152/episode11170x658.jpg'
+COVER_IMAGE = 'https://akamaividz1.zee5.com/resources/0-1-700/cover/270x405/episode11920x770.jpg'
+
+
+def test_resize_scales_to_the_screen():
+    assert resize(LIST_IMAGE, 1920) == LIST_IMAGE.replace('270x152', '480x270')
+    assert resize(COVER_IMAGE, 1280) == COVER_IMAGE.replace('270x405', '200x300')
+    assert resize('https://example.com/image.jpg', 1920) == 'https://example.com/image.jpg'
+
+
+@pytest.fixture
+def artwork(tmpdir):
+    return Artwork(FileStore(str(tmpdir), 1024 * 1024), max_workers=2, timeout=5)
+
+
+def get_art(artwork):
+    list_item = xbmcgui.ListItem()
+    artwork.set_art(list_item, LIST_IMAGE, COVER_IMAGE)
+    return list_item.art
+
+
+def cdn_requests(api):
+    return [request for request in api.requests if request not in api.api_requests()]
+
+
+def test_shown_images_are_left_to_kodi(api, artwork):
+    art = get_art(artwork)
+    assert art['thumb'] == resize(LIST_IMAGE)
+    assert art['fanart'] == resize(COVER_IMAGE)
+
+    artwork.finish(lambda: True)
+    assert cdn_requests(api) == []
+
+
+def test_prefetched_images_are_shown_from_the_store(api, artwork, tmpdir):
+    artwork.prefetch(LIST_IMAGE, COVER_IMAGE)
+    artwork.finish(lambda: True)
+    assert len(cdn_requests(api)) == 2
+
+    art = get_art(artwork)
+    assert art['thumb'].startswith(str(tmpdir))
+    assert art['fanart'].startswith(str(tmpdir))
+
+    api.reset()
+    artwork.prefetch(LIST_IMAGE, COVER_IMAGE)
+    artwork.finish(lambda: True)
+    assert cdn_requests(api) == []
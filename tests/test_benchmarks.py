@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Runs every benchmark script on a small workload, so that changes breaking
+them are caught along with the unit tests.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+BENCHMARKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+
+# Benchmark script and the arguments keeping its run short.
+BENCHMARKS = (
+    ('bench_dates.py', ['--dates', '50', '--rounds', '1']),
+    ('bench_epg.py', ['--rounds', '1']),
+    ('bench_listitems.py', ['20', '0']),
+    ('bench_models.py', ['--items', '20', '--rounds', '1']),
+    ('bench_routes.py', ['--rounds', '1']),
+    ('bench_startup.py', ['--rounds', '1', '--route', 'root']),
+    ('bench_vtt.py', ['0.05']),
+)
+
+
+@pytest.mark.parametrize('script, args', BENCHMARKS, ids=[script for script, _ in BENCHMARKS])
+def test_benchmark_runs(script, args):
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(BENCHMARKS_DIR, script)] + args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    output, errors = process.communicate()
+
+    assert process.returncode == 0, errors
+    assert output.strip()
+    # Threads failing at interpreter shutdown leave the exit status alone.
+    assert 'Traceback' not in errors and 'Exception in thread' not in errors, errors
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import harness
+
+from resources.lib import cache
+from resources.lib.cache import ResponseCache, normalize_url
+
+
+@pytest.fixture
+def path(tmpdir):
+    return str(tmpdir.join('cache.db'))
+
+
+@pytest.fixture(autouse=True)
+def frozen_time(monkeypatch, clock):
+    monkeypatch.setattr(cache, 'time', clock)
+
+
+def test_fresh_entries(path):
+    responses = ResponseCache(path)
+    responses.set('key', {'value': 1}, 60)
+
+    entry = responses.get('key')
+    assert entry.value == {'value': 1}
+    assert not entry.is_stale
+    assert responses.stats() == 'hits=1 stale=0 misses=0'
+
+
+def test_expired_entries_are_served_stale_for_max_stale_seconds(path, clock):
+    responses = ResponseCache(path)
+    responses.set('key', 'value', 60)
+    clock.advance(90)
+
+    assert responses.get('key') is None
+    entry = responses.get('key', max_stale=60)
+    assert entry.value == 'value'
+    assert entry.is_stale
+
+    clock.advance(30)
+    assert responses.get('key', max_stale=60) is None
+    assert responses.stats() == 'hits=0 stale=1 misses=2'
+
+
+def test_set_many_and_delete(path):
+    responses = ResponseCache(path)
+    responses.set_many({'a': 1, 'b': [2]}, 60)
+    responses.delete('a')
+
+    assert responses.get('a') is None
+    assert responses.get('b').value == [2]
+
+
+def test_entries_persist(path):
+    responses = ResponseCache(path)
+    responses.set('key', 'value', 60)
+    responses.close()
+
+    assert ResponseCache(path).get('key').value == 'value'
+
+
+def test_evicts_the_least_recently_used_entries(path, clock):
+    # Each payload is a 100 bytes long JSON string.
+    payload = 'x' * 98
+    responses = ResponseCache(path, max_bytes=250)
+    for key in ('a', 'b', 'c'):
+        responses.set(key, payload, 60)
+        clock.advance(1)
+
+    # Reading 'a' makes 'b' the least recently used one once persisted.
+    assert responses.get('a')
+    clock.advance(1)
+    responses.close()
+
+    responses = ResponseCache(path, max_bytes=250)
+    assert responses.get('b') is None
+    assert responses.get('a') and responses.get('c')
+
+
+def test_evict_returns_the_number_of_dropped_entries(path, clock):
+    responses = ResponseCache(path, max_bytes=250)
+    for key in ('a', 'b', 'c', 'd'):
+        responses.set(key, 'x' * 98, 60)
+        clock.advance(1)
+
+    assert responses.evict() == 2
+    assert responses.evict() == 0
+    assert [key for key in 'abcd' if responses.get(key)] == ['c', 'd']
+
+
+def test_unusable_path_disables_the_cache(tmpdir):
+    blocker = tmpdir.join('file')
+    blocker.write('')
+    responses = ResponseCache(str(blocker.join('cache.db')))
+
+    responses.set('key', 'value', 60)
+    assert responses.get('key') is None
+    assert responses.stats() == 'hits=0 stale=0 misses=1'
+
+
+def test_normalize_url():
+    assert normalize_url('https://GWAPI.zee5.com/path?b=2&languages=te,hi,,hi&a=1') == (
+        'https://gwapi.zee5.com/path?a=1&b=2&languages=hi%2Cte'
+    )
+
+
+SEASON = '?action=season&content_id=0-2-500'
+
+
+def requested_pages(api):
+    return sorted(params['page'] for _, _, params in api.api_requests('/content/season/'))
+
+
+def test_cached_routes_make_no_requests(api):
+    first = [url for url, _, _ in harness.run_plugin(SEASON).items]
+
+    api.reset()
+    assert [url for url, _, _ in harness.run_plugin(SEASON).items] == first
+    assert api.api_requests() == []
+
+
+def test_expired_routes_are_rendered_and_refreshed_afterwards(api, clock):
+    first = [url for url, _, _ in harness.run_plugin(SEASON).items]
+    clock.advance(30 * 60 + 1)
+
+    api.reset()
+    assert [url for url, _, _ in harness.run_plugin(SEASON).items] == first
+    # The stale page is fetched again, and the next one prefetched again.
+    assert requested_pages(api) == ['1', '2']
+
+    api.reset()
+    harness.run_plugin(SEASON)
+    assert api.api_requests() == []
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from resources.lib.catalog import Catalog, fold, get_terms
+from resources.lib.models import Item
+
+
+@pytest.mark.parametrize('variants', [
+    (u'Khushi', u'Kushi', u'khushee', u'KHUSHII'),
+    (u'Bhaag', u'Bhag', u'bag'),
+    (u'Zindagi', u'Jindagi'),
+    (u'Phir', u'fir'),
+    (u'Vivah', u'Wiwah'),
+    (u'Shakti', u'sakti'),
+    (u'Pooja', u'Puja', u'Pujaa'),
+])
+def test_fold_collapses_spelling_variants(variants):
+    assert len(set(tuple(fold(variant)) for variant in variants)) == 1, [fold(variant) for variant in variants]
+
+
+def test_fold_splits_words_and_strips_accents():
+    assert fold(u'Café  Déjà-vu!') == fold(u'cafe deja vu')
+    assert fold('Kumkum Bhagya 2') == [u'kumkum', u'bagya', u'2']
+
+
+def test_fold_keeps_indic_words_whole():
+    # The virama goes with the other combining marks.
+    assert fold(u'कुमकुम भाग्य।') == [u'कुमकुम', u'भागय']
+    assert fold(u'தமிழ்') == [u'தமிழ']
+
+
+def test_fold_leaves_mixed_words_alone():
+    assert fold(u'Dhh2') == [u'dhh2']
+
+
+def test_fold_of_nothing():
+    assert fold(None) == []
+    assert fold(u'') == []
+
+
+def test_get_terms_are_unique_and_in_order():
+    item = Item('0-0-1', u'Kumkum Bhagya')
+    assert get_terms(item, [u'Kumkum', u'Bhagya Kumkum', u'Zee TV']) == u'kumkum bagya ji tv'
+
+
+@pytest.fixture
+def catalog(tmpdir):
+    catalog = Catalog(str(tmpdir.join('catalog.db')))
+    yield catalog
+    catalog.close()
+
+
+def test_search_matches_prefixes_of_folded_words(catalog):
+    catalog.index([('show', Item('0-6-1', u'Kumkum Bhagya')), ('play', Item('0-0-2', u'Khushi'))])
+
+    assert [item.id for _, item in catalog.search(u'kumkum bhag', 10)] == ['0-6-1']
+    assert [item.id for _, item in catalog.search(u'bhaagya', 10)] == ['0-6-1']
+    assert [(action, item.title) for action, item in catalog.search(u'kushee', 10)] == [('play', u'Khushi')]
+    assert catalog.search(u'unknown', 10) == []
+    assert catalog.search(u'  ', 10) == []
+
+
+def test_search_ranks_title_prefixes_first(catalog):
+    catalog.index([('play', Item('0-0-1', u'The Gold Rush')), ('play', Item('0-0-2', u'Gold'))])
+    assert [item.id for _, item in catalog.search(u'gold', 10)] == ['0-0-2', '0-0-1']
+
+
+def test_search_in_indic_scripts(catalog):
+    catalog.index([('show', Item('0-6-1', u'कुमकुम भाग्य')), ('show', Item('0-6-2', u'कुंडली भाग्य'))])
+    assert [item.id for _, item in catalog.search(u'कुमकु', 10)] == ['0-6-1']
+    assert sorted(item.id for _, item in catalog.search(u'भाग्य', 10)) == ['0-6-1', '0-6-2']
+
+
+def test_search_finds_items_by_keywords(catalog):
+    item = Item('0-0-1', u'Episode 1')
+    catalog.index([('play', item)], {'0-0-1': [u'Kahani']})
+    assert [found.id for _, found in catalog.search(u'kahani', 10)] == ['0-0-1']
+
+
+def test_reindexing_without_keywords_keeps_the_terms(catalog, monkeypatch):
+    from resources.lib import catalog as catalog_module
+
+    catalog.index([('play', Item('0-0-1', u'Episode 1'))], {'0-0-1': [u'Kahani']})
+    monkeypatch.setattr(catalog_module, 'REINDEX_AFTER', -1)
+    catalog.index([('play', Item('0-0-1', u'Episode 1', description=u'Updated'))])
+
+    [(_, item)] = catalog.search(u'kahani', 10)
+    assert item.description == u'Updated'
+
+
+def test_close_keeps_the_most_recently_indexed_items(tmpdir):
+    path = str(tmpdir.join('catalog.db'))
+    catalog = Catalog(path, max_items=2)
+    for index in range(4):
+        catalog.index([('play', Item('0-0-{}'.format(index), u'Title {}'.format(index)))])
+    catalog.close()
+
+    catalog = Catalog(path)
+    assert sorted(item.id for _, item in catalog.search(u'title', 10)) == ['0-0-2', '0-0-3']
+    catalog.close()
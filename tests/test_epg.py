@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import calendar
+import time
+
+from resources.lib import epg
+from resources.lib.epg import Guide, Schedule
+
+DAY = calendar.timegm((2019, 1, 10, 0, 0, 0))
+HOUR = 60 * 60
+
+
+def iso(timestamp):
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+
+def programme(start_hour, end_hour, title):
+    return {'start_time': iso(at(start_hour)), 'end_time': iso(at(end_hour)), 'title': title}
+
+
+def at(hour):
+    return DAY + hour * HOUR
+
+
+def test_parse_time():
+    assert epg.parse_time('2019-01-10T05:30:00Z') == at(5.5)
+    assert epg.parse_time('2019-01-10T05:30:00') == at(5.5)
+    assert epg.parse_time('2019-01-10T11:00:00+05:30') == at(5.5)
+    assert epg.parse_time('2019-01-10T00:00:00.250-01:00') == at(1)
+    for value in (None, '', '2019-01-10', '2019-01-10 05:30:00', '2019-13-10T05:30:00', '2019-01-10Txx:30:00'):
+        assert epg.parse_time(value) is None
+
+
+def test_windows():
+    assert epg.get_window(at(23.5)) == DAY
+    assert epg.get_windows(at(12), 4 * HOUR) == [DAY]
+    assert epg.get_windows(at(22.5), 4 * HOUR) == [DAY, DAY + epg.DAY]
+
+
+def test_schedule_parse_sorts_and_skips_invalid_programmes():
+    schedule = Schedule.parse([
+        programme(2, 3, 'Late'),
+        programme(0, 1, 'Early'),
+        {'start_time': 'soon', 'end_time': iso(at(2)), 'title': 'Broken'},
+        programme(1, 1, 'Empty'),
+    ])
+    assert schedule.titles == ['Early', 'Late']
+
+
+def test_now_next():
+    schedule = Schedule.parse([programme(0, 1, 'A'), programme(1, 2, 'B'), programme(3, 4, 'C')])
+
+    assert schedule.now_next(at(0.5)) == ((at(0), at(1), 'A'), (at(1), at(2), 'B'))
+    # Programmes end exclusively.
+    assert schedule.now_next(at(1)) == ((at(1), at(2), 'B'), (at(3), at(4), 'C'))
+    # Nothing airs in a gap, the next one is still known.
+    assert schedule.now_next(at(2.5)) == (None, (at(3), at(4), 'C'))
+    assert schedule.now_next(at(-1)) == (None, (at(0), at(1), 'A'))
+    assert schedule.now_next(at(3.5)) == ((at(3), at(4), 'C'), None)
+    assert schedule.now_next(at(4)) == (None, None)
+    assert Schedule().now_next(at(0)) == (None, None)
+
+
+def test_schedule_round_trips_through_json():
+    schedule = Schedule.parse([programme(0, 1, 'A'), programme(1, 2, 'B')])
+    assert Schedule.from_json(schedule.to_json()).now_next(at(0.5)) == schedule.now_next(at(0.5))
+
+
+def test_guide_stitches_windows_dropping_repeated_programmes():
+    today = epg.parse_window({'items': [
+        {'id': 'ch1', 'items': [programme(22, 23, 'News'), programme(23, 25, 'Movie')]},
+        {'id': 'ch2', 'items': [programme(0, 24, 'All day')]},
+        {'items': [programme(0, 1, 'No channel id')]},
+    ]})
+    tomorrow = epg.parse_window({'items': [
+        {'id': 'ch1', 'items': [programme(23, 25, 'Movie'), programme(25, 26, 'Morning')]},
+    ]})
+    guide = Guide([today, tomorrow])
+
+    assert sorted(today) == ['ch1', 'ch2']
+    assert guide.get_schedule('ch1').titles == ['News', 'Movie', 'Morning']
+    assert guide.now_next('ch1', at(24.5)) == ((at(23), at(25), 'Movie'), (at(25), at(26), 'Morning'))
+    assert guide.now_next('ch2', at(23.5)) == ((at(0), at(24), 'All day'), None)
+    assert guide.now_next('unknown', at(1)) == (None, None)
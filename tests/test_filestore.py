@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+
+from resources.lib.filestore import PARTIAL_SUFFIX, FileStore
+
+
+def put(store, key, accessed, size=10):
+    path = store.path(key, '.srt')
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    os.utime(path, (accessed, time.time() - 3600))
+    return path
+
+
+def test_get_finds_stored_files(tmpdir):
+    store = FileStore(str(tmpdir.join('store')), 100)
+    assert store.get(u'0-1-700', '.srt') is None
+
+    store.ensure_directory()
+    store.ensure_directory()
+    path = put(store, u'0-1-700', time.time())
+    assert store.get(u'0-1-700', '.srt') == path
+    assert store.get(u'0-1-700', '.vtt') is None
+
+
+def test_evict_drops_the_least_recently_read_files(tmpdir):
+    store = FileStore(str(tmpdir), 25)
+    now = time.time()
+    read_last = put(store, 'a', now)
+    read_first = put(store, 'b', now - 300)
+    read_second = put(store, 'c', now - 200)
+
+    assert store.evict() == 1
+    assert not os.path.exists(read_first)
+    assert os.path.exists(read_second) and os.path.exists(read_last)
+
+
+def test_evict_removes_abandoned_partial_files(tmpdir):
+    store = FileStore(str(tmpdir), 100)
+    old = tmpdir.join('old' + PARTIAL_SUFFIX)
+    old.write('x')
+    os.utime(str(old), (time.time() - 7200, time.time() - 7200))
+    tmpdir.join('young' + PARTIAL_SUFFIX).write('x')
+
+    assert store.evict() == 1
+    assert sorted(os.listdir(str(tmpdir))) == ['young' + PARTIAL_SUFFIX]
+
+
+def test_evict_without_a_directory(tmpdir):
+    assert FileStore(str(tmpdir.join('missing')), 100).evict() == 0
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import harness
+
+SEASON = '?action=season&content_id=0-2-500'
+NEXT_PAGE = '| Next Page >>>'
+
+
+def episodes(xbmcplugin):
+    return [url for url, _, is_folder in xbmcplugin.items if not is_folder]
+
+
+def next_page(xbmcplugin):
+    return next((url for url, list_item, _ in xbmcplugin.items if list_item.getLabel() == NEXT_PAGE), None)
+
+
+def test_page_size_setting(api, configure):
+    configure(page_size=50)
+
+    xbmcplugin = harness.run_plugin(SEASON)
+    assert len(episodes(xbmcplugin)) == 50
+    assert 'page_number=2' in next_page(xbmcplugin)
+    assert [params['limit'] for _, _, params in api.api_requests('/content/season/')] == ['50', '50']
+
+    xbmcplugin = harness.run_plugin(SEASON + '&page_number=3')
+    assert len(episodes(xbmcplugin)) == 20
+    assert next_page(xbmcplugin) is None
+
+
+def test_load_all_stops_at_the_item_cap(api, configure):
+    configure(load_all=True, load_all_max_items=100)
+
+    xbmcplugin = harness.run_plugin(SEASON)
+    assert len(episodes(xbmcplugin)) == len(set(episodes(xbmcplugin))) == 100
+    # The rest stays behind the Next Page item.
+    assert 'page_number=5' in next_page(xbmcplugin)
+
+
+def test_load_all_lists_the_whole_season(api, configure):
+    configure(load_all=True)
+
+    xbmcplugin = harness.run_plugin(SEASON)
+    assert len(episodes(xbmcplugin)) == 120
+    assert next_page(xbmcplugin) is None
+    requested = sorted(int(params['page']) for _, _, params in api.api_requests('/content/season/'))
+    assert requested == [1, 2, 3, 4, 5]
+
+
+def test_folders_are_handed_over_in_one_call(api):
+    for query in ('', SEASON, '?action=manual&content_id=0-8-manualcol_1'):
+        xbmcplugin = harness.run_plugin(query)
+        names = [name for name, _ in xbmcplugin.calls]
+        assert names.count('addDirectoryItems') == 1
+        assert 'addDirectoryItem' not in names
+        assert names.index('addDirectoryItems') < names.index('endOfDirectory')
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import logging
+
+import pytest
+import xbmc
+
+from resources.lib import kodilogging, settings
+from resources.lib.plugin import LOGGERS
+
+
+@pytest.fixture(autouse=True)
+def loggers():
+    yield LOGGERS
+    # Back to the default settings by now.
+    kodilogging.config(*LOGGERS)
+
+
+@pytest.fixture
+def logs():
+    del xbmc.logs[:]
+    yield xbmc.logs
+    del xbmc.logs[:]
+
+
+@pytest.fixture
+def snapshots(monkeypatch):
+    """
+    Counts the settings lookups.
+    """
+    calls = []
+    snapshot = settings.snapshot
+
+    def counted():
+        calls.append(True)
+        return snapshot()
+
+    monkeypatch.setattr(settings, 'snapshot', counted)
+    return calls
+
+
+def test_records_cost_nothing_while_debug_logs_are_off(logs, snapshots):
+    kodilogging.config(*LOGGERS)
+    del snapshots[:]
+
+    for index in range(100):
+        LOGGERS[0].debug('Record %s', index)
+        logging.getLogger('resources.lib.cache').info('Record %s', index)
+    assert snapshots == []
+    assert logs == []
+
+
+def test_debug_logs_go_to_kodi(logs, configure):
+    configure(debug=True)
+    kodilogging.config(*LOGGERS)
+
+    logging.getLogger('resources.lib.cache').info('Cached %s', 'it')
+    LOGGERS[0].warning('Careful')
+    assert logs == [
+        (xbmc.LOGNOTICE, 'resources.lib.cache: Cached it'),
+        (xbmc.LOGWARNING, 'plugin.video.youngkbell.zee5: Careful'),
+    ]
+
+
+def test_buffered_logs_are_written_on_flush_or_error(logs, configure):
+    configure(debug=True, log_buffered=True)
+    kodilogging.config(*LOGGERS)
+
+    LOGGERS[0].debug('First')
+    assert logs == []
+    LOGGERS[0].error('Failed')
+    assert [message for _, message in logs] == ['plugin.video.youngkbell.zee5: First',
+                                               'plugin.video.youngkbell.zee5: Failed']
+
+    LOGGERS[0].debug('Last')
+    kodilogging.flush(*LOGGERS)
+    assert logs[-1] == (xbmc.LOGDEBUG, 'plugin.video.youngkbell.zee5: Last')
+
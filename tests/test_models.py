@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from resources.lib import models
+from resources.lib.models import Item, get_keywords, parse_date, parse_items
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2019-01-10', (2019, '10.01.2019')),
+    ('2019-01-10T05:30:00', (2019, '10.01.2019')),
+    ('2019-01-10 05:30:00', (2019, '10.01.2019')),
+    ('2020-02-29', (2020, '29.02.2020')),
+    ('2000-02-29', (2000, '29.02.2000')),
+    ('2019-12-31T23:59:59Z', (2019, '31.12.2019')),
+])
+def test_parse_date(value, expected):
+    assert parse_date(value) == expected
+
+
+@pytest.mark.parametrize('value', [
+    '', '2019', '2019-1-10', '2019-13-01', '2019-00-10', '2019-01-32', '2019-04-31',
+    '2019-02-29', '1900-02-29', '2019/01/10', '2019-01-10X', 'abcd-ef-gh',
+])
+def test_parse_date_of_malformed_dates(value):
+    assert parse_date(value) == (None, None)
+
+
+def test_parse_date_keeps_a_bounded_memo(monkeypatch):
+    monkeypatch.setattr(models, 'MAX_CACHED_DATES', 2)
+    monkeypatch.setattr(models, '_dates', {})
+
+    for day in range(1, 6):
+        assert parse_date('2019-01-0{}'.format(day)) == (2019, '0{}.01.2019'.format(day))
+        assert len(models._dates) <= 2
+
+
+EPISODE = {
+    'id': '0-1-1',
+    'title': 'Episode 1',
+    'original_title': 'Kahani Episode 1',
+    'asset_subtype': 'episode',
+    'description': 'The first one',
+    'genre': [{'id': 'Drama', 'value': 'Drama'}],
+    'image_url': {'list': 'https://img/list.jpg', 'cover': 'https://img/cover.jpg'},
+    'duration': 1320,
+    'episode_number': 1,
+    'release_date': '2019-01-10T00:00:00',
+    'tags': ['Kahani', ''],
+    'countries': ['IN'],
+}
+
+
+def test_item_round_trips_through_json():
+    item = Item.parse(EPISODE)
+    copy = Item.from_json(item.to_json())
+
+    assert copy.to_json() == item.to_json()
+    assert (copy.id, copy.title, copy.subtype, copy.genre) == ('0-1-1', 'Episode 1', 'episode', 'Drama')
+    assert (copy.list_image, copy.cover_image) == ('https://img/list.jpg', 'https://img/cover.jpg')
+
+
+def test_get_keywords():
+    assert get_keywords(EPISODE) == ['Kahani Episode 1', 'Kahani']
+    assert get_keywords({'title': 'Same', 'original_title': 'Same'}) == []
+
+
+def test_parse_items_collects_keywords():
+    keywords = {}
+    items = parse_items([EPISODE, dict(EPISODE, id='0-1-2', tags=None)], keywords)
+
+    assert [item.id for item in items] == ['0-1-1', '0-1-2']
+    assert keywords == {'0-1-1': ['Kahani Episode 1', 'Kahani'], '0-1-2': ['Kahani Episode 1']}
+
+
+def test_images_and_genres():
+    assert models.get_images({'image_url': 'https://img/one.jpg'}) == ('https://img/one.jpg',) * 2
+    assert models.get_images({}) == (None, None)
+    assert models.get_genre({}) == 'ALL'
+    assert set(models.get_genre({
+        'genre': [{'value': 'Drama'}], 'genres': [{'value': 'Drama'}, {'value': 'Comedy'}],
+    }).split(',')) == {'Drama', 'Comedy'}
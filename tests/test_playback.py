@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+
+import pytest
+import xbmc
+
+import harness
+from resources.lib import kodiutils
+
+PLAY = '?action=play&content_id=0-0-1000'
+SUBTITLES_HOST = 'zee5vod.akamaized.net'
+
+
+@pytest.fixture(autouse=True)
+def player():
+    # The late subtitles go to the player once the video plays.
+    xbmc.Player.playing = True
+    del xbmc.Player.subtitles[:]
+    yield xbmc.Player
+    xbmc.Player.playing = False
+
+
+def subtitle_requests(api):
+    return sorted(path for host, path, _ in api.requests if host == SUBTITLES_HOST)
+
+
+def resolved(xbmcplugin):
+    return [args for name, args in xbmcplugin.calls if name == 'setResolvedUrl']
+
+
+def subtitle_languages(xbmcplugin, player):
+    """
+    Returns the languages of the subtitles handed over with the video, or
+    to the player once it started.
+    """
+    files = resolved(xbmcplugin)[0][2].subtitles + player.subtitles
+    return sorted(name.rsplit('.', 2)[1] for name in files)
+
+
+def test_subtitles_download_in_parallel(api, player):
+    api.latency = 0.5
+
+    started = time.time()
+    xbmcplugin = harness.run_plugin(PLAY)
+
+    assert len(resolved(xbmcplugin)) == 1
+    assert [path.rsplit('-', 1)[1] for path in subtitle_requests(api)] == ['en.vtt', 'hi.vtt', 'ta.vtt']
+    # The platform token, the details, then the video token along with all
+    # of the subtitles; one after the other would take six round trips.
+    assert time.time() - started < 4.5 * api.latency
+    assert subtitle_languages(xbmcplugin, player) == ['en', 'hi', 'ta']
+
+
+def test_failed_subtitles_leave_the_others(api, player):
+    api.failures[(SUBTITLES_HOST, '/drm1/PRIORITY1080/FIXTURE/fixturemovie.mp4/manifest-hi')] = 404
+
+    xbmcplugin = harness.run_plugin(PLAY)
+    assert resolved(xbmcplugin)[0][1] is True
+    assert subtitle_languages(xbmcplugin, player) == ['en', 'ta']
+
+
+def test_replayed_videos_take_the_subtitles_from_the_store(api, player):
+    harness.run_plugin(PLAY)
+    stored = sorted(os.listdir(kodiutils.SUBTITLES_DIR))
+    assert len(stored) == 3
+
+    # Other routes leave the store alone.
+    harness.run_plugin('?action=season&content_id=0-2-500')
+    assert sorted(os.listdir(kodiutils.SUBTITLES_DIR)) == stored
+
+    api.reset()
+    del player.subtitles[:]
+    xbmcplugin = harness.run_plugin(PLAY)
+    assert subtitle_requests(api) == []
+    assert [os.path.basename(name) for name in resolved(xbmcplugin)[0][2].subtitles] == stored
+
+
+def test_replayed_videos_resolve_from_the_cache(api):
+    first = resolved(harness.run_plugin(PLAY))[0][2].path
+
+    api.reset()
+    assert resolved(harness.run_plugin(PLAY))[0][2].path == first
+    assert api.api_requests() == []
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import harness
+from resources.lib import kodiutils, plugin
+from resources.lib.plugin import Zee5Plugin
+
+SEASON = '?action=season&content_id=0-2-500'
+COLLECTION_PATH = '/content/collection/'
+
+
+def test_next_season_page_is_prefetched(api):
+    harness.run_plugin(SEASON)
+
+    api.reset()
+    harness.run_plugin(SEASON + '&page_number=2')
+    # Only page 3 is fetched, in turn prefetched after rendering page 2.
+    assert [params['page'] for _, _, params in api.api_requests()] == ['3']
+
+
+def test_cancelled_prefetch_stops_its_requests(api):
+    prefetcher = Zee5Plugin([harness.PLUGIN_URL, '1', ''])
+    prefetcher.token  # Fetched before the network slows down.
+    api.latency = 1
+    api.reset()
+
+    # The user opens another folder while the shards are being fetched.
+    threading.Timer(0.3, kodiutils.claim_foreground).start()
+    started = time.time()
+    prefetcher._prefetch('manual', '0-8-manualcol_1', 2)
+
+    assert time.time() - started < 0.3 + plugin.PREFETCH_POLL_INTERVAL + 0.2
+    # Only the requests already in flight get answered.
+    time.sleep(api.latency * 2.5)
+    assert len(api.api_requests(COLLECTION_PATH)) == plugin.SHARD_WORKERS
+    prefetcher.finish()
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import re
+
+import harness
+from resources.lib import plugin, settings
+
+
+def collections(xbmcplugin):
+    return [(url, list_item) for url, list_item, _ in xbmcplugin.items if 'action=collection' in url]
+
+
+def test_collections_show_a_preview(api):
+    items = collections(harness.run_plugin())
+    assert len(items) == 7
+    for _, list_item in items:
+        assert re.match(r'\d+ rails: ', list_item.info['plot'])
+        assert list_item.art['thumb'].startswith('https://akamaividz')
+
+
+def test_late_collections_are_listed_without_preview_and_cached(api, configure, monkeypatch):
+    configure(**dict((lang, lang == 'hi') for lang in settings.LANGUAGES))
+    monkeypatch.setattr(plugin, 'ROOT_DEADLINE', 0.2)
+    api.latency = 0.5
+
+    items = collections(harness.run_plugin())
+    assert [list_item.info['plot'] for _, list_item in items] == [list_item.getLabel() for _, list_item in items]
+    assert all(not list_item.art for _, list_item in items)
+
+    api.reset()
+    for url, _ in items:
+        harness.run_plugin(url[len(harness.PLUGIN_URL):])
+    assert api.api_requests() == []
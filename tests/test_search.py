@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import time
+
+import xbmcgui
+
+import harness
+from resources.lib import plugin
+
+SEARCH_PATH = '/content/getContent/autoSuggest'
+
+
+def search(query):
+    del xbmcgui.notifications[:]
+    return harness.run_plugin('?action=search&query={}'.format(query))
+
+
+def listed(xbmcplugin):
+    return [list_item.getLabel() for _, list_item, _ in xbmcplugin.items]
+
+
+def ended(xbmcplugin):
+    return [args[1] for name, args in xbmcplugin.calls if name == 'endOfDirectory']
+
+
+def test_search_lists_the_remote_results(api):
+    xbmcplugin = search('fixture')
+
+    assert len(api.api_requests(SEARCH_PATH)) == 1
+    assert listed(xbmcplugin)
+    assert ended(xbmcplugin) == [True]
+
+
+def test_slow_remote_results_leave_the_catalog_hits(api):
+    harness.run_plugin('?action=manual&content_id=0-8-manualcol_1')
+    api.latency = 1
+
+    started = time.time()
+    xbmcplugin = search('fixture movie 0')
+
+    assert listed(xbmcplugin)[0] == 'Fixture Movie 0'
+    assert ended(xbmcplugin) == [True]
+    # The remote results still came in, for the next time.
+    assert time.time() - started >= api.latency
+    api.latency = 0
+    api.reset()
+    search('fixture movie 0')
+    assert api.api_requests(SEARCH_PATH) == []
+
+
+def test_search_timeout_ends_the_directory(api, monkeypatch):
+    monkeypatch.setattr(plugin, 'SEARCH_REMOTE_TIMEOUT', 0.2)
+    api.latency = 1
+
+    xbmcplugin = search('nothing local')
+
+    assert listed(xbmcplugin) == []
+    assert ended(xbmcplugin) == [False]
+    assert [heading for heading, _ in xbmcgui.notifications] == ['No Search Results']
+
+
+def test_search_failure_ends_the_directory(api):
+    api.failures[('gwapi.zee5.com', SEARCH_PATH)] = 404
+
+    xbmcplugin = search('nothing local')
+
+    assert ended(xbmcplugin) == [False]
+    assert [heading for heading, _ in xbmcgui.notifications] == ['No Search Results']
+
+
+def history():
+    return listed(harness.run_plugin('?action=search'))
+
+
+def test_history_lists_the_most_recent_queries_first(api):
+    for query in ('kahani', 'fixture movie', 'Fixture%20%20Movie'):
+        search(query)
+
+    assert history() == ['| New Search', 'Fixture  Movie', 'kahani']
+
+
+def test_repeated_queries_are_served_from_the_cache(api):
+    search('kahani')
+    api.reset()
+
+    assert listed(search('KAHANI'))
+    assert api.api_requests() == []
+
+
+def test_history_drops_the_least_recently_used_queries(api, monkeypatch):
+    monkeypatch.setattr(plugin, 'SEARCH_HISTORY_SIZE', 2)
+    for query in ('first', 'second', 'third', 'second'):
+        search(query)
+    assert history() == ['| New Search', 'second', 'third']
+
+    # The results of the dropped query went with it.
+    api.reset()
+    search('third')
+    assert api.api_requests() == []
+    search('first')
+    assert len(api.api_requests(SEARCH_PATH)) == 1
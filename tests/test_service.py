@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import pytest
+import requests
+
+import harness
+from resources.lib import service
+from resources.lib.plugin import Zee5Plugin
+from resources.lib.workers import TaskTimeout
+
+
+@pytest.fixture
+def warmer(api, configure):
+    configure(service=True)
+    return service.Warmer()
+
+
+def test_warmed_root_makes_no_requests(api, warmer):
+    assert warmer.step() == 30 * 60
+
+    api.reset()
+    harness.run_plugin()
+    assert api.api_requests() == []
+
+
+def test_warm_keeps_the_deferred_tasks(api):
+    plugin = Zee5Plugin([harness.PLUGIN_URL, '-1', '?action=warm'], foreground=False)
+    ran = []
+    plugin.deferred.append(lambda: ran.append(True))
+
+    assert plugin.warm(horizon=60)
+    plugin.finish()
+    assert ran == [True]
+
+
+@pytest.mark.parametrize('error', [TaskTimeout('late'), requests.ConnectionError('down')])
+def test_failed_rounds_back_off(warmer, monkeypatch, error):
+    def warm(plugin, horizon):
+        raise error
+
+    monkeypatch.setattr(Zee5Plugin, 'warm', warm)
+    assert [warmer.step() for _ in range(3)] == [30 * 60, 60 * 60, 120 * 60]
+    assert warmer.failures == 3
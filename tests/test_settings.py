@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+import xbmcaddon
+
+import harness
+from resources.lib import settings
+
+
+@pytest.fixture
+def kodi_reads(monkeypatch):
+    """
+    Records the settings asked from Kodi.
+    """
+    reads = []
+    get_setting = xbmcaddon.Addon.getSetting
+
+    def counted(addon, key):
+        reads.append(key)
+        return get_setting(addon, key)
+
+    monkeypatch.setattr(xbmcaddon.Addon, 'getSetting', counted)
+    return reads
+
+
+@pytest.fixture
+def user_file():
+    settings.invalidate()
+    yield settings.USER_FILE
+    xbmcaddon.reset_settings()
+    settings.invalidate()
+
+
+def touch(path, seconds):
+    mtime = os.stat(path).st_mtime + seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_routes_ask_kodi_for_no_setting(api, kodi_reads):
+    settings.invalidate()
+    harness.run_plugin('?action=season&content_id=0-2-500')
+    assert kodi_reads == []
+
+
+def test_the_snapshot_is_kept_until_the_file_changes(user_file):
+    first = settings.snapshot()
+    assert settings.snapshot() is first
+    assert settings.get_page_size() == 25
+
+    xbmcaddon.settings['page_size'] = '50'
+    xbmcaddon.save_settings()
+    touch(user_file, 1)
+    assert settings.snapshot() is not first
+    assert settings.get_page_size() == 50
+
+
+def test_settings_of_older_kodi_versions(user_file):
+    with open(user_file, 'w') as f:
+        f.write('<settings><setting id="page_size" value="100" /><setting id="hi" value="false" /></settings>')
+    touch(user_file, 1)
+
+    assert settings.get_page_size() == 100
+    assert 'hi' not in settings.get_languages().split(',')
+    # Settings left out keep their defaults.
+    assert settings.get_load_all_max_items() == 500
+
+
+def test_unreadable_files_fall_back_to_kodi(user_file, kodi_reads):
+    with open(user_file, 'w') as f:
+        f.write('<settings><setting')
+    touch(user_file, 1)
+
+    assert settings.get_page_size() == 25
+    assert len(kodi_reads) == len(set(kodi_reads)) == len(settings.read_ids(settings.DEFINITION_FILE))
+    settings.is_debug()
+    assert len(kodi_reads) == len(set(kodi_reads))
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+from itertools import islice
+
+import harness
+from resources.lib import settings
+from resources.lib.plugin import Zee5Plugin, merge_shards
+
+MANUAL = '?action=manual&content_id=0-8-manualcol_1'
+COLLECTION_PATH = '/content/collection/'
+
+
+def ids(values):
+    return [value['id'] for value in values]
+
+
+def listed(xbmcplugin):
+    return [list_item.getLabel() for _, list_item, _ in xbmcplugin.items]
+
+
+def test_merge_shards_orders_by_orderid():
+    merged = merge_shards([
+        [{'id': 'h0', 'orderid': 0}, {'id': 'h3', 'orderid': 3}],
+        [{'id': 't1', 'orderid': 1}, {'id': 't2', 'orderid': 2}, {'id': 't4', 'orderid': 4}],
+    ])
+    assert ids(merged) == ['h0', 't1', 't2', 'h3', 't4']
+
+
+def test_merge_shards_falls_back_to_the_position_in_the_shard():
+    merged = merge_shards([[{'id': 'a'}, {'id': 'b'}], [{'id': 'x'}, {'id': 'y'}]])
+    assert ids(merged) == ['a', 'x', 'b', 'y']
+
+
+def test_merge_shards_keeps_the_first_of_repeated_ids():
+    first = {'id': 'both', 'orderid': 1, 'shard': 'hi'}
+    merged = list(merge_shards([
+        [{'id': 'h0', 'orderid': 0}, first],
+        [{'id': 'both', 'orderid': 1, 'shard': 'ta'}, {'id': 't2', 'orderid': 2}],
+    ]))
+    assert ids(merged) == ['h0', 'both', 't2']
+    assert merged[1] is first
+
+
+def test_merge_shards_reads_the_shards_lazily():
+    pulled = []
+
+    def shard(name, count):
+        for index in range(count):
+            pulled.append(name)
+            yield {'id': '{}{}'.format(name, index), 'orderid': index * 2 + (name == 't')}
+
+    assert ids(islice(merge_shards([shard('h', 100), shard('t', 100)]), 4)) == ['h0', 't0', 'h1', 't1']
+    assert len(pulled) <= 6
+
+
+def test_merge_shards_of_nothing():
+    assert list(merge_shards([])) == []
+    assert list(merge_shards([[], []])) == []
+
+
+def get_page(page_number, action='manual', content_id='0-8-manualcol_1'):
+    plugin = Zee5Plugin([harness.PLUGIN_URL, '1', ''], foreground=False)
+    try:
+        return plugin.get_page(action, content_id, page_number)
+    finally:
+        plugin.finish()
+
+
+def page_items(data):
+    return data['buckets'][0]['items']
+
+
+def test_merged_pages_hold_the_page_size(api):
+    languages = settings.get_languages().split(',')
+
+    # The fixture lists 75 items in 8 of the languages.
+    first = get_page(1)
+    assert len(api.api_requests(COLLECTION_PATH)) == len(languages)
+    assert (first['page'], first['limit'], first['total']) == (1, 25, 75)
+    assert [item['orderid'] for item in page_items(first)] == list(range(25))
+
+    last = get_page(3)
+    assert (last['page'], last['total']) == (3, 75)
+    assert [item['orderid'] for item in page_items(last)] == list(range(50, 75))
+    assert len(api.api_requests(COLLECTION_PATH)) == len(languages)
+
+
+def test_merged_pages_drop_repeated_items(api):
+    data = get_page(1, action='collection', content_id='0-8-homepage')
+    rails = ids(data['buckets'])
+    assert len(rails) == len(set(rails)) == 25
+
+
+def test_manual_folder_pages(api):
+    xbmcplugin = harness.run_plugin(MANUAL)
+    assert listed(xbmcplugin)[-2:] == ['| Next Page >>>', '| Search']
+    assert 'page_number=2' in xbmcplugin.items[-2][0]
+
+    # Page 2 was prefetched from the shards already there.
+    api.reset()
+    harness.run_plugin(MANUAL + '&page_number=2')
+    assert api.api_requests() == []
+
+    xbmcplugin = harness.run_plugin(MANUAL + '&page_number=3')
+    assert '| Next Page >>>' not in listed(xbmcplugin)
+
+
+def test_toggling_a_language_reuses_the_other_shards(api, configure):
+    configure(ta=False)
+    harness.run_plugin(MANUAL)
+    api.reset()
+
+    configure(ta=True)
+    harness.run_plugin(MANUAL)
+    requests = api.api_requests(COLLECTION_PATH)
+    assert [params['languages'] for _, _, params in requests] == ['ta']
+
+
+def test_single_language_listings_are_not_sharded(api, configure):
+    configure(**dict((lang, lang == 'hi') for lang in settings.LANGUAGES))
+    data = get_page(1)
+
+    requests = api.api_requests(COLLECTION_PATH)
+    assert [params['languages'] for _, _, params in requests] == ['hi']
+    assert data['total'] == len(page_items(data)) == 12
+
+
+def test_collections_open_from_the_cache_after_the_root(api):
+    xbmcplugin = harness.run_plugin()
+    collection_urls = [url for url, _, _ in xbmcplugin.items if 'action=collection' in url]
+    assert collection_urls
+
+    api.reset()
+    for url in collection_urls:
+        harness.run_plugin(url[len(harness.PLUGIN_URL):])
+    assert api.api_requests() == []
+
+
+def test_load_all_cuts_the_merged_listing_at_the_cap(api, configure):
+    configure(load_all=True, load_all_max_items=50)
+    plugin = Zee5Plugin([harness.PLUGIN_URL, '1', ''], foreground=False)
+    data = plugin.get_listing('manual', '0-8-manualcol_1', 1)
+    plugin.finish()
+
+    assert [item['orderid'] for item in page_items(data)] == list(range(50))
+    # The Next Page item leads to page 3.
+    assert (data['page'], data['limit'], data['total']) == (2, 25, 75)
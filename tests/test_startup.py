@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Checks what the plugin entry point loads, in a fresh interpreter the way
+Kodi starts it.
+"""
+import json
+import subprocess
+import sys
+
+import harness
+
+# Modules only the routes needing them load.
+LAZY_MODULES = ('requests', 'resources.lib.artwork', 'resources.lib.catalog', 'resources.lib.epg', 'resources.lib.vtt')
+
+CHILD = '''
+import json, sys
+sys.path.insert(0, {tests_dir!r})
+import harness
+harness.install_stubs()
+from resources.lib import plugin
+print(json.dumps([name for name in {modules!r} if sys.modules.get(name)]))
+'''
+
+
+def test_plugin_import_leaves_the_route_modules_alone():
+    code = CHILD.format(tests_dir=harness.TESTS_DIR, modules=LAZY_MODULES)
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=harness.ROOT_DIR)
+    assert json.loads(output) == []
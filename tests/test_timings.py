@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+
+import harness
+from resources.lib import kodiutils
+
+SEASON = '?action=season&content_id=0-2-500'
+
+
+def test_timings_are_off_by_default(api):
+    harness.run_plugin(SEASON)
+    assert not os.path.exists(kodiutils.TIMINGS_FILE)
+    assert not os.path.exists(kodiutils.PROFILES_DIR)
+
+
+def test_timings_of_a_route(api, configure):
+    configure(timings=True)
+    harness.run_plugin(SEASON)
+    harness.run_plugin(SEASON)
+
+    with open(kodiutils.TIMINGS_FILE) as f:
+        cold, warm = json.load(f)
+    assert cold['label'] == warm['label'] == 'season'
+    assert {'route', 'items', 'end_of_directory', 'deferred'} <= set(cold['phases'])
+    assert [request['status'] for request in cold['requests']] == [200, 200, 200]
+    assert '/content/season/0-2-500' in cold['requests'][1]['url']
+    assert cold['requests'][1]['ttfb'] >= 0
+    # Served from the cache.
+    assert warm['requests'] == []
+
+
+def test_profiling_dumps_one_file_per_invocation(api, configure):
+    configure(profiling=True)
+    harness.run_plugin(SEASON)
+
+    assert [name.rsplit('-', 1)[1] for name in os.listdir(kodiutils.PROFILES_DIR)] == ['season.prof']
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import base64
+import json
+
+import pytest
+
+import harness
+
+from resources.lib import tokens
+from resources.lib.tokens import get_expiry
+
+
+def make_jwt(payload):
+    def encode(value):
+        return base64.urlsafe_b64encode(json.dumps(value)).rstrip('=')
+    return '{}.{}.signature'.format(encode({'alg': 'HS256'}), encode(payload))
+
+
+@pytest.fixture(autouse=True)
+def frozen_time(monkeypatch, clock):
+    monkeypatch.setattr(tokens, 'time', clock)
+
+
+def test_jwt_expiry():
+    assert get_expiry(make_jwt({'exp': 1550003600, 'user': 'x'}), 60) == 1550003600.0
+    assert get_expiry(make_jwt({'exp': 1550003600.5}).decode('ascii'), 60) == 1550003600.5
+
+
+def test_akamai_token_expiry():
+    assert get_expiry('?hdnea=st=1550000000~exp=1550003600~acl=/*~hmac=abc', 60) == 1550003600.0
+
+
+@pytest.mark.parametrize('token', [
+    None,
+    '',
+    'opaque-token',
+    make_jwt({'sub': 'no expiry'}),
+    make_jwt({'exp': 'tomorrow'}),
+    'header.not base64!.signature',
+])
+def test_falls_back_to_the_default_ttl(token, clock):
+    assert get_expiry(token, 60) == clock.now + 60
+
+
+SEASON = '?action=season&content_id=0-2-500'
+TOKEN_PATH = '/token/platform_tokens.php'
+
+
+def test_the_token_is_reused_by_later_invocations(api):
+    harness.run_plugin(SEASON)
+    assert len(api.api_requests(TOKEN_PATH)) == 1
+
+    api.reset()
+    harness.run_plugin(SEASON + '&page_number=3')
+    assert api.api_requests(TOKEN_PATH) == []
+
+
+def test_a_rejected_token_is_replaced_and_the_request_retried(api):
+    harness.run_plugin(SEASON)
+    api.reset()
+    api.next_failures[('gwapi.zee5.com', '/content/season/')] = 401
+
+    xbmcplugin = harness.run_plugin(SEASON + '&page_number=3')
+    assert len(xbmcplugin.items) == 27
+    assert [path for _, path, _ in api.api_requests()][:3] == [
+        '/content/season/0-2-500', TOKEN_PATH, '/content/season/0-2-500',
+    ]
+
+
+def test_a_token_rejected_twice_fails_the_folder(api):
+    harness.run_plugin(SEASON)
+    api.reset()
+    api.failures[('gwapi.zee5.com', '/content/season/')] = 403
+
+    xbmcplugin = harness.run_plugin(SEASON + '&page_number=3')
+    assert xbmcplugin.items == []
+    assert len(api.api_requests(TOKEN_PATH)) == 1
+    assert ('endOfDirectory', (1, False)) in [(name, args[:2]) for name, args in xbmcplugin.calls]
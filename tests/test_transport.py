@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+
+import pytest
+
+from resources.lib import transport
+from resources.lib.transport import (
+    BREAKER_OPEN, BREAKER_THRESHOLD, BREAKER_WINDOW, ApiError, CircuitBreaker, CircuitOpenError, Transport,
+)
+
+HOST = 'gwapi.zee5.com'
+
+
+@pytest.fixture
+def path(tmpdir):
+    return str(tmpdir.join('circuits.json'))
+
+
+@pytest.fixture(autouse=True)
+def frozen_time(monkeypatch, clock):
+    monkeypatch.setattr(transport, 'time', clock)
+
+
+def fail(breaker, times=1):
+    for _ in range(times):
+        breaker.record_failure(HOST)
+
+
+def is_open(breaker):
+    try:
+        breaker.check(HOST, 'https://{}/'.format(HOST))
+    except CircuitOpenError:
+        return True
+    return False
+
+
+def test_opens_after_consecutive_failures(path):
+    breaker = CircuitBreaker(path)
+    fail(breaker, BREAKER_THRESHOLD - 1)
+    assert not is_open(breaker)
+
+    fail(breaker)
+    assert is_open(breaker)
+    assert not breaker.check('other.zee5.com', 'https://other.zee5.com/')
+
+
+def test_half_opens_after_breaker_open_seconds(path, clock):
+    breaker = CircuitBreaker(path)
+    fail(breaker, BREAKER_THRESHOLD)
+    clock.advance(BREAKER_OPEN)
+    assert not is_open(breaker)
+
+    # A failed trial request opens it right away again.
+    fail(breaker)
+    assert is_open(breaker)
+
+
+def test_success_closes_it(path, clock):
+    breaker = CircuitBreaker(path)
+    fail(breaker, BREAKER_THRESHOLD)
+    clock.advance(BREAKER_OPEN)
+    breaker.record_success(HOST)
+
+    fail(breaker, BREAKER_THRESHOLD - 1)
+    assert not is_open(breaker)
+
+
+def test_failures_older_than_the_window_are_forgotten(path, clock):
+    breaker = CircuitBreaker(path)
+    fail(breaker, BREAKER_THRESHOLD - 1)
+    clock.advance(BREAKER_WINDOW + 1)
+
+    fail(breaker)
+    assert not is_open(breaker)
+
+
+def test_state_carries_over_between_invocations(path, clock):
+    fail(CircuitBreaker(path), BREAKER_THRESHOLD)
+    assert is_open(CircuitBreaker(path))
+
+    clock.advance(BREAKER_WINDOW + 1)
+    assert not is_open(CircuitBreaker(path))
+
+
+def test_writes_only_when_the_state_changes(path):
+    breaker = CircuitBreaker(path)
+    breaker.record_success(HOST)
+    assert not os.path.exists(path)
+
+    fail(breaker)
+    breaker.record_success(HOST)
+    with open(path) as f:
+        assert json.load(f) == {}
+
+    os.remove(path)
+    breaker.record_success(HOST)
+    assert not os.path.exists(path)
+
+
+def test_unreadable_state_starts_closed(path):
+    with open(path, 'w') as f:
+        f.write('not json')
+    assert not is_open(CircuitBreaker(path))
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(transport, 'BACKOFF', 0)
+
+
+def test_get_returns_successful_responses(api, path):
+    response = Transport(path).get('https://b2bapi.zee5.com/front/countrylist.php?lang=en')
+    assert response.status_code == 200
+    assert response.json()[0]['collections']
+
+
+def test_get_raises_refused_requests_without_retrying(api, path):
+    api.failures[('gwapi.zee5.com', '/content/details/')] = 404
+    with pytest.raises(ApiError) as error:
+        Transport(path).get('https://gwapi.zee5.com/content/details/0-0-1')
+
+    assert error.value.status == 404
+    assert len(api.requests) == 1
+
+
+def test_get_retries_then_opens_the_circuit(api, path, fast_retries):
+    api.failures[(HOST, '/content/')] = 503
+    session = Transport(path)
+    for _ in range(BREAKER_THRESHOLD):
+        with pytest.raises(ApiError) as error:
+            session.get('https://gwapi.zee5.com/content/details/0-0-1')
+        assert error.value.status == 503
+    assert len(api.requests) == BREAKER_THRESHOLD * (transport.RETRIES + 1)
+
+    with pytest.raises(CircuitOpenError):
+        session.get('https://gwapi.zee5.com/content/details/0-0-1')
+    assert len(api.requests) == BREAKER_THRESHOLD * (transport.RETRIES + 1)
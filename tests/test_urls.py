@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from urlparse import parse_qsl, urlsplit
+
+import harness
+
+MANUAL = '?action=manual&content_id=0-8-manualcol_1'
+
+
+def urls(xbmcplugin):
+    return [url for url, _, _ in xbmcplugin.items]
+
+
+def category(xbmcplugin):
+    return [args[1] for name, args in xbmcplugin.calls if name == 'setPluginCategory'][-1]
+
+
+def open_folder(url):
+    return harness.run_plugin(url[len(harness.PLUGIN_URL):])
+
+
+def test_urls_carry_only_the_route(api):
+    for url in urls(harness.run_plugin()) + urls(harness.run_plugin(MANUAL)):
+        params = dict(parse_qsl(urlsplit(url).query))
+        assert set(params) <= {'action', 'content_id', 'page_number', 'query', 'new'}
+
+
+def test_urls_are_stable_across_token_rotation(api):
+    first = urls(harness.run_plugin(MANUAL))
+
+    harness.clear_profile()
+    assert urls(harness.run_plugin(MANUAL + '&token=rotated')) == first
+
+
+def test_breadcrumbs_are_resolved_locally(api):
+    root = harness.run_plugin()
+    url, list_item, _ = next(item for item in root.items if 'action=collection' in item[0])
+    collection = open_folder(url)
+    breadcrumb = category(collection)
+    assert breadcrumb == list_item.getLabel()
+
+    url, list_item, _ = next(item for item in collection.items if 'action=manual' in item[0])
+    assert category(open_folder(url)) == u'{}/{}'.format(breadcrumb, list_item.getLabel())
+
+
+def test_breadcrumbs_of_older_urls(api):
+    assert category(harness.run_plugin(MANUAL + '&title=Old%2FTitle')) == 'Old/Title'
+    assert category(harness.run_plugin('?action=manual&content_id=unknown-folder')) == ''
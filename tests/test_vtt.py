@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import fakeapi
+
+from resources.lib.vtt import VttToSrtConverter, convert_timestamp
+
+EXPECTED_SRT = (
+    b'1\n00:00:01,000 --> 00:00:03,500\nWelcome to the fixture movie.\n\n'
+    b'2\n00:00:04,000 --> 00:00:06,250\n<i>Second line</i> & more\n\n'
+    b'3\n00:01:00,000 --> 00:01:02,000\nThe end.\n\n'
+)
+
+
+def convert(chunks):
+    output = []
+    converter = VttToSrtConverter(output.append)
+    for chunk in chunks:
+        converter.feed(chunk)
+    converter.close()
+    return b''.join(output), converter.cues
+
+
+def split(data, size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+def test_converts_the_fixture():
+    assert convert([fakeapi.load_fixture('subtitle.vtt')]) == (EXPECTED_SRT, 3)
+
+
+def test_output_does_not_depend_on_chunk_boundaries():
+    data = fakeapi.load_fixture('subtitle.vtt')
+    for size in (1, 2, 3, 7, 64):
+        assert convert(split(data, size)) == (EXPECTED_SRT, 3), size
+
+
+def test_handles_crlf_and_a_byte_order_mark_split_across_chunks():
+    data = b'\xef\xbb\xbf' + fakeapi.load_fixture('subtitle.vtt').replace(b'\n', b'\r\n')
+    assert convert(split(data, 2)) == (EXPECTED_SRT, 3)
+
+
+def test_numbers_only_the_written_cues():
+    data = (
+        b'WEBVTT\n\n'
+        b'STYLE\n::cue { color: red }\n\n'
+        b'00:00:01.000 --> 00:00:02.000\nfirst\n\n'
+        b'broken\n00:00:xx.000 --> 00:00:03.000\nskipped\n\n'
+        b'NOTE a cue follows\n00:00:04.000 --> 00:00:05.000\nin the note\n\n'
+        b'cue-2\n00:00:05.000 --> 00:00:06.000\nsecond\n\n'
+        b'REGION\nid:fred\n\n'
+        b'02:03.4 --> 02:04.56\nlast\nline'
+    )
+    srt, cues = convert(split(data, 5))
+    assert cues == 3
+    assert srt == (
+        b'1\n00:00:01,000 --> 00:00:02,000\nfirst\n\n'
+        b'2\n00:00:05,000 --> 00:00:06,000\nsecond\n\n'
+        b'3\n00:02:03,400 --> 00:02:04,560\nlast\nline\n\n'
+    )
+
+
+def test_convert_timestamp():
+    assert convert_timestamp(b'01:02:03.456') == b'01:02:03,456'
+    assert convert_timestamp(b' 2:03.4 ') == b'00:02:03,400'
+    assert convert_timestamp(b'not a time') is None